@@ -0,0 +1,157 @@
+# assets.py
+
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+import pygame
+from constants import SPRITESHEETS, LOOSE_SPRITES
+from telemetry import telemetry
+
+# --- Gestor de recursos compartido ---
+# Cada imagen se carga, convierte y escala una sola vez por clave (ruta, tamaño)
+# y todas las entidades reciben la misma Surface.
+
+class AssetManager:
+    def __init__(self):
+        self.images = {} # (path, size, alpha) -> Surface
+        # Claves guardadas sin convertir porque se cargaron fuera del hilo principal; se convierten
+        # al pedirlas desde el hilo principal o con convert_pending()
+        self.pending = set()
+        self.hits = 0
+        self.misses = 0
+        self.frames = None # Índice de frames de los atlas, se lee al primer uso
+        # Los niveles se pueden construir en un hilo de precarga (ver LevelLoader en level.py)
+        self.lock = threading.RLock()
+
+    def load_image(self, path, size=None, alpha=True):
+        key = (path, size, alpha)
+        image = self.images.get(key)
+        if image is not None and key not in self.pending:
+            self.hits += 1
+            return image
+
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None: # Otro hilo la cargó mientras esperábamos, o está sin convertir
+                self.hits += 1
+                if key in self.pending and self._can_convert():
+                    image = self._convert(key)
+                return image
+            self.misses += 1
+            # Reusar la imagen sin escalar si ya se decodificó para otro tamaño
+            if size is not None:
+                image = self.load_image(path, None, alpha)
+                image = pygame.transform.scale(image, size)
+            else:
+                start = time.perf_counter()
+                image = pygame.image.load(path) # Lanza pygame.error si falla, el llamador decide el fallback
+                # convert() necesita un modo de vídeo y el hilo principal; si no, se usa la imagen decodificada tal cual
+                if self._can_convert():
+                    image = image.convert_alpha() if alpha else image.convert()
+                telemetry.complete("asset_load", start, "assets", path=path, size=list(image.get_size()))
+            self._store(key, image)
+            return image
+
+    def _can_convert(self):
+        return pygame.display.get_surface() is not None and threading.current_thread() is threading.main_thread()
+
+    def _store(self, key, image):
+        self.images[key] = image
+        if threading.current_thread() is not threading.main_thread():
+            self.pending.add(key)
+
+    def _convert(self, key):
+        # Al formato de la pantalla: sin esto cada blit de la imagen convierte los píxeles
+        image = self.images[key]
+        image = image.convert_alpha() if key[2] else image.convert()
+        self.images[key] = image
+        self.pending.discard(key)
+        return image
+
+    def convert_pending(self):
+        # En el hilo principal tras una carga en segundo plano (ver Level.prepare): convierte todo lo
+        # que quedó sin convertir y devuelve {Surface sin convertir: convertida} para cambiar las que ya
+        # tienen las entidades
+        replaced = {}
+        if not self._can_convert():
+            return replaced
+        with self.lock:
+            for key in list(self.pending):
+                raw = self.images[key]
+                replaced[raw] = self._convert(key)
+        return replaced
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.images)}
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.images.clear()
+        self.pending.clear()
+        self.frames = None
+        self.reset_stats()
+
+    # --- Atlas de texturas (spritesheets de Kenney) ---
+    # Los sprites se piden por nombre de frame. Cada hoja se decodifica una vez y los frames
+    # son subsuperficies de ella, así que arrancar abre unos pocos PNG en lugar de cientos.
+
+    def load_frame(self, name, size=None, alpha=True):
+        key = ("frame:" + name, size, alpha)
+        image = self.images.get(key)
+        if image is not None and key not in self.pending:
+            self.hits += 1
+            return image
+
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.hits += 1
+                if key in self.pending and self._can_convert():
+                    image = self._convert(key)
+                return image
+            self.misses += 1
+            if size is not None:
+                image = pygame.transform.scale(self.load_frame(name, None, alpha), size)
+            else:
+                frame = self.get_frames().get(name)
+                if frame is None:
+                    raise pygame.error(f"Frame '{name}' no está en ningún spritesheet")
+                sheet_path, rect = frame
+                if rect is None: # Sprite suelto (LOOSE_SPRITES): la imagen entera
+                    image = self.load_image(sheet_path, None, alpha)
+                else:
+                    image = self.load_image(sheet_path, None, alpha).subsurface(rect)
+            self._store(key, image)
+            return image
+
+    def get_frames(self):
+        # nombre de frame -> (ruta del PNG, Rect dentro de la hoja o None si es un sprite suelto)
+        if self.frames is None:
+            with self.lock:
+                if self.frames is None:
+                    start = time.perf_counter()
+                    frames = {name: (path, None) for name, path in LOOSE_SPRITES.items()}
+                    for xml_path in SPRITESHEETS:
+                        sheet_path, rects = parse_atlas(xml_path)
+                        for name, rect in rects.items():
+                            frames[name] = (sheet_path, rect)
+                    self.frames = frames
+                    telemetry.complete("atlas_index", start, "assets", frames=len(frames))
+        return self.frames
+
+def parse_atlas(xml_path):
+    # Lee un TextureAtlas XML: devuelve la ruta de la hoja y {nombre: Rect}
+    root = ET.parse(xml_path).getroot()
+    sheet_path = os.path.join(os.path.dirname(xml_path), root.get("imagePath"))
+    rects = {}
+    for sub in root.iter("SubTexture"):
+        rects[sub.get("name")] = pygame.Rect(int(sub.get("x")), int(sub.get("y")),
+                                             int(sub.get("width")), int(sub.get("height")))
+    return sheet_path, rects
+
+# Instancia única para todo el proceso
+asset_manager = AssetManager()
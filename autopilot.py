@@ -0,0 +1,355 @@
+# autopilot.py
+
+import gc
+import json
+import math
+import os
+import random
+import time
+import numpy as np
+import pygame
+from constants import *
+from level import MovingPlatform
+from player import Player
+from session import GameSession, STATE_NAMES
+from telemetry import telemetry
+
+# --- Piloto automático ---
+# Juega con las mismas acciones que el teclado de main.py (move_left, move_right, jump, stop_*).
+# Cada AUTOPILOT_REPLAN_TICKS ticks prueba unos cuantos planes cortos (correr, saltar ahora o
+# dentro de unos ticks, retroceder y saltar...) simulando AUTOPILOT_HORIZON ticks con la física
+# real sobre una copia del jugador, y sigue el que más avanza con menos daño. Las plataformas
+# móviles cercanas se simulan con copias: el nivel de la partida no se toca.
+# Con la misma semilla juega siempre igual, así que sirve para pruebas largas repetibles (soak).
+
+class _Mover:
+    # Copia de una plataforma móvil para la simulación; MovingPlatform.update funciona sobre ella
+    def __init__(self, platform, x, direction, order):
+        self.rect = platform.rect.copy()
+        self.x = x
+        self.start_x = platform.start_x
+        self.end_x = platform.end_x
+        self.speed = platform.speed
+        self.direction = direction
+        self.order = order # Orden de inserción en platform_grid (orden de resolución de colisiones)
+        self.rect.x = math.floor(x)
+
+def _plans():
+    # (dirección antes del salto, ticks hasta intentar saltar o None, dirección después)
+    plans = [(1, None, 1), (0, None, 0), (-1, None, -1), (1, 0, 0)]
+    plans += [(1, delay, 1) for delay in (0, 2, 4, 6, 10, 14, 20)]
+    plans += [(0, delay, 1) for delay in (0, 4, 10)]
+    plans += [(-1, delay, 1) for delay in (6, 12, 20)]
+    return plans
+
+PLANS = _plans()
+
+class Autopilot:
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed) # Desempates entre planes igual de buenos
+        self.sim = Player(0, 0) # Jugador de la simulación
+        self.reset()
+
+    def reset(self):
+        self.plan = []
+        self.ticks_since_plan = 0
+        self.best_x = 0
+        self.stuck_ticks = 0
+
+    def actions(self, session):
+        # Acciones de ACTIONS para el próximo session.step()
+        if session.state != GAME:
+            self.reset()
+            return []
+        player = session.player
+        if player.rect.x > self.best_x:
+            self.best_x = player.rect.x
+            self.stuck_ticks = 0
+        else:
+            self.stuck_ticks += 1
+        if not self.plan or self.ticks_since_plan >= AUTOPILOT_REPLAN_TICKS:
+            self.plan = self._choose_plan(session)
+            self.ticks_since_plan = 0
+        direction, jump = self.plan.pop(0)
+        self.ticks_since_plan += 1
+        return self._keys(player, direction, jump)
+
+    def _keys(self, player, direction, jump):
+        # Teclas que hacen falta para que el jugador mantenga direction (y salte)
+        actions = []
+        if direction > 0 and not player.moving_right:
+            actions.append("move_right")
+        elif direction < 0 and not player.moving_left:
+            actions.append("move_left")
+        elif direction == 0:
+            if player.moving_left:
+                actions.append("stop_moving_left")
+            if player.moving_right:
+                actions.append("stop_moving_right")
+        if jump:
+            actions.append("jump")
+        return actions
+
+    def _choose_plan(self, session):
+        level = session.level
+        grids = (level.platform_grid, level.item_grid, level.obstacle_grid, level.spike_grid)
+        tests = [grid.tests for grid in grids] # La simulación no cuenta en las estadísticas del perfilador
+        scored = []
+        for plan in PLANS:
+            score, steps = self._simulate(session, *plan)
+            scored.append((score, self.rng.random(), steps))
+        for grid, count in zip(grids, tests):
+            grid.tests = count
+        scored.sort(reverse=True)
+        if self.stuck_ticks > AUTOPILOT_STUCK_TICKS:
+            # Sin avanzar hace rato: cualquier plan que no mate, para salir del atasco
+            alive = [entry for entry in scored if entry[0] > -AUTOPILOT_DEATH_PENALTY / 2]
+            self.stuck_ticks = 0
+            return list(self.rng.choice(alive or scored)[2])
+        return list(scored[0][2])
+
+    def _simulate(self, session, before, jump_after, after):
+        # Juega un plan sobre una copia del jugador; devuelve (puntuación, [(dirección, salto)] por tick)
+        level = session.level
+        player = session.player
+        dt = session.dt
+        sim = self.sim
+        sim.rect.topleft = player.rect.topleft
+        sim.x = player.x
+        sim.y = player.y
+        sim.vel_x = player.vel_x
+        sim.vel_y = player.vel_y
+        sim.on_ground = player.on_ground
+
+        # Copias de las plataformas móviles que pueden alcanzarse en el horizonte
+        reach = AUTOPILOT_HORIZON * PLAYER_MAX_SPEED * ICE_ACCELERATION_MULTIPLIER * dt
+        movers = level.movers
+        order = level.platform_grid.order
+        index = {platform: i for i, platform in enumerate(movers.platforms)}
+        proxies = {}
+        for platform in level.mover_index.query(player.rect.left - reach, player.rect.right + reach):
+            i = index[platform]
+            proxies[platform] = _Mover(platform, float(movers.x[i]), int(movers.direction[i]),
+                                       order.get(platform, 0))
+
+        steps = []
+        energy = player.energy
+        damage = 0
+        iron = 0
+        picked = set()
+        hit = set()
+        start_x = player.x
+        finished = False
+        jumped = jump_after is None
+        for tick in range(AUTOPILOT_HORIZON):
+            jump = False
+            if not jumped and tick >= jump_after and sim.on_ground:
+                jump = jumped = True
+            direction = after if jumped and jump_after is not None else before
+            steps.append((direction, jump))
+            sim.moving_left = direction < 0
+            sim.moving_right = direction > 0
+            if jump:
+                sim.jump()
+            for proxy in proxies.values():
+                MovingPlatform.update(proxy, dt)
+            sweep = sim.sweep_rect(dt)
+            platforms = [p for p in level.platform_grid.query(sweep) if p not in proxies]
+            near = [proxy for proxy in proxies.values() if proxy.rect.colliderect(sweep)]
+            if near:
+                platforms += near
+                platforms.sort(key=lambda p: p.order if isinstance(p, _Mover) else order[p])
+            sim.update(level.terrain_type, platforms, level.ground_rect, dt)
+
+            # Misma pasada de recogida/daño que la sesión, sin quitar nada del nivel
+            for item in level.item_grid.query(sim.rect):
+                if item not in picked:
+                    picked.add(item)
+                    iron += 1
+                    energy = min(energy + 10, MAX_ENERGY)
+            for obstacle in level.obstacle_grid.query(sim.rect):
+                if obstacle not in hit:
+                    hit.add(obstacle)
+                    energy -= PARASITE_DAMAGE
+                    damage += PARASITE_DAMAGE
+            for spike in level.spike_grid.query(sim.rect):
+                energy -= SPIKE_DAMAGE
+                damage += SPIKE_DAMAGE
+            if energy <= 0:
+                return -AUTOPILOT_DEATH_PENALTY + sim.x - start_x, steps
+            if level.finish_line and sim.rect.colliderect(level.finish_line.rect):
+                finished = True
+                break
+
+        score = sim.x - start_x - damage * AUTOPILOT_DAMAGE_WEIGHT + iron * AUTOPILOT_IRON_BONUS
+        if finished:
+            score += AUTOPILOT_DEATH_PENALTY - len(steps) # Llegar a la meta, cuanto antes mejor
+        return score, steps
+
+# --- Pruebas largas (soak) con el piloto automático ---
+
+def memory_mb():
+    # Memoria residente actual del proceso (Linux); si no, el máximo que da resource
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def draw_frame(screen, ui, session):
+    # Mismo dibujo que main.py (sin DirtyRenderer: en el soak interesa el coste de un frame completo)
+    screen.fill(WHITE)
+    state = session.state
+    if state == GAME:
+        camera_offset_x = session.camera_offset_x
+        session.level.draw(screen, camera_offset_x)
+        session.player.draw(screen, camera_offset_x)
+        ui.draw_health_bar(screen, session.player.energy)
+        ui.draw_score(screen, session.player.collected_iron)
+    elif state == LEVEL_COMPLETE_SCREEN:
+        ui.draw_level_complete(screen, session.level_number - 1)
+    elif state == GAME_OVER:
+        ui.draw_game_over(screen, session.total_iron_collected)
+    elif state == GAME_WON:
+        ui.draw_game_won(screen, session.total_iron_collected)
+    pygame.display.flip()
+
+def soak(seed=0, duration_s=3600, render=False, endless=False, report_interval_s=SOAK_REPORT_INTERVAL_S,
+         max_ticks=None, fps=0):
+    # Juega sin parar (reiniciando al perder o ganar) y cada report_interval_s segundos guarda
+    # una ventana con el tiempo por tick/frame, la memoria y los niveles construidos
+    # Sin caché: cada nivel se genera de nuevo, que es lo que se quiere medir
+    session = GameSession(seed=seed, endless=endless, use_level_cache=False)
+    bot = Autopilot(seed)
+    if render:
+        from ui import UI
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Moto Glóbulo Rojo - piloto automático")
+        ui = UI()
+        clock = pygame.time.Clock()
+
+    windows = []
+    samples = [] # ms por tick de la partida (step y dibujo), sin contar lo que piensa el bot
+    bot_samples = []
+    counts = {"ticks": 0, "levels_built": 1, "resets": 0, "levels_completed": 0, "games_won": 0, "games_lost": 0,
+              "timeouts": 0}
+    last_level = session.level
+    previous_state = session.state
+    level_ticks = 0
+    start = time.perf_counter()
+    window_start = start
+    while True:
+        bot_start = time.perf_counter()
+        actions = bot.actions(session)
+        frame_start = time.perf_counter()
+        session.step(actions)
+        state = session.state
+        if render:
+            draw_frame(screen, ui, session)
+            pygame.event.pump() # Sin esto el sistema da la ventana por colgada
+        frame_end = time.perf_counter()
+        samples.append((frame_end - frame_start) * 1000.0)
+        bot_samples.append((frame_start - bot_start) * 1000.0)
+        counts["ticks"] += 1
+        level_ticks += 1
+        if render and fps:
+            clock.tick(fps)
+
+        if state == LEVEL_COMPLETE_SCREEN and previous_state == GAME:
+            counts["levels_completed"] += 1
+        if state in (GAME_OVER, GAME_WON) or level_ticks > SOAK_LEVEL_TIMEOUT_TICKS:
+            if state == GAME_WON:
+                counts["games_won"] += 1
+                counts["levels_completed"] += 1
+            elif state == GAME_OVER:
+                counts["games_lost"] += 1
+            else:
+                # Atascado (hay niveles que no se pueden pasar, ver validator.py): otra partida con otra semilla
+                counts["timeouts"] += 1
+                session.seed += 1
+            session.reset()
+            bot.reset()
+            counts["resets"] += 1
+            state = session.state
+        previous_state = state
+        if session.level is not last_level:
+            last_level = session.level
+            counts["levels_built"] += 1
+            level_ticks = 0
+
+        now = time.perf_counter()
+        done = now - start >= duration_s or (max_ticks is not None and counts["ticks"] >= max_ticks)
+        if now - window_start >= report_interval_s or done:
+            times = np.array(samples)
+            window = {
+                "elapsed_s": round(now - start, 1),
+                "ticks": len(samples),
+                "ms_mean": float(times.mean()),
+                "ms_p50": float(np.percentile(times, 50)),
+                "ms_p99": float(np.percentile(times, 99)),
+                "ms_max": float(times.max()),
+                "bot_ms_mean": float(np.mean(bot_samples)),
+                "rss_mb": memory_mb(),
+                "objects": len(gc.get_objects()),
+                "level": session.level_number,
+                "state": STATE_NAMES[session.state],
+            }
+            window.update(counts)
+            windows.append(window)
+            telemetry.counter("soak", "soak", ms_p50=window["ms_p50"], ms_p99=window["ms_p99"],
+                              rss_mb=window["rss_mb"], objects=window["objects"])
+            print(f"{window['elapsed_s']:>8.0f}s {window['ticks']:>8} ticks  p50 {window['ms_p50']:.3f} ms  "
+                  f"p99 {window['ms_p99']:.3f} ms  {window['rss_mb']:.1f} MB  {window['objects']} objetos  "
+                  f"niveles {counts['levels_built']}  completados {counts['levels_completed']}  "
+                  f"reinicios {counts['resets']}", flush=True)
+            samples = []
+            bot_samples = []
+            window_start = now
+        if done:
+            break
+    return summarize(windows, counts)
+
+def summarize(windows, counts):
+    # Deriva: última ventana frente a la primera (la primera incluye el arranque, así que se
+    # compara con la segunda si hay más de dos)
+    first = windows[1] if len(windows) > 2 else windows[0]
+    last = windows[-1]
+    builds = max(last["levels_built"] - first["levels_built"], 1)
+    return {
+        "windows": windows,
+        "counts": counts,
+        "ms_p50_drift": last["ms_p50"] / first["ms_p50"],
+        "ms_p99_drift": last["ms_p99"] / first["ms_p99"],
+        "rss_growth_mb": last["rss_mb"] - first["rss_mb"],
+        "rss_growth_per_level_kb": (last["rss_mb"] - first["rss_mb"]) * 1024 / builds,
+        "objects_growth": last["objects"] - first["objects"],
+    }
+
+# Prueba larga sin ventana: python autopilot.py --minutes 120
+# Con ventana (dibujando cada tick): python autopilot.py --minutes 120 --render
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Piloto automático y pruebas largas de Moto Glóbulo Rojo")
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--ticks", type=int, default=None, help="parar tras estos ticks (además de --minutes)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render", action="store_true", help="dibujar cada tick en una ventana")
+    parser.add_argument("--fps", type=int, default=0, help="límite de frames por segundo con --render (0 = sin límite)")
+    parser.add_argument("--endless", action="store_true", help="modo infinito")
+    parser.add_argument("--interval", type=float, default=SOAK_REPORT_INTERVAL_S, help="segundos por ventana del informe")
+    parser.add_argument("--output", default="soak.json")
+    args = parser.parse_args()
+
+    if not args.render:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    result = soak(args.seed, args.minutes * 60, args.render, args.endless, args.interval, args.ticks, args.fps)
+    result["args"] = vars(args)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Deriva p50 x{result['ms_p50_drift']:.2f}, p99 x{result['ms_p99_drift']:.2f}; "
+          f"memoria {result['rss_growth_mb']:+.1f} MB ({result['rss_growth_per_level_kb']:+.1f} KB por nivel); "
+          f"objetos {result['objects_growth']:+d}. Resultados en {args.output}")
+    pygame.quit()
@@ -0,0 +1,449 @@
+# batch_env.py
+
+import math
+import numpy as np
+from constants import *
+from level import Level
+
+# --- Entorno por lotes (NumPy) para bots y aprendizaje por refuerzo ---
+# Simula N copias independientes del jugador en el mismo nivel, todas a la vez: el estado de
+# cada copia es una fila de arrays y cada step() avanza un tick de todas con operaciones de
+# NumPy. La física es la de Player.update (gravedad, aceleración, fricción, terreno y el mismo
+# orden de resolución de colisiones con el suelo y las plataformas) y la recogida/daño es la de
+# GameSession.check_contacts, así que una copia hace lo mismo que una partida con las mismas
+# teclas. Las plataformas móviles siguen su trayectoria precalculada según el tick de cada copia.
+#
+# API al estilo gym:
+#   env = BatchEnv(4096, level_number=1, seed=0)
+#   obs = env.reset()
+#   obs, rewards, dones, info = env.step(actions) # actions: índices de BATCH_ACTIONS, uno por copia
+# Las copias que terminan (sin energía, meta o BATCH_MAX_EPISODE_TICKS) se reinician solas;
+# obs ya es la del episodio nuevo e info dice cómo terminó el anterior.
+
+# Acciones: (dirección mantenida, saltar en este tick), como las teclas de main.py
+BATCH_ACTIONS = ((0, False), (-1, False), (1, False), (0, True), (-1, True), (1, True))
+OBSERVATION_SIZE = 14
+
+FAR_AWAY = -10 ** 6 # x de la entidad de relleno de las tablas de candidatos: nunca toca al jugador
+
+def _column_table(lefts, rights, columns, cell, margin):
+    # Para cada columna de cell píxeles, índices de las entidades cuyo tramo [left, right) se solapa
+    # con la columna ampliada margin píxeles a cada lado, en el orden original (el de resolución).
+    # Rellena con len(lefts), la fila extra de relleno de los arrays de entidades.
+    lists = []
+    for col in range(columns):
+        lo = col * cell - margin
+        hi = (col + 1) * cell + margin
+        lists.append([i for i in range(len(lefts)) if rights[i] > lo and lefts[i] < hi])
+    width = max([len(entries) for entries in lists] + [1])
+    table = np.full((columns, width), len(lefts), dtype=np.intp)
+    for col, entries in enumerate(lists):
+        table[col, :len(entries)] = entries
+    return table
+
+def _rect_arrays(rects):
+    # x, y, ancho, alto de cada rect más la fila de relleno
+    data = np.array([(r.x, r.y, r.width, r.height) for r in rects] + [(FAR_AWAY, FAR_AWAY, 1, 1)],
+                    dtype=np.int64).reshape(-1, 4)
+    return data[:, 0], data[:, 1], data[:, 2], data[:, 3]
+
+class BatchEnv:
+    def __init__(self, num_envs, level_number=1, seed=None, simulation_rate=SIMULATION_RATE,
+                 max_episode_ticks=BATCH_MAX_EPISODE_TICKS):
+        self.num_envs = num_envs
+        self.dt = PHYSICS_REFERENCE_RATE / simulation_rate
+        self.max_episode_ticks = max_episode_ticks
+        # Sin caché: generar el nivel es determinista y barato comparado con los pasos, y entrenar
+        # con muchas semillas llenaría LEVEL_CACHE_DIR
+        self.level = level = Level(level_number, seed, use_cache=False)
+        self.terrain_type = level.terrain_type
+        if level.terrain_type == "sand":
+            self.speed_multiplier = SAND_FRICTION_MULTIPLIER
+        elif level.terrain_type == "ice":
+            self.speed_multiplier = ICE_ACCELERATION_MULTIPLIER
+        else:
+            self.speed_multiplier = 1.0
+        self.ground_top = level.ground_rect.top
+        self.ground_bottom = level.ground_rect.bottom
+        self.ground_right = level.ground_rect.right
+        self.finish_rect = level.finish_line.rect
+
+        # Entidades en arrays (una fila de relleno al final de cada uno)
+        self.plat_x, self.plat_y, self.plat_w, self.plat_h = _rect_arrays([p.rect for p in level.platforms])
+        self.item_x, self.item_y, self.item_w, self.item_h = _rect_arrays([i.rect for i in level.items])
+        self.obstacle_x, self.obstacle_y, self.obstacle_w, self.obstacle_h = \
+            _rect_arrays([o.rect for o in level.obstacles])
+        self.spike_x, self.spike_y, self.spike_w, self.spike_h = _rect_arrays([s.rect for s in level.spikes])
+        self.num_items = len(level.items)
+        self.num_obstacles = len(level.obstacles)
+
+        # Plataformas móviles: x de cada una en cada tick (fila t = después de t updates, como en
+        # la sesión), precalculada para todo el episodio; plat_mover dice qué columna usa cada plataforma
+        movers = level.movers
+        mover_number = {platform: i for i, platform in enumerate(movers.platforms)}
+        self.plat_mover = np.array([mover_number.get(p, -1) for p in level.platforms] + [-1], dtype=np.intp)
+        self.has_movers = len(movers) > 0
+        trajectory = [np.floor(movers.x)]
+        for _ in range(max_episode_ticks + 1):
+            movers.update(self.dt)
+            trajectory.append(np.floor(movers.x))
+        self.mover_x = np.array(trajectory, dtype=np.int64).reshape(len(trajectory), len(movers))
+
+        # Broadphase: tablas de candidatos por columna. El margen cubre el ancho del jugador y lo
+        # que puede moverse en un tick, así que la columna de su x basta para todo el tick.
+        self.cell = SPATIAL_CELL_SIZE
+        self.columns = math.ceil(level.width / self.cell) + 1
+        reach = math.ceil((PLAYER_MAX_SPEED * max(1.0, self.speed_multiplier) + PLAYER_ACCELERATION) * self.dt)
+        margin = PLAYER_WIDTH + 2 * reach + 2
+        extents = [p.travel_extent() if p in mover_number else (p.rect.left, p.rect.right) for p in level.platforms]
+        self.plat_table = _column_table([e[0] for e in extents], [e[1] for e in extents],
+                                        self.columns, self.cell, margin)
+        self.item_table = _column_table(self.item_x[:-1], self.item_x[:-1] + self.item_w[:-1],
+                                        self.columns, self.cell, margin)
+        self.obstacle_table = _column_table(self.obstacle_x[:-1], self.obstacle_x[:-1] + self.obstacle_w[:-1],
+                                            self.columns, self.cell, margin)
+        self.spike_table = _column_table(self.spike_x[:-1], self.spike_x[:-1] + self.spike_w[:-1],
+                                         self.columns, self.cell, margin)
+
+        self.actions = np.array(BATCH_ACTIONS, dtype=np.int64)
+        self.rows = np.arange(num_envs)
+        self.reset()
+
+    # --- Estado ---
+
+    def reset(self):
+        # Reinicia todas las copias y devuelve sus observaciones
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self.observe()
+
+    def _reset_envs(self, mask):
+        # Mismo estado inicial que un Player nuevo en GameSession.reset()
+        if not hasattr(self, "x"):
+            n = self.num_envs
+            self.x = np.zeros(n)
+            self.y = np.zeros(n)
+            self.vel_x = np.zeros(n)
+            self.vel_y = np.zeros(n)
+            self.rect_x = np.zeros(n, dtype=np.int64)
+            self.rect_y = np.zeros(n, dtype=np.int64)
+            self.on_ground = np.zeros(n, dtype=bool)
+            self.energy = np.zeros(n, dtype=np.int64)
+            self.iron = np.zeros(n, dtype=np.int64)
+            self.tick = np.zeros(n, dtype=np.intp)
+            # Ítems recogidos y parásitos golpeados por copia (columna extra: la entidad de relleno)
+            self.collected = np.zeros((n, self.num_items + 1), dtype=bool)
+            self.hit = np.zeros((n, self.num_obstacles + 1), dtype=bool)
+        start_x = 100
+        start_y = SCREEN_HEIGHT - 50 - PLAYER_HEIGHT
+        self.x[mask] = start_x
+        self.y[mask] = start_y
+        self.rect_x[mask] = start_x
+        self.rect_y[mask] = start_y
+        self.vel_x[mask] = 0
+        self.vel_y[mask] = 0
+        self.on_ground[mask] = False
+        self.energy[mask] = INITIAL_ENERGY
+        self.iron[mask] = 0
+        self.tick[mask] = 0
+        self.collected[mask] = False
+        self.hit[mask] = False
+
+    def _platform_candidates(self):
+        # Rects de las plataformas candidatas de cada copia, (N, K), con las móviles en su x de este tick
+        idx = self.plat_table[np.clip(self.rect_x // self.cell, 0, self.columns - 1)]
+        px = self.plat_x[idx]
+        if self.has_movers:
+            mover = self.plat_mover[idx]
+            moving = mover >= 0
+            if moving.any():
+                ticks = np.broadcast_to(self.tick[:, None], idx.shape)
+                px = px.copy()
+                px[moving] = self.mover_x[ticks[moving], mover[moving]]
+        return px, self.plat_y[idx], self.plat_w[idx], self.plat_h[idx]
+
+    # --- Simulación ---
+
+    def step(self, actions):
+        # actions: array de N índices de BATCH_ACTIONS. Devuelve (obs, rewards, dones, info)
+        dt = self.dt
+        direction, jump = self.actions[actions].T
+        jump = jump.astype(bool)
+
+        # Player.jump(): solo desde el suelo
+        jumping = jump & self.on_ground
+        self.vel_y[jumping] = JUMP_STRENGTH
+        self.on_ground[jumping] = False
+
+        self.tick += 1 # Las plataformas móviles avanzan antes que el jugador, como en la sesión
+        px, py, pw, ph = self._platform_candidates()
+
+        # --- Player.update ---
+        prev_x = self.rect_x.copy()
+        prev_y = self.rect_y.copy()
+        vel_x = self.vel_x
+        vel_y = self.vel_y
+        vel_y += GRAVITY * dt
+
+        max_speed = PLAYER_MAX_SPEED * self.speed_multiplier
+        left = direction < 0
+        right = direction > 0
+        idle = ~(left | right)
+        vel_x[left] = np.maximum(vel_x[left] - PLAYER_ACCELERATION * dt, -max_speed)
+        vel_x[right] = np.minimum(vel_x[right] + PLAYER_ACCELERATION * dt, max_speed)
+        friction = 0.98 ** dt if self.terrain_type == "ice" else FRICTION ** dt
+        braking = idle & self.on_ground
+        vel_x[braking] *= friction
+        vel_x[idle & (np.abs(vel_x) < 0.1)] = 0
+
+        self.x += vel_x * dt
+        self.y += vel_y * dt
+        moved_x = np.floor(self.x).astype(np.int64)
+        moved_y = np.floor(self.y).astype(np.int64)
+        rect_x = moved_x.copy()
+        rect_y = moved_y.copy()
+        on_ground = np.zeros(self.num_envs, dtype=bool)
+
+        # Borde izquierdo del mundo
+        past_left = rect_x < 0
+        rect_x[past_left] = 0
+        vel_x[past_left] = 0
+
+        # Player.sweep_collisions: solo las copias que se mueven más que su tamaño en un tick
+        fast = (np.abs(rect_x - prev_x) > PLAYER_WIDTH) | (np.abs(rect_y - prev_y) > PLAYER_HEIGHT)
+        if fast.any():
+            self._sweep(np.nonzero(fast)[0], prev_x, prev_y, rect_x, rect_y, px, py, pw, ph, on_ground)
+
+        # Suelo
+        top = self.ground_top
+        touching = (rect_x < self.ground_right) & (rect_x + PLAYER_WIDTH > 0) & \
+                   (rect_y < self.ground_bottom) & (rect_y + PLAYER_HEIGHT > top)
+        land = touching & (vel_y > 0) & (prev_y + PLAYER_HEIGHT <= top)
+        rect_y[land] = top - PLAYER_HEIGHT
+        vel_y[land] = 0
+        on_ground |= land | (touching & (rect_y + PLAYER_HEIGHT == top))
+        # Cayendo y justo apoyado (borde con borde): también aterriza, como en Player.update
+        flush = ~touching & (vel_y > 0) & (rect_y + PLAYER_HEIGHT == top) & (prev_y + PLAYER_HEIGHT <= top) & \
+                (rect_x < self.ground_right) & (rect_x + PLAYER_WIDTH > 0)
+        vel_y[flush] = 0
+        self.y[flush] = rect_y[flush]
+        on_ground |= flush
+
+        # Plataformas, una columna de candidatos cada vez para respetar el orden de resolución
+        for k in range(px.shape[1]):
+            kx = px[:, k]
+            ky = py[:, k]
+            kw = pw[:, k]
+            kh = ph[:, k]
+            overlap_x = (rect_x < kx + kw) & (rect_x + PLAYER_WIDTH > kx)
+            touching = overlap_x & (rect_y < ky + kh) & (rect_y + PLAYER_HEIGHT > ky)
+            flush = overlap_x & ~touching & (vel_y > 0) & (rect_y + PLAYER_HEIGHT == ky) & \
+                    (prev_y + PLAYER_HEIGHT <= ky)
+            if flush.any():
+                vel_y[flush] = 0
+                self.y[flush] = rect_y[flush]
+                on_ground |= flush
+            if not touching.any():
+                continue
+            land = touching & (vel_y > 0) & (prev_y + PLAYER_HEIGHT <= ky)
+            rest = touching & ~land
+            bump = rest & (vel_y < 0) & (prev_y >= ky + kh)
+            rest &= ~bump
+            wall_left = rest & (vel_x > 0) & (prev_x + PLAYER_WIDTH <= kx)
+            rest &= ~wall_left
+            wall_right = rest & (vel_x < 0) & (prev_x >= kx + kw)
+            rect_y[land] = ky[land] - PLAYER_HEIGHT
+            vel_y[land] = 0
+            on_ground |= land
+            rect_y[bump] = ky[bump] + kh[bump]
+            vel_y[bump] = 0
+            rect_x[wall_left] = kx[wall_left] - PLAYER_WIDTH
+            vel_x[wall_left] = 0
+            rect_x[wall_right] = kx[wall_right] + kw[wall_right]
+            vel_x[wall_right] = 0
+
+        # Sin velocidad vertical: de pie sobre una plataforma o sobre el suelo
+        resting = vel_y == 0
+        on_platform = ((rect_y[:, None] + PLAYER_HEIGHT == py) & (rect_x[:, None] + PLAYER_WIDTH > px) &
+                       (rect_x[:, None] < px + pw)).any(axis=1)
+        on_ground |= resting & (on_platform | (rect_y + PLAYER_HEIGHT == top))
+
+        # La posición float se ajusta al rect si una colisión lo ha empujado
+        pushed_x = rect_x != moved_x
+        self.x[pushed_x] = rect_x[pushed_x]
+        pushed_y = rect_y != moved_y
+        self.y[pushed_y] = rect_y[pushed_y]
+        self.rect_x = rect_x
+        self.rect_y = rect_y
+        self.on_ground = on_ground
+
+        # --- GameSession.check_contacts ---
+        energy_before = self.energy.copy()
+        column = np.clip(rect_x // self.cell, 0, self.columns - 1)
+
+        idx = self.item_table[column]
+        touching = self._touching(idx, self.item_x, self.item_y, self.item_w, self.item_h)
+        touching &= ~self.collected[self.rows[:, None], idx]
+        picked = touching.sum(axis=1)
+        if picked.any():
+            rows, cols = np.nonzero(touching)
+            self.collected[rows, idx[rows, cols]] = True
+            self.iron += picked
+            self.energy = np.minimum(self.energy + 10 * picked, MAX_ENERGY)
+
+        idx = self.obstacle_table[column]
+        touching = self._touching(idx, self.obstacle_x, self.obstacle_y, self.obstacle_w, self.obstacle_h)
+        touching &= ~self.hit[self.rows[:, None], idx]
+        damage = PARASITE_DAMAGE * touching.sum(axis=1)
+        if touching.any():
+            rows, cols = np.nonzero(touching)
+            self.hit[rows, idx[rows, cols]] = True
+
+        idx = self.spike_table[column]
+        damage += SPIKE_DAMAGE * self._touching(idx, self.spike_x, self.spike_y, self.spike_w, self.spike_h).sum(axis=1)
+        self.energy = np.maximum(self.energy - damage, 0)
+
+        # --- Fin de episodio y recompensas ---
+        dead = self.energy <= 0
+        finish = self.finish_rect
+        won = ~dead & (rect_x < finish.right) & (rect_x + PLAYER_WIDTH > finish.left) & \
+              (rect_y < finish.bottom) & (rect_y + PLAYER_HEIGHT > finish.top)
+        timeout = self.tick >= self.max_episode_ticks
+        dones = dead | won | timeout
+        rewards = (BATCH_IRON_REWARD * picked + BATCH_ENERGY_REWARD * (self.energy - energy_before) +
+                   BATCH_FINISH_REWARD * won).astype(np.float32)
+        info = {"won": won, "dead": dead, "timeout": timeout & ~(dead | won)}
+        if dones.any():
+            info["final_x"] = np.where(dones, self.rect_x, 0)
+            info["final_iron"] = np.where(dones, self.iron, 0)
+            info["episode_ticks"] = np.where(dones, self.tick, 0)
+            self._reset_envs(dones)
+        return self.observe(), rewards, dones, info
+
+    def _sweep(self, rows, prev_x, prev_y, rect_x, rect_y, px, py, pw, ph, on_ground):
+        # Swept AABB de las copias rows, igual que Player.sweep_collisions: el suelo va primero y,
+        # a igual tiempo de impacto, gana el primer candidato
+        n = len(rows)
+        ground = np.array([[0, self.ground_top, self.ground_right, self.ground_bottom]] * n, dtype=np.int64)
+        left = np.column_stack((ground[:, 0], px[rows]))
+        top = np.column_stack((ground[:, 1], py[rows]))
+        right = np.column_stack((ground[:, 2], px[rows] + pw[rows]))
+        bottom = np.column_stack((ground[:, 3], py[rows] + ph[rows]))
+        x0 = prev_x[rows, None]
+        y0 = prev_y[rows, None]
+        x1 = rect_x[rows, None]
+        y1 = rect_y[rows, None]
+        dx = x1 - x0
+        dy = y1 - y0
+        hit_rows = np.arange(n)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Eje vertical
+            down = (dy > 0) & (y0 + PLAYER_HEIGHT <= top) & (y1 >= bottom)
+            up = (dy < 0) & (y0 >= bottom) & (y1 + PLAYER_HEIGHT <= top)
+            t = np.where(down, (top - y0 - PLAYER_HEIGHT) / dy, np.where(up, (y0 - bottom) / -dy, np.inf))
+            x = x0 + dx * t
+            t[~((x < right) & (x + PLAYER_WIDTH > left))] = np.inf
+            k = t.argmin(axis=1)
+            hit_y = np.isfinite(t[hit_rows, k])
+            # Eje horizontal
+            toward_right = (dx > 0) & (x0 + PLAYER_WIDTH <= left) & (x1 >= right)
+            toward_left = (dx < 0) & (x0 >= right) & (x1 + PLAYER_WIDTH <= left)
+            t = np.where(toward_right, (left - x0 - PLAYER_WIDTH) / dx,
+                         np.where(toward_left, (x0 - right) / -dx, np.inf))
+            y = y0 + dy * t
+            t[~((y < bottom) & (y + PLAYER_HEIGHT > top))] = np.inf
+            j = t.argmin(axis=1)
+            hit_x = np.isfinite(t[hit_rows, j])
+
+        falling = dy[:, 0] > 0
+        land = hit_y & falling
+        bump = hit_y & ~falling
+        rect_y[rows[land]] = top[hit_rows[land], k[land]] - PLAYER_HEIGHT
+        rect_y[rows[bump]] = bottom[hit_rows[bump], k[bump]]
+        self.vel_y[rows[hit_y]] = 0
+        on_ground[rows[land]] = True
+        going_right = dx[:, 0] > 0
+        wall_left = hit_x & going_right
+        wall_right = hit_x & ~going_right
+        rect_x[rows[wall_left]] = left[hit_rows[wall_left], j[wall_left]] - PLAYER_WIDTH
+        rect_x[rows[wall_right]] = right[hit_rows[wall_right], j[wall_right]]
+        self.vel_x[rows[hit_x]] = 0
+
+    def _touching(self, idx, ex, ey, ew, eh):
+        # (N, K): rect del jugador de cada copia contra sus entidades candidatas idx
+        x = ex[idx]
+        y = ey[idx]
+        rect_x = self.rect_x[:, None]
+        rect_y = self.rect_y[:, None]
+        return (rect_x < x + ew[idx]) & (rect_x + PLAYER_WIDTH > x) & \
+               (rect_y < y + eh[idx]) & (rect_y + PLAYER_HEIGHT > y)
+
+    # --- Observaciones ---
+
+    def _nearest_ahead(self, ex, ey, ew, available=None):
+        # dx, dy (normalizados) hasta la entidad más cercana que aún no ha quedado atrás
+        rect_x = self.rect_x[:, None]
+        ahead = ex[None, :-1] + ew[None, :-1] > rect_x
+        if available is not None:
+            ahead &= available[:, :-1]
+        dx = np.where(ahead, ex[None, :-1] - rect_x, np.iinfo(np.int64).max)
+        if dx.shape[1] == 0:
+            return np.ones(self.num_envs), np.zeros(self.num_envs)
+        nearest = dx.argmin(axis=1)
+        found = ahead[self.rows, nearest]
+        return (np.where(found, dx[self.rows, nearest] / SCREEN_WIDTH, 1.0),
+                np.where(found, (ey[nearest] - self.rect_y) / SCREEN_HEIGHT, 0.0))
+
+    def observe(self):
+        # (N, OBSERVATION_SIZE) float32: estado del jugador y la siguiente plataforma, pincho,
+        # parásito e ítem por delante (las plataformas móviles en su posición del tick actual)
+        obs = np.empty((self.num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        obs[:, 0] = self.x / self.level.width
+        obs[:, 1] = self.y / SCREEN_HEIGHT
+        obs[:, 2] = self.vel_x / PLAYER_MAX_SPEED
+        obs[:, 3] = self.vel_y / -JUMP_STRENGTH
+        obs[:, 4] = self.on_ground
+        obs[:, 5] = self.energy / MAX_ENERGY
+        px, py, pw, _ = self._platform_candidates()
+        ahead = (px + pw > self.rect_x[:, None]) & (px != FAR_AWAY)
+        dx = np.where(ahead, px - self.rect_x[:, None], np.iinfo(np.int64).max)
+        nearest = dx.argmin(axis=1)
+        found = ahead[self.rows, nearest]
+        obs[:, 6] = np.where(found, dx[self.rows, nearest] / SCREEN_WIDTH, 1.0)
+        obs[:, 7] = np.where(found, (py[self.rows, nearest] - self.rect_y) / SCREEN_HEIGHT, 0.0)
+        obs[:, 8], obs[:, 9] = self._nearest_ahead(self.spike_x, self.spike_y, self.spike_w)
+        obs[:, 10], obs[:, 11] = self._nearest_ahead(self.obstacle_x, self.obstacle_y, self.obstacle_w, ~self.hit)
+        obs[:, 12], obs[:, 13] = self._nearest_ahead(self.item_x, self.item_y, self.item_w, ~self.collected)
+        return obs
+
+# Rendimiento: python batch_env.py --envs 4096 --steps 500
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+    import pygame
+
+    parser = argparse.ArgumentParser(description="Pasos por segundo del entorno por lotes de Moto Glóbulo Rojo")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    env = BatchEnv(args.envs, args.level, args.seed)
+    rng = np.random.default_rng(args.seed)
+    env.reset()
+    episodes = 0
+    wins = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        # Acciones al azar con preferencia por ir a la derecha
+        actions = rng.choice(len(BATCH_ACTIONS), size=args.envs, p=(0.05, 0.05, 0.5, 0.05, 0.05, 0.3))
+        obs, rewards, dones, info = env.step(actions)
+        episodes += int(dones.sum())
+        wins += int(info["won"].sum())
+    elapsed = time.perf_counter() - start
+    steps = args.envs * args.steps
+    print(f"{steps} pasos en {elapsed:.2f}s ({steps / elapsed:,.0f} pasos/s), {episodes} episodios, {wins} en la meta")
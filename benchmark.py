@@ -0,0 +1,207 @@
+# benchmark.py
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import numpy as np
+import pygame
+from constants import *
+from level import Level
+from player import Player
+from session import GameSession
+from physics import make_backend
+import level_cache
+import level_templates
+
+# --- Benchmarks de las partes calientes del juego ---
+# Mide la construcción de niveles, la física del jugador, el dibujado y la pasada de
+# recogida/daño de session.py, también en niveles sintéticos con 10x o 100x entidades.
+# Escribe los resultados en JSON (media y percentiles por caso) para comparar entre versiones:
+#   python benchmark.py --scales 1,10,100 --output bench.json
+
+CASES = ("build", "physics", "render", "render_cold", "contacts")
+
+def summarize(case, level_number, scale, samples_s, **extra):
+    # Tiempos en segundos -> resumen en milisegundos
+    samples = np.array(samples_s) * 1000.0
+    result = {
+        "case": case,
+        "level": level_number,
+        "scale": scale,
+        "samples": len(samples),
+        "unit": "ms",
+        "mean": float(samples.mean()),
+        "min": float(samples.min()),
+        "p50": float(np.percentile(samples, 50)),
+        "p90": float(np.percentile(samples, 90)),
+        "p99": float(np.percentile(samples, 99)),
+        "max": float(samples.max()),
+        "total_s": float(samples.sum() / 1000.0),
+    }
+    result.update(extra)
+    return result
+
+class ScaledLevel(Level):
+    # Nivel sintético: scale copias del nivel una detrás de otra (scale veces más ancho y más entidades)
+    def __init__(self, level_number, scale, seed):
+        self.scale = scale
+        super().__init__(level_number, seed, use_cache=False)
+
+    def _generate_level_elements(self):
+        self.width = LEVEL_WIDTH * self.scale
+        records = []
+        for copy in range(self.scale):
+            for record in level_templates.generate_layout(self.level_number, self.rng):
+                if record[0] == level_cache.FINISH_LINE:
+                    continue
+                records.append((record[0], record[1] + copy * LEVEL_WIDTH) + record[2:])
+        records.append((level_cache.FINISH_LINE, self.width - FINISH_LINE_WIDTH - 50, 0,
+                        FINISH_LINE_WIDTH, SCREEN_HEIGHT, 0, 0.0))
+        self._build_from_records(records)
+
+    def _blit_background_slice(self, surface, chunk_left, chunk_right):
+        # Como en el modo infinito, el fondo se repite en cada copia: sin él los trozos más allá
+        # de la primera saldrían vacíos y render/render_cold medirían menos trabajo del real
+        copy_left = math.floor(chunk_left / LEVEL_WIDTH) * LEVEL_WIDTH
+        while copy_left < chunk_right:
+            super()._blit_background_slice(surface, chunk_left - copy_left, chunk_right - copy_left)
+            copy_left += LEVEL_WIDTH
+
+def make_level(level_number, scale=1, seed=0):
+    if scale == 1:
+        return Level(level_number, seed, use_cache=False)
+    return ScaledLevel(level_number, scale, seed)
+
+def entity_count(level):
+    return len(level.platforms) + len(level.items) + len(level.obstacles) + len(level.spikes)
+
+def run_benchmarks(cases=CASES, levels=range(1, MAX_LEVELS + 1), scales=(1,), seed=0, repeat=5, ticks=10000,
+                   physics=PHYSICS_BACKEND):
+    results = []
+    view = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for scale in scales:
+        for level_number in levels:
+            if "build" in cases:
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    level = make_level(level_number, scale, seed)
+                    samples.append(time.perf_counter() - start)
+                results.append(summarize("build", level_number, scale, samples, entities=entity_count(level)))
+
+            level = make_level(level_number, scale, seed)
+
+            if "physics" in cases:
+                # ticks llamadas a Player.update con el broadphase del backend; corre a la derecha y salta
+                backend = make_backend(physics)
+                player = Player(100, SCREEN_HEIGHT - 50 - PLAYER_HEIGHT)
+                backend.contacts(player, level) # Construir el espacio fuera de la medida
+                player.move_right()
+                samples = []
+                for tick in range(ticks):
+                    if tick % 45 == 0:
+                        player.jump()
+                    start = time.perf_counter()
+                    backend.move_player(player, level, 1.0)
+                    samples.append(time.perf_counter() - start)
+                    if player.rect.x > level.width - SCREEN_WIDTH:
+                        player.reset_position(100, SCREEN_HEIGHT - 50 - PLAYER_HEIGHT)
+                results.append(summarize("physics", level_number, scale, samples, final_x=player.rect.x,
+                                         physics=physics))
+
+            offsets = [round(f * (level.width - SCREEN_WIDTH)) for f in (0.0, 0.25, 0.5, 0.75, 1.0)]
+            if "render" in cases:
+                # Capa estática ya construida: el coste normal de un frame
+                samples = []
+                for offset in offsets:
+                    level.draw(view, offset) # Calentar los trozos de esta posición
+                    for _ in range(repeat * 20):
+                        start = time.perf_counter()
+                        level.draw(view, offset)
+                        samples.append(time.perf_counter() - start)
+                results.append(summarize("render", level_number, scale, samples, offsets=offsets))
+
+            if "render_cold" in cases:
+                # Cada frame reconstruye los trozos de la capa estática (primer frame en una zona nueva)
+                samples = []
+                for offset in offsets:
+                    for _ in range(repeat):
+                        level.static_layer.invalidate()
+                        start = time.perf_counter()
+                        level.draw(view, offset)
+                        samples.append(time.perf_counter() - start)
+                results.append(summarize("render_cold", level_number, scale, samples, offsets=offsets))
+
+            if "contacts" in cases:
+                # Pasada de recogida/daño de GameSession recorriendo el nivel a varias alturas
+                session = GameSession(seed=seed, use_level_cache=False) # Sin escribir en LEVEL_CACHE_DIR
+                session.physics = make_backend(physics)
+                session.level = make_level(level_number, scale, seed)
+                session.physics.contacts(session.player, session.level) # Construir el espacio fuera de la medida
+                samples = []
+                for y in (SCREEN_HEIGHT - 50 - PLAYER_HEIGHT, SCREEN_HEIGHT - 200, SCREEN_HEIGHT - 300):
+                    for x in range(0, session.level.width - PLAYER_WIDTH, 8 * scale):
+                        session.player.rect.topleft = (x, y)
+                        start = time.perf_counter()
+                        session.check_contacts()
+                        samples.append(time.perf_counter() - start)
+                results.append(summarize("contacts", level_number, scale, samples,
+                                         items_left=len(session.level.items),
+                                         obstacles_left=len(session.level.obstacles), physics=physics))
+    return results
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de Moto Glóbulo Rojo")
+    parser.add_argument("--cases", default=",".join(CASES), help="casos separados por comas: " + ", ".join(CASES))
+    parser.add_argument("--levels", default=f"1-{MAX_LEVELS}", help="niveles, p. ej. 1-10 o 1,3,5")
+    parser.add_argument("--scales", default="1", help="multiplicadores de entidades, p. ej. 1,10,100")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=10000, help="ticks de Player.update por nivel")
+    parser.add_argument("--physics", default=PHYSICS_BACKEND, help="backend de física para physics y contacts")
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args(argv)
+
+    cases = args.cases.split(",")
+    for case in cases:
+        if case not in CASES:
+            parser.error(f"caso desconocido: {case}")
+    if "-" in args.levels:
+        first, last = args.levels.split("-")
+        levels = range(int(first), int(last) + 1)
+    else:
+        levels = [int(n) for n in args.levels.split(",")]
+    scales = [int(n) for n in args.scales.split(",")]
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    # Con modo de vídeo las superficies se convierten como en el juego
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = run_benchmarks(cases, levels, scales, args.seed, args.repeat, args.ticks, args.physics)
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "args": vars(args), "results": results}, f, indent=2)
+
+    print(f"{'caso':<12}{'nivel':>6}{'escala':>7}{'n':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for r in results:
+        print(f"{r['case']:<12}{r['level']:>6}{r['scale']:>7}{r['samples']:>7}"
+              f"{r['p50']:>10.3f}{r['p99']:>10.3f}{r['max']:>10.3f}")
+    print(f"Resultados en {args.output}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,6 +36,22 @@ SPIKE_WIDTH = 40 # Aumentado para que la sierra se vea mejor
 SPIKE_HEIGHT = 40 # Aumentado
 SPIKE_DAMAGE = 15
 
+# Spatial index (broadphase) column width in pixels
+SPATIAL_CELL_SIZE = 128
+
+# Static level layer: pre-rendered chunks (background, ground, static platforms, spikes, finish line)
+STATIC_CHUNK_WIDTH = SCREEN_WIDTH
+STATIC_CHUNK_CACHE_SIZE = 4 # Least recently used chunks beyond this are dropped
+
+# Moving platforms off screen by more than this many pixels only update their arrays, not their rects
+MOVER_SYNC_MARGIN = 100
+
+# Endless mode (see endless.py): the world is generated in chunks of this width from the level templates
+ENDLESS_CHUNK_WIDTH = 2000
+ENDLESS_GENERATE_AHEAD = SCREEN_WIDTH # Content always exists this far past the right edge of the screen
+ENDLESS_KEEP_BEHIND = SCREEN_WIDTH * 2 # Chunks entirely this far behind the camera are evicted
+ENDLESS_CHUNKS_PER_TEMPLATE = 2 # Chunks built from each level template before moving to the next one
+
 # Finish Line properties
 FINISH_LINE_WIDTH = 50
 
@@ -46,6 +62,86 @@ ICE_ACCELERATION_MULTIPLIER = 1.5
 # Level transition
 MAX_LEVELS = 10
 LEVEL_TRANSITION_DELAY_MS = 3000 # 3 seconds
+# The next level is built in the background during the transition screen. If True the screen
+# ends as soon as it is ready instead of waiting for the full delay (not deterministic in ticks)
+LEVEL_TRANSITION_END_WHEN_READY = False
+
+# Generated layouts for explicit seeds are cached here (see level_cache.py)
+LEVEL_CACHE_DIR = '.level_cache'
+# Level layouts (blocks of platforms, items, obstacles...) are data, see level_templates.py
+LEVEL_TEMPLATES_FILE = 'levels.json'
+
+# Fixed timestep: physics constants above are tuned per tick at PHYSICS_REFERENCE_RATE,
+# other simulation rates scale them by dt = PHYSICS_REFERENCE_RATE / SIMULATION_RATE
+PHYSICS_REFERENCE_RATE = 60
+SIMULATION_RATE = 60 # Simulation ticks per second
+RENDER_RATE = 144 # Max frames drawn per second (0 = uncapped)
+IDLE_RENDER_RATE = 30 # Loop rate while the screen has nothing new to show (menus, static screens)
+MAX_FRAME_TIME_MS = 250 # Longer frames are clamped so the simulation doesn't spiral
+
+# Game states
+MENU = 0
+GAME = 1
+GAME_OVER = 2
+CONTROLS = 3
+LEVEL_COMPLETE_SCREEN = 4
+GAME_WON = 5
+
+# UI: max rendered text surfaces kept in the cache
+TEXT_CACHE_SIZE = 128
+
+# Frame profiler overlay (see profiler.py)
+PROFILER_KEY = pygame.K_F3 # Toggles the overlay in any state
+PROFILER_WINDOW = 240 # Frames kept for percentiles and the histogram
+PROFILER_REFRESH_MS = 250 # How often the overlay numbers are recomputed
+PROFILER_HISTOGRAM_BIN_MS = 2
+PROFILER_HISTOGRAM_BINS = 20 # The last bin also holds every slower frame
+FRAME_BUDGET_MS = 1000 / 60 # Slower frames are over budget (red in the histogram, logged in telemetry)
+
+# Telemetry ring buffer and Chrome trace export (see telemetry.py)
+TELEMETRY_ENABLED = True
+TELEMETRY_BUFFER_SIZE = 50000 # Most recent events kept
+TELEMETRY_COUNTER_INTERVAL_MS = 1000 # Per-frame counts are summed and emitted at this interval
+TELEMETRY_TRACE_DIR = 'traces' # Dumped on exit and with TELEMETRY_DUMP_KEY
+TELEMETRY_DUMP_KEY = pygame.K_F9
+
+# Collision backend used by GameSession (see physics.py): "arcade" (pure Python grids) or
+# "pymunk" (pymunk's C broadphase, sensor callbacks for items/obstacles/spikes). Same results.
+PHYSICS_BACKEND = "arcade"
+
+# Every game's inputs are recorded here with its seed; replay them with: python replay.py <file>
+RECORD_INPUTS = True
+RECORDINGS_DIR = 'recordings'
+RECORDINGS_KEEP = 50 # Older recordings in RECORDINGS_DIR are deleted when a new one is written
+
+# Offline level validator (see validator.py): best-first search over the player's reachable states
+VALIDATOR_MACRO_TICKS = 5 # Ticks each long search action is held (1-tick actions are always tried too)
+VALIDATOR_MAX_TICKS = 60 * 120 # States later than this (2 minutes at 60 Hz) are dropped
+VALIDATOR_MAX_EXPANSIONS = 10000 # Search budget per level; the result says if it ran out
+VALIDATOR_DAMAGE_WEIGHT = 30 # Pixels of progress one point of damage is worth to the search
+# Visited states are memoized in cells of this size
+VALIDATOR_POSITION_STEP = 8
+VALIDATOR_HEIGHT_STEP = 16
+VALIDATOR_VELOCITY_STEP = 2
+VALIDATOR_TIME_STEP = 15 # Ticks per bucket of a moving platform's cycle, only within VALIDATOR_MOVER_REACH pixels of it
+VALIDATOR_MOVER_REACH = 100
+
+# Batch environment for bots and training (see batch_env.py)
+BATCH_MAX_EPISODE_TICKS = 60 * 120 # Episodes end after this many ticks (2 minutes at 60 Hz)
+BATCH_IRON_REWARD = 1.0 # Per iron collected
+BATCH_ENERGY_REWARD = 0.05 # Per point of energy gained (negative when damaged)
+BATCH_FINISH_REWARD = 10.0 # For reaching the finish line
+
+# Autopilot bot (see autopilot.py): picks the best of a few short input plans by simulating them
+AUTOPILOT_HORIZON = 50 # Ticks each plan is simulated ahead
+AUTOPILOT_REPLAN_TICKS = 4 # Ticks a chosen plan is followed before choosing again
+AUTOPILOT_DAMAGE_WEIGHT = 10 # Pixels of progress one point of damage is worth
+AUTOPILOT_IRON_BONUS = 40 # Pixels of progress one iron is worth
+AUTOPILOT_DEATH_PENALTY = 10 ** 6 # Plans that die score below every plan that doesn't (reaching the finish adds it)
+AUTOPILOT_STUCK_TICKS = 180 # Without new progress for this long the bot picks a random surviving plan
+AUTOPILOT_KEY = pygame.K_F2 # Toggles the autopilot while playing in main.py
+SOAK_REPORT_INTERVAL_S = 60 # Soak runs record frame times and memory once per this many seconds
+SOAK_LEVEL_TIMEOUT_TICKS = 60 * 180 # A soak game stuck this long on one level restarts with the next seed
 
 # Colors (RGB)
 WHITE = (255, 255, 255)
@@ -63,28 +159,40 @@ GRAY = (128, 128, 128)
 FINISH_LINE_COLOR = GREEN # Just for the visual cue, will be replaced by image
 
 # --- IMAGENES ---
-# Rutas de imágenes del jugador
+# Los sprites se cargan por nombre de frame desde los spritesheets de Kenney (ver assets.py)
+SPRITESHEETS = [
+    'assets/Spritesheets/spritesheet-backgrounds-default.xml',
+    'assets/Spritesheets/spritesheet-characters-default.xml',
+    'assets/Spritesheets/spritesheet-enemies-default.xml',
+    'assets/Spritesheets/spritesheet-tiles-default.xml',
+]
+# Sprites que no están en ningún spritesheet: nombre de frame -> archivo
+LOOSE_SPRITES = {
+    'fish': 'assets/Sprites/Tiles/Default/fish.png',
+}
+
+# Frames del jugador
 # Usaremos 'character_green_front' como el sprite base para el glóbulo rojo/vehículo
-PLAYER_SPRITE_IDLE = 'assets/Sprites/Characters/Default/character_green_front.png'
+PLAYER_SPRITE_IDLE = 'character_green_front'
 # Puedes añadir más para animaciones en el futuro:
-PLAYER_SPRITE_WALK_A = 'assets/Sprites/Characters/Default/character_green_walk_a.png'
-PLAYER_SPRITE_WALK_B = 'assets/Sprites/Characters/Default/character_green_walk_b.png'
-PLAYER_SPRITE_JUMP = 'assets/Sprites/Characters/Default/character_green_jump.png'
-PLAYER_SPRITE_HIT = 'assets/Sprites/Characters/Default/character_green_hit.png'
+PLAYER_SPRITE_WALK_A = 'character_green_walk_a'
+PLAYER_SPRITE_WALK_B = 'character_green_walk_b'
+PLAYER_SPRITE_JUMP = 'character_green_jump'
+PLAYER_SPRITE_HIT = 'character_green_hit'
 
-# Rutas para otros elementos
+# Frames para otros elementos
 # Puedes usar un sprite de ítem que parezca una molécula de hierro o un cristal
-ITEM_IMAGE = 'assets/Sprites/Tiles/Default/fish.png' # O busca uno que se parezca al hierro
+ITEM_IMAGE = 'fish' # O busca uno que se parezca al hierro
 
 # Sprites de Enemigos (Parásitos)
 # Puedes elegir cuál te gusta más para el obstáculo principal
-OBSTACLE_IMAGE = 'assets/Sprites/Enemies/Default/slime_normal_rest.png'
+OBSTACLE_IMAGE = 'slime_normal_rest'
 
 # Sprite de Spikes (Pinchos)
-SPIKE_IMAGE = 'assets/Sprites/Tiles/Default/saw.png' # Usaremos la sierra
+SPIKE_IMAGE = 'saw' # Usaremos la sierra
 
-# Rutas para el entorno
-PLATFORM_IMAGE = 'assets/Sprites/Tiles/Default/brick_brown.png' # Todavía necesitas crear o encontrar esta
-FINISH_LINE_IMAGE = 'assets/Sprites/Tiles/Default/fish.png' # Todavía necesitas crear o encontrar esta
+# Frames para el entorno
+PLATFORM_IMAGE = 'brick_brown' # Todavía necesitas crear o encontrar esta
+FINISH_LINE_IMAGE = 'fish' # Todavía necesitas crear o encontrar esta
 
-BACKGROUND_IMAGE = 'assets/Sprites/Backgrounds/Default/background_clouds.png' # Por ejemplo
\ No newline at end of file
+BACKGROUND_IMAGE = 'background_clouds' # Por ejemplo
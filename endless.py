@@ -0,0 +1,154 @@
+# endless.py
+
+import math
+import random
+import time
+from collections import deque
+import pygame
+from constants import *
+from level import Level, build_entity
+import level_cache
+import level_templates
+from telemetry import telemetry
+
+# --- Modo infinito ---
+# El mundo no tiene ancho fijo: se genera por trozos de ENDLESS_CHUNK_WIDTH justo por
+# delante de la cámara con los bloques de las plantillas de nivel (primero los del nivel 1,
+# luego los del 2...). Los trozos que quedan muy atrás se descartan con sus entidades,
+# sus entradas en índices y rejillas, sus plataformas móviles y los trozos de la capa
+# estática, así que la memoria y el coste por frame no crecen con la distancia recorrida.
+
+class WorldChunk:
+    def __init__(self, left):
+        self.left = left
+        self.right = left # Borde derecho de todo lo que contiene (incluido el recorrido de las móviles)
+        self.platforms = []
+        self.movers = []
+        self.items = []
+        self.obstacles = []
+        self.spikes = []
+
+class EndlessLevel(Level):
+    def __init__(self, seed=None):
+        self.level_number = 1
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.terrain_type = "normal"
+        self.items = pygame.sprite.Group()
+        self.obstacles = pygame.sprite.Group()
+        self.platforms = []
+        self.spikes = []
+        self.finish_line = None # No hay meta: se juega hasta quedarse sin energía
+        self.width = math.inf
+        self.background_image = self._load_background()
+        # El suelo acompaña a la cámara (ver update)
+        self.ground_rect = pygame.Rect(-SCREEN_WIDTH, SCREEN_HEIGHT - 50, SCREEN_WIDTH * 3, 50)
+
+        self.template_numbers = sorted(level_templates.load_templates())
+        self.chunks = deque() # Trozos vivos, de izquierda a derecha
+        self.chunks_generated = 0
+        self.chunks_evicted = 0
+        self.generated_until = 200 # x del siguiente bloque; deja libre la salida del jugador
+        self._build_runtime_structures() # Índices y rejillas vacíos; los trozos se añaden después
+        self.stream(0)
+
+    def stream(self, camera_offset_x):
+        # Genera por delante de la cámara y descarta lo que ha quedado atrás
+        while self.generated_until < camera_offset_x + SCREEN_WIDTH + ENDLESS_GENERATE_AHEAD:
+            self._add_chunk()
+        evict_before = camera_offset_x - ENDLESS_KEEP_BEHIND
+        while self.chunks and self.chunks[0].right < evict_before:
+            self._evict_chunk(self.chunks.popleft())
+
+    def _add_chunk(self):
+        start = time.perf_counter()
+        chunk = WorldChunk(self.generated_until)
+        template = self.template_numbers[(self.chunks_generated // ENDLESS_CHUNKS_PER_TEMPLATE)
+                                         % len(self.template_numbers)]
+        records, self.generated_until = level_templates.generate_run(
+            template, self.rng, chunk.left, chunk.left + ENDLESS_CHUNK_WIDTH)
+
+        for record in records:
+            kind = record[0]
+            entity = build_entity(*record)
+            right = entity.rect.right
+            if kind == level_cache.MOVING_PLATFORM:
+                chunk.movers.append(entity)
+                self.mover_index.insert(entity)
+                right = entity.travel_extent()[1]
+            elif kind == level_cache.PLATFORM:
+                chunk.platforms.append(entity)
+                self.platform_index.insert(entity)
+            elif kind == level_cache.ITEM:
+                chunk.items.append(entity)
+                self.items.add(entity)
+                self.item_index.insert(entity)
+                self.item_grid.insert(entity)
+            elif kind == level_cache.OBSTACLE:
+                chunk.obstacles.append(entity)
+                self.obstacles.add(entity)
+                self.obstacle_index.insert(entity)
+                self.obstacle_grid.insert(entity)
+            elif kind == level_cache.SPIKE:
+                chunk.spikes.append(entity)
+                self.spikes.append(entity)
+                self.spike_index.insert(entity)
+                self.spike_grid.insert(entity)
+            if kind == level_cache.PLATFORM or kind == level_cache.MOVING_PLATFORM:
+                self.platforms.append(entity)
+                self.platform_grid.insert(entity)
+            chunk.right = max(chunk.right, right)
+
+        self.movers.add(chunk.movers)
+        self.chunks.append(chunk)
+        self.chunks_generated += 1
+        # Por si ya se había dibujado algún trozo de la capa estática en esta zona
+        self.static_layer.invalidate(chunk.left, chunk.right)
+        telemetry.complete("endless_chunk_build", start, "level", left=chunk.left, template=template,
+                           entities=len(records))
+
+    def _evict_chunk(self, chunk):
+        start = time.perf_counter()
+        for platform in chunk.platforms:
+            self.platform_index.remove(platform)
+            self.platform_grid.remove(platform)
+        for platform in chunk.movers:
+            self.mover_index.remove(platform)
+            self.platform_grid.remove(platform)
+        self.movers.remove(chunk.movers)
+        if chunk.platforms or chunk.movers:
+            gone = set(chunk.platforms)
+            gone.update(chunk.movers)
+            self.platforms = [p for p in self.platforms if p not in gone]
+        for item in chunk.items:
+            if item.alive(): # Los ya recogidos salieron al recogerlos
+                self.remove_item(item)
+        for obstacle in chunk.obstacles:
+            if obstacle.alive():
+                self.remove_obstacle(obstacle)
+        for spike in chunk.spikes:
+            self.spike_index.remove(spike)
+            self.spike_grid.remove(spike)
+        if chunk.spikes:
+            gone = set(chunk.spikes)
+            self.spikes = [s for s in self.spikes if s not in gone]
+        self.static_layer.invalidate(chunk.left, chunk.right)
+        self.chunks_evicted += 1
+        telemetry.complete("endless_chunk_evict", start, "level", left=chunk.left)
+
+    def update(self, dt=1.0, camera_offset_x=None):
+        if camera_offset_x is not None:
+            self.stream(camera_offset_x)
+            self.ground_rect.x = camera_offset_x - SCREEN_WIDTH
+        super().update(dt, camera_offset_x)
+
+    def _draw_ground(self, surface, chunk_left):
+        # El suelo es infinito: ocupa todo el trozo, no solo donde está ground_rect ahora
+        surface.fill(self.ground_color(), (0, self.ground_rect.y, surface.get_width(), self.ground_rect.height))
+
+    def _blit_background_slice(self, surface, chunk_left, chunk_right):
+        # La imagen de fondo se repite cada LEVEL_WIDTH píxeles
+        tile_left = math.floor(chunk_left / LEVEL_WIDTH) * LEVEL_WIDTH
+        while tile_left < chunk_right:
+            super()._blit_background_slice(surface, chunk_left - tile_left, chunk_right - tile_left)
+            tile_left += LEVEL_WIDTH
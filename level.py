@@ -1,8 +1,19 @@
 # level.py
 
+import itertools
+import math
+import numpy as np
 import pygame
 import random
+import threading
+import time
 from constants import *
+from assets import asset_manager
+from telemetry import telemetry
+from spatial import XSortedIndex, SpatialHash
+from static_layer import StaticLayerCache
+import level_cache
+import level_templates
 
 # --- Clases para los elementos del juego ---
 
@@ -11,10 +22,12 @@ class Item(pygame.sprite.Sprite):
         super().__init__()
         self.original_image = None
         try:
-            self.original_image = pygame.image.load(ITEM_IMAGE).convert_alpha()
-            self.image = pygame.transform.scale(self.original_image, (ITEM_SIZE, ITEM_SIZE))
+            # Frame del spritesheet compartido por todas las instancias (ver assets.py)
+            self.original_image = asset_manager.load_frame(ITEM_IMAGE)
+            self.image = asset_manager.load_frame(ITEM_IMAGE, (ITEM_SIZE, ITEM_SIZE))
         except pygame.error as e:
             print(f"Error al cargar la imagen del ítem: {e}. Usando placeholder.")
+            telemetry.instant("asset_error", "assets", sprite=ITEM_IMAGE, error=str(e))
             self.image = pygame.Surface((ITEM_SIZE, ITEM_SIZE))
             self.image.fill(YELLOW) # Placeholder
         self.rect = self.image.get_rect(topleft=(x, y))
@@ -27,10 +40,12 @@ class Obstacle(pygame.sprite.Sprite):
         super().__init__()
         self.original_image = None
         try:
-            self.original_image = pygame.image.load(OBSTACLE_IMAGE).convert_alpha()
-            self.image = pygame.transform.scale(self.original_image, (OBSTACLE_SIZE, OBSTACLE_SIZE))
+            # Frame del spritesheet compartido por todas las instancias (ver assets.py)
+            self.original_image = asset_manager.load_frame(OBSTACLE_IMAGE)
+            self.image = asset_manager.load_frame(OBSTACLE_IMAGE, (OBSTACLE_SIZE, OBSTACLE_SIZE))
         except pygame.error as e:
             print(f"Error al cargar la imagen del obstáculo: {e}. Usando placeholder.")
+            telemetry.instant("asset_error", "assets", sprite=OBSTACLE_IMAGE, error=str(e))
             self.image = pygame.Surface((OBSTACLE_SIZE, OBSTACLE_SIZE))
             self.image.fill(RED) # Placeholder
         self.rect = self.image.get_rect(topleft=(x, y))
@@ -51,30 +66,126 @@ class Platform(pygame.sprite.Sprite):
 class MovingPlatform(Platform):
     def __init__(self, x, y, width, height, move_range, speed):
         super().__init__(x, y, width, height)
+        self.x = float(x) # Posición sub-píxel; rect.x se deriva de ella
+        self.prev_x = self.x # Posición al inicio del último update, para interpolar el dibujo
         self.start_x = x
         self.end_x = x + move_range
         self.speed = speed
         self.direction = 1 # 1 for right, -1 for left
 
-    def update(self):
-        self.rect.x += self.speed * self.direction
-        if self.rect.right > self.end_x or self.rect.left < self.start_x:
+    def update(self, dt=1.0):
+        self.prev_x = self.x
+        self.x += self.speed * self.direction * dt
+        if self.x + self.rect.width > self.end_x or self.x < self.start_x:
             self.direction *= -1 # Reverse direction
             # Ajustar la posición para evitar que se salga del rango por un tick
             if self.direction == 1: # Si va a la derecha, ajustar el left
-                self.rect.left = self.start_x 
+                self.x = float(self.start_x)
             else: # Si va a la izquierda, ajustar el right
-                self.rect.right = self.end_x
-            
+                self.x = float(self.end_x - self.rect.width)
+        self.rect.x = math.floor(self.x)
+
+    def draw_position(self, alpha=1.0):
+        # Igual que Player.draw_position: entre el tick anterior y el actual
+        return round(self.prev_x + (self.x - self.prev_x) * alpha)
+
+    def draw(self, screen, camera_offset_x, alpha=1.0):
+        screen.blit(self.image, (self.draw_position(alpha) - camera_offset_x, self.rect.y))
+
+    def travel_extent(self):
+        # Todo el tramo horizontal que puede ocupar mientras se mueve
+        return (min(self.start_x, self.end_x - self.rect.width),
+                max(self.end_x, self.start_x + self.rect.width))
+
+# --- Plataformas móviles en estructura de arrays (NumPy) ---
+# Todas las plataformas móviles de un nivel avanzan en un único paso vectorizado.
+# Los objetos MovingPlatform (rect, dibujo, colisiones) solo se sincronizan con los
+# arrays cuando su recorrido entra en la zona visible.
+
+class MovingPlatformSet:
+    ARRAYS = ("x", "prev_x", "start_x", "end_x", "speed", "direction", "width", "extent_left", "extent_right")
+
+    def __init__(self, platforms):
+        self.platforms = list(platforms)
+        self.x = np.array([p.x for p in self.platforms], dtype=np.float64)
+        self.prev_x = np.array([p.prev_x for p in self.platforms], dtype=np.float64)
+        self.start_x = np.array([p.start_x for p in self.platforms], dtype=np.float64)
+        self.end_x = np.array([p.end_x for p in self.platforms], dtype=np.float64)
+        self.speed = np.array([p.speed for p in self.platforms], dtype=np.float64)
+        self.direction = np.array([p.direction for p in self.platforms], dtype=np.float64)
+        self.width = np.array([p.rect.width for p in self.platforms], dtype=np.float64)
+        extents = [p.travel_extent() for p in self.platforms]
+        self.extent_left = np.array([e[0] for e in extents], dtype=np.float64)
+        self.extent_right = np.array([e[1] for e in extents], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def add(self, platforms):
+        # Añade plataformas al final de los arrays (modo infinito, ver endless.py)
+        added = MovingPlatformSet(platforms)
+        self.platforms += added.platforms
+        for name in self.ARRAYS:
+            setattr(self, name, np.concatenate((getattr(self, name), getattr(added, name))))
+
+    def remove(self, platforms):
+        # Quita plataformas y reindexa los arrays conservando el estado de las demás
+        gone = set(platforms)
+        keep = np.array([p not in gone for p in self.platforms], dtype=bool)
+        self.platforms = [p for p in self.platforms if p not in gone]
+        for name in self.ARRAYS:
+            setattr(self, name, getattr(self, name)[keep])
+
+    def update(self, dt=1.0):
+        # Misma lógica de rebote que MovingPlatform.update, para todas a la vez
+        if not self.platforms:
+            return
+        self.prev_x[:] = self.x
+        x = self.x
+        x += self.speed * self.direction * dt
+        bounce = (x + self.width > self.end_x) | (x < self.start_x)
+        if bounce.any():
+            self.direction[bounce] *= -1
+            to_right = bounce & (self.direction == 1)
+            to_left = bounce & (self.direction == -1)
+            x[to_right] = self.start_x[to_right]
+            x[to_left] = self.end_x[to_left] - self.width[to_left]
+
+    def sync(self, left=None, right=None):
+        # Copia la posición a las plataformas cuyo recorrido se solapa con [left, right)
+        # (todas si no hay ventana) y devuelve las que han cambiado de rect
+        if not self.platforms:
+            return []
+        if left is None:
+            indices = range(len(self.platforms))
+        else:
+            indices = np.flatnonzero((self.extent_right > left) & (self.extent_left < right)).tolist()
+        moved = []
+        xs = self.x
+        prev_xs = self.prev_x
+        directions = self.direction
+        for i in indices:
+            platform = self.platforms[i]
+            platform.x = float(xs[i])
+            platform.prev_x = float(prev_xs[i])
+            platform.direction = int(directions[i])
+            new_x = math.floor(platform.x)
+            if new_x != platform.rect.x:
+                platform.rect.x = new_x
+                moved.append(platform)
+        return moved
+
 class Spike(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
         self.original_image = None
         try:
-            self.original_image = pygame.image.load(SPIKE_IMAGE).convert_alpha()
-            self.image = pygame.transform.scale(self.original_image, (SPIKE_WIDTH, SPIKE_HEIGHT))
+            # Frame del spritesheet compartido por todas las instancias (ver assets.py)
+            self.original_image = asset_manager.load_frame(SPIKE_IMAGE)
+            self.image = asset_manager.load_frame(SPIKE_IMAGE, (SPIKE_WIDTH, SPIKE_HEIGHT))
         except pygame.error as e:
             print(f"Error al cargar la imagen de los pinchos: {e}. Usando placeholder.")
+            telemetry.instant("asset_error", "assets", sprite=SPIKE_IMAGE, error=str(e))
             self.image = pygame.Surface((SPIKE_WIDTH, SPIKE_HEIGHT))
             pygame.draw.polygon(self.image, GRAY, [(0, SPIKE_HEIGHT), (SPIKE_WIDTH // 2, 0), (SPIKE_WIDTH, SPIKE_HEIGHT)]) # Triángulo gris
         self.rect = self.image.get_rect(topleft=(x, y))
@@ -92,370 +203,302 @@ class FinishLine(pygame.sprite.Sprite):
     def draw(self, screen, camera_offset_x):
         screen.blit(self.image, (self.rect.x - camera_offset_x, self.rect.y))
 
+def build_entity(kind, x, y, w, h, move_range, speed):
+    # Crea la entidad de un registro de level_cache
+    if kind == level_cache.PLATFORM:
+        return Platform(x, y, w, h)
+    elif kind == level_cache.MOVING_PLATFORM:
+        return MovingPlatform(x, y, w, h, move_range, speed)
+    elif kind == level_cache.ITEM:
+        return Item(x, y)
+    elif kind == level_cache.OBSTACLE:
+        return Obstacle(x, y)
+    elif kind == level_cache.SPIKE:
+        return Spike(x, y)
+    elif kind == level_cache.FINISH_LINE:
+        return FinishLine(x, y)
+    raise ValueError(f"Tipo de entidad desconocido: {kind}")
+
 # --- Clase Level ---
 
+# Subir cuando cambie la generación: invalida los niveles guardados en LEVEL_CACHE_DIR.
+# La clave de la caché también incluye un hash de LEVEL_TEMPLATES_FILE.
+GENERATOR_VERSION = 2
+
 class Level:
-    def __init__(self, level_number):
+    def __init__(self, level_number, seed=None, use_cache=True):
+        build_start = time.perf_counter()
         self.level_number = level_number
+        # Con la misma semilla se genera siempre el mismo nivel. Sin semilla se elige una al azar
+        # (cada partida es distinta) y no se usa la caché en disco.
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
         self.terrain_type = self.get_terrain_type(level_number)
-        self.items = []
-        self.obstacles = []
+        # Ítems y parásitos en grupos de sprites: kill() los quita en O(1)
+        self.items = pygame.sprite.Group()
+        self.obstacles = pygame.sprite.Group()
         self.platforms = [] 
         self.spikes = []
         self.finish_line = None
-        
-        self.background_image = None
+        self.width = LEVEL_WIDTH # Ancho del mundo; infinito en el modo sin fin (endless.py)
+        self.background_image = self._load_background()
+
+        cache_path = None
+        records = None
+        if seed is not None and use_cache:
+            cache_path = level_cache.layout_path(
+                level_number, seed, f"{GENERATOR_VERSION}-{level_templates.templates_version()}")
+            records = level_cache.load_layout(cache_path)
+        if records is not None:
+            self._build_from_records(records) # Sin generar: el nivel ya estaba compilado
+        else:
+            self._generate_level_elements()
+            if cache_path is not None:
+                level_cache.save_layout(cache_path, self.layout_records())
+        self._build_runtime_structures()
+        telemetry.complete("level_build", build_start, "level", level=level_number, seed=self.seed,
+                           from_cache=records is not None, platforms=len(self.platforms),
+                           items=len(self.items), obstacles=len(self.obstacles), spikes=len(self.spikes))
+
+    def _load_background(self):
         try:
-            self.background_image = pygame.image.load(BACKGROUND_IMAGE).convert() 
-            self.background_image = pygame.transform.scale(self.background_image, (LEVEL_WIDTH, SCREEN_HEIGHT))
+            # Sin escalar: cada trozo de la capa estática escala solo la franja que necesita
+            return asset_manager.load_frame(BACKGROUND_IMAGE, alpha=False)
         except pygame.error as e:
             print(f"Error al cargar la imagen de fondo: {e}. El fondo no se mostrará.")
-            self.background_image = None 
-
-        self._generate_level_elements()
+            telemetry.instant("asset_error", "assets", sprite=BACKGROUND_IMAGE, error=str(e))
+            return None
+
+    def prepare(self, camera_offset_x=0):
+        # En el hilo principal, antes de jugar un nivel construido en segundo plano (ver LevelLoader):
+        # el hilo no puede convertir imágenes ni construir la capa estática para la pantalla
+        replaced = asset_manager.convert_pending()
+        if replaced:
+            self.background_image = replaced.get(self.background_image, self.background_image)
+            for entity in itertools.chain(self.items, self.obstacles, self.spikes):
+                entity.image = replaced.get(entity.image, entity.image)
+                if hasattr(entity, "original_image"):
+                    entity.original_image = replaced.get(entity.original_image, entity.original_image)
+        if pygame.display.get_surface() is not None: # Sin ventana no se dibuja: no hace falta
+            self.static_layer.warm(camera_offset_x)
 
     def get_terrain_type(self, level_num):
         terrain_types = ["normal", "sand", "ice"]
         return terrain_types[(level_num - 1) % len(terrain_types)]
 
     def _generate_level_elements(self):
-        self.items = []
-        self.obstacles = []
-        self.platforms = []
-        self.spikes = []
-        self.finish_line = None
+        # Bloques del nivel definidos en LEVEL_TEMPLATES_FILE (ver level_templates.py)
+        self._build_from_records(level_templates.generate_layout(self.level_number, self.rng))
 
-        self.ground_rect = pygame.Rect(0, SCREEN_HEIGHT - 50, LEVEL_WIDTH, 50)
-        max_content_x = LEVEL_WIDTH - FINISH_LINE_WIDTH - 250 
-
-        # --- Lógica de generación de niveles más variada y con menos "imposibles" ---
-        # Se añaden espacios mínimos y se evita la superposición directa de plataformas y pinchos del suelo.
-        # Los anchos de las plataformas pequeñas se aseguran para ser al menos PLAYER_WIDTH + 10.
-
-        # Nivel 1: Introducción a plataformas y saltos básicos.
-        if self.level_number == 1:
-            current_x = 200
-            while current_x < max_content_x:
-                # Bloque 1: Plataformas ascendentes y algunos ítems
-                if current_x < max_content_x * 0.3:
-                    for i in range(3):
-                        self.platforms.append(Platform(current_x + i * 150, SCREEN_HEIGHT - 100 - i * 50))
-                        self.items.append(Item(current_x + i * 150 + 20, SCREEN_HEIGHT - 100 - i * 50 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50) # Añadir variación
-                # Bloque 2: Pequeños saltos y algún obstáculo en el suelo (asegura espacio para saltar)
-                elif current_x < max_content_x * 0.6:
-                    self.platforms.append(Platform(current_x + 50, SCREEN_HEIGHT - 100))
-                    obstacle_x = current_x + 180 # Mover obstáculo más allá de la plataforma inicial
-                    self.obstacles.append(Obstacle(obstacle_x, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    self.items.append(Item(current_x + 230, SCREEN_HEIGHT - 100 - ITEM_SIZE))
-                    current_x += 350 + random.randint(0, 50)
-                # Bloque 3: Introducción a pinchos (asegura espacio) y más ítems
-                else:
-                    spike_x = current_x + 100
-                    self.spikes.append(Spike(spike_x, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    # Plataforma colocada para que sea un salto sobre el pincho, no encima
-                    self.platforms.append(Platform(spike_x + SPIKE_WIDTH + 50, SCREEN_HEIGHT - 150)) 
-                    self.items.append(Item(spike_x + SPIKE_WIDTH + 70, SCREEN_HEIGHT - 150 - ITEM_SIZE))
-                    current_x += 400 + random.randint(0, 50)
-
-        # Nivel 2 (Arena): Más obstáculos en el suelo, saltos más difíciles entre plataformas, primeras plataformas móviles.
-        elif self.level_number == 2:
-            current_x = 150
-            while current_x < max_content_x:
-                # Bloque 1: Zona con pinchos y saltos largos (más espaciados)
-                if current_x < max_content_x * 0.3:
-                    spike_x1 = current_x + 50
-                    self.spikes.append(Spike(spike_x1, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    self.spikes.append(Spike(spike_x1 + SPIKE_WIDTH, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    platform_x = spike_x1 + SPIKE_WIDTH * 2 + 80 # Mayor espacio para salto
-                    self.platforms.append(Platform(platform_x, SCREEN_HEIGHT - 120, width=PLATFORM_WIDTH+50))
-                    self.items.append(Item(platform_x + 20, SCREEN_HEIGHT - 120 - ITEM_SIZE))
-                    current_x += 350 + random.randint(0, 50)
-                # Bloque 2: Introducción a MovingPlatform (con espacio de aterrizaje)
-                elif current_x < max_content_x * 0.6:
-                    self.platforms.append(Platform(current_x + 50, SCREEN_HEIGHT - 100)) # Plataforma de inicio
-                    mov_plat_x = current_x + 250 # Más espacio
-                    self.platforms.append(MovingPlatform(mov_plat_x, SCREEN_HEIGHT - 180, PLATFORM_WIDTH, PLATFORM_HEIGHT, 150, 1.5))
-                    self.items.append(Item(mov_plat_x + 50, SCREEN_HEIGHT - 180 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-                # Bloque 3: Obstáculos seguidos y plataformas a diferentes alturas (con espacio intermedio)
-                else:
-                    self.obstacles.append(Obstacle(current_x + 50, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    self.platforms.append(Platform(current_x + 180, SCREEN_HEIGHT - 150))
-                    self.platforms.append(Platform(current_x + 350, SCREEN_HEIGHT - 200))
-                    self.items.append(Item(current_x + 370, SCREEN_HEIGHT - 200 - ITEM_SIZE))
-                    current_x += 500 + random.randint(0, 50)
-
-        # Nivel 3 (Hielo): Saltos largos, plataformas pequeñas, más plataformas móviles.
-        elif self.level_number == 3:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Serie de plataformas pequeñas con ítems (asegurando ancho mínimo)
-                if current_x < max_content_x * 0.3:
-                    for i in range(3):
-                        plat_width = max(PLAYER_WIDTH + 10, PLATFORM_WIDTH-20) # Ancho mínimo
-                        self.platforms.append(Platform(current_x + i * 180, SCREEN_HEIGHT - 150 - i * 30, width=plat_width))
-                        self.items.append(Item(current_x + i * 180 + 10, SCREEN_HEIGHT - 150 - i * 30 - ITEM_SIZE))
-                    current_x += 540 + random.randint(0, 50)
-                # Bloque 2: Plataforma móvil con pinchos encima (pinchos en el mismo nivel que la plataforma, no debajo)
-                elif current_x < max_content_x * 0.6:
-                    mov_plat_x = current_x + 100
-                    mov_plat_y = SCREEN_HEIGHT - 180
-                    self.platforms.append(MovingPlatform(mov_plat_x, mov_plat_y, PLATFORM_WIDTH+50, PLATFORM_HEIGHT, 200, 2))
-                    self.spikes.append(Spike(mov_plat_x + 20, mov_plat_y - SPIKE_HEIGHT)) # Pinchos en la plataforma
-                    self.items.append(Item(mov_plat_x + 70, mov_plat_y - ITEM_SIZE - 10))
-                    current_x += 400 + random.randint(0, 50)
-                # Bloque 3: Obstáculo grande y salto a plataforma alta (con espacio para evitar)
-                else:
-                    self.obstacles.append(Obstacle(current_x + 80, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE*2)) 
-                    self.platforms.append(Platform(current_x + 350, SCREEN_HEIGHT - 250)) # Más distancia
-                    self.items.append(Item(current_x + 370, SCREEN_HEIGHT - 250 - ITEM_SIZE))
-                    current_x += 500 + random.randint(0, 50)
-        
-        # Nivel 4 (Normal): Mezcla de desafíos, incluyendo saltos de precisión y más uso de móviles.
-        elif self.level_number == 4:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Serie de plataformas con huecos y algunos ítems
-                if current_x < max_content_x * 0.3:
-                    for i in range(4):
-                        plat_width = max(PLAYER_WIDTH + 10, PLATFORM_WIDTH - 30)
-                        self.platforms.append(Platform(current_x + i * 140, SCREEN_HEIGHT - 100 - (i % 2) * 50, width=plat_width))
-                        if i % 2 == 0:
-                            self.items.append(Item(current_x + i * 140 + 10, SCREEN_HEIGHT - 100 - (i % 2) * 50 - ITEM_SIZE))
-                    current_x += 550 + random.randint(0, 50)
-                # Bloque 2: Plataforma móvil sobre un foso de pinchos (con espacio para evitar los pinchos al saltar a la plataforma)
-                elif current_x < max_content_x * 0.6:
-                    self.spikes.append(Spike(current_x + 50, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    self.spikes.append(Spike(current_x + 90, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    self.platforms.append(MovingPlatform(current_x + 180, SCREEN_HEIGHT - 180, PLATFORM_WIDTH, PLATFORM_HEIGHT, 100, 1.8)) # Mover más a la derecha
-                    self.items.append(Item(current_x + 230, SCREEN_HEIGHT - 180 - ITEM_SIZE))
-                    current_x += 400 + random.randint(0, 50)
-                # Bloque 3: Obstáculo alto y salto a plataformas elevadas
-                else:
-                    self.obstacles.append(Obstacle(current_x + 50, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE*2))
-                    self.platforms.append(Platform(current_x + 250, SCREEN_HEIGHT - 200)) # Más distancia
-                    self.platforms.append(Platform(current_x + 400, SCREEN_HEIGHT - 250))
-                    self.items.append(Item(current_x + 420, SCREEN_HEIGHT - 250 - ITEM_SIZE))
-                    current_x += 500 + random.randint(0, 50)
-
-        # Nivel 5 (Arena): Desafíos verticales y saltos más exigentes.
-        elif self.level_number == 5:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Escalada de plataformas con ítems (asegurando ancho mínimo)
-                if current_x < max_content_x * 0.3:
-                    for i in range(3):
-                        plat_width = max(PLAYER_WIDTH + 10, PLATFORM_WIDTH - 40)
-                        self.platforms.append(Platform(current_x + i * 120, SCREEN_HEIGHT - 100 - i * 70, width=plat_width))
-                        self.items.append(Item(current_x + i * 120 + 5, SCREEN_HEIGHT - 100 - i * 70 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-                # Bloque 2: Serie de plataformas móviles (espaciadas para saltos)
-                elif current_x < max_content_x * 0.6:
-                    self.platforms.append(MovingPlatform(current_x + 50, SCREEN_HEIGHT - 150, PLATFORM_WIDTH, PLATFORM_HEIGHT, 120, 1))
-                    self.platforms.append(MovingPlatform(current_x + 300, SCREEN_HEIGHT - 250, PLATFORM_WIDTH, PLATFORM_HEIGHT, 100, 1.2)) # Más separación
-                    self.items.append(Item(current_x + 100, SCREEN_HEIGHT - 150 - ITEM_SIZE))
-                    self.items.append(Item(current_x + 350, SCREEN_HEIGHT - 250 - ITEM_SIZE))
-                    current_x += 500 + random.randint(0, 50)
-                # Bloque 3: Obstáculos en el suelo y salto a plataformas elevadas con pinchos (pinchos en la plataforma)
-                else:
-                    self.obstacles.append(Obstacle(current_x + 50, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    self.obstacles.append(Obstacle(current_x + 120, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    plat_x = current_x + 250
-                    self.platforms.append(Platform(plat_x, SCREEN_HEIGHT - 200))
-                    self.spikes.append(Spike(plat_x + 20, SCREEN_HEIGHT - 200 - SPIKE_HEIGHT)) # Pinchos en la plataforma
-                    self.items.append(Item(plat_x + 50, SCREEN_HEIGHT - 200 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-
-        # Nivel 6 (Hielo): Dificultad creciente con más pinchos y saltos complejos
-        elif self.level_number == 6:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Plataformas descendentes con pinchos abajo (pinchos espaciados)
-                if current_x < max_content_x * 0.3:
-                    for i in range(3):
-                        self.platforms.append(Platform(current_x + i * 150, SCREEN_HEIGHT - 100 + i * 50, width=PLATFORM_WIDTH))
-                        # Pinchos en el suelo, con espacio para la plataforma
-                        if i == 0: self.spikes.append(Spike(current_x + 20, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                        elif i == 1: self.spikes.append(Spike(current_x + 170, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                        else: self.spikes.append(Spike(current_x + 320, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                        self.items.append(Item(current_x + i * 150 + 40, SCREEN_HEIGHT - 100 + i * 50 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-                # Bloque 2: Dos plataformas móviles seguidas (con buen espacio entre ellas)
-                elif current_x < max_content_x * 0.6:
-                    self.platforms.append(MovingPlatform(current_x + 50, SCREEN_HEIGHT - 150, PLATFORM_WIDTH, PLATFORM_HEIGHT, 100, 1.5))
-                    self.platforms.append(MovingPlatform(current_x + 300, SCREEN_HEIGHT - 200, PLATFORM_WIDTH, PLATFORM_HEIGHT, 120, 1.8)) # Más separación
-                    self.items.append(Item(current_x + 100, SCREEN_HEIGHT - 150 - ITEM_SIZE))
-                    self.items.append(Item(current_x + 350, SCREEN_HEIGHT - 200 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-                # Bloque 3: Zona con varios obstáculos y un salto largo (asegurando el salto)
-                else:
-                    self.obstacles.append(Obstacle(current_x + 50, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    self.obstacles.append(Obstacle(current_x + 120, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    self.platforms.append(Platform(current_x + 350, SCREEN_HEIGHT - 180, width=PLATFORM_WIDTH + 50)) # Mayor distancia de salto
-                    self.items.append(Item(current_x + 400, SCREEN_HEIGHT - 180 - ITEM_SIZE))
-                    current_x += 550 + random.randint(0, 50)
-
-        # Nivel 7 (Normal): Enfoque en saltos de precisión y plataformas dispersas
-        elif self.level_number == 7:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Plataformas espaciadas en diferentes alturas (ancho mínimo)
-                if current_x < max_content_x * 0.3:
-                    for i in range(3):
-                        plat_width = max(PLAYER_WIDTH + 10, PLATFORM_WIDTH - 20)
-                        self.platforms.append(Platform(current_x + i * 200, SCREEN_HEIGHT - 100 - i * 60, width=plat_width))
-                        self.items.append(Item(current_x + i * 200 + 10, SCREEN_HEIGHT - 100 - i * 60 - ITEM_SIZE))
-                    current_x += 600 + random.randint(0, 50)
-                # Bloque 2: Plataforma móvil grande con obstáculos (obstáculos en la plataforma)
-                elif current_x < max_content_x * 0.6:
-                    mov_plat_x = current_x + 50
-                    mov_plat_y = SCREEN_HEIGHT - 200
-                    self.platforms.append(MovingPlatform(mov_plat_x, mov_plat_y, PLATFORM_WIDTH + 100, PLATFORM_HEIGHT, 200, 1))
-                    self.obstacles.append(Obstacle(mov_plat_x + 50, mov_plat_y - OBSTACLE_SIZE)) # Obstáculo en la plataforma
-                    self.items.append(Item(mov_plat_x + 150, mov_plat_y - ITEM_SIZE - 10))
-                    current_x += 400 + random.randint(0, 50)
-                # Bloque 3: Zona con múltiples pinchos en el suelo y una plataforma lejana (asegurando el salto)
-                else:
-                    for i in range(3):
-                        self.spikes.append(Spike(current_x + 50 + i * 60, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    self.platforms.append(Platform(current_x + 350, SCREEN_HEIGHT - 150)) # Mayor distancia de salto
-                    self.items.append(Item(current_x + 370, SCREEN_HEIGHT - 150 - ITEM_SIZE))
-                    current_x += 500 + random.randint(0, 50)
-
-        # Nivel 8 (Arena): Dificultad alta, muchos obstáculos y saltos precisos sobre pinchos
-        elif self.level_number == 8:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Serie de plataformas pequeñas con pinchos debajo (pinchos espaciados)
-                if current_x < max_content_x * 0.3:
-                    for i in range(3):
-                        plat_width = max(PLAYER_WIDTH + 10, PLATFORM_WIDTH - 30)
-                        self.platforms.append(Platform(current_x + i * 150, SCREEN_HEIGHT - 100 - i * 50, width=plat_width))
-                        # Pinchos en el suelo, con espacio
-                        if i == 0: self.spikes.append(Spike(current_x + 10, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                        elif i == 1: self.spikes.append(Spike(current_x + 160, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                        else: self.spikes.append(Spike(current_x + 310, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                        self.items.append(Item(current_x + i * 150 + 5, SCREEN_HEIGHT - 100 - i * 50 - ITEM_SIZE))
-                    current_x += 500 + random.randint(0, 50)
-                # Bloque 2: Plataforma móvil con salto a otra plataforma (con buen espacio)
-                elif current_x < max_content_x * 0.6:
-                    mov_plat_x = current_x + 50
-                    mov_plat_y = SCREEN_HEIGHT - 180
-                    self.platforms.append(MovingPlatform(mov_plat_x, mov_plat_y, PLATFORM_WIDTH, PLATFORM_HEIGHT, 150, 2))
-                    self.platforms.append(Platform(mov_plat_x + 300, SCREEN_HEIGHT - 250)) # Más separación
-                    self.items.append(Item(mov_plat_x + 320, SCREEN_HEIGHT - 250 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-                # Bloque 3: Zona muy densa de obstáculos y plataformas (asegurando rutas posibles)
-                else:
-                    self.obstacles.append(Obstacle(current_x + 50, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    self.platforms.append(Platform(current_x + 180, SCREEN_HEIGHT - 100)) # Plataforma elevada
-                    self.spikes.append(Spike(current_x + 200, SCREEN_HEIGHT - 100 - SPIKE_HEIGHT)) # Pinchos en la plataforma
-                    self.items.append(Item(current_x + 230, SCREEN_HEIGHT - 100 - ITEM_SIZE))
-                    self.obstacles.append(Obstacle(current_x + 300, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    current_x += 400 + random.randint(0, 50)
-
-        # Nivel 9 (Hielo): Desafíos de deslizamiento, caídas y saltos complejos
-        elif self.level_number == 9:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Plataformas muy pequeñas y separadas con pinchos (asegurando ancho mínimo y espacio)
-                if current_x < max_content_x * 0.3:
-                    for i in range(4):
-                        plat_width = max(PLAYER_WIDTH + 10, PLATFORM_WIDTH - 50)
-                        self.platforms.append(Platform(current_x + i * 150, SCREEN_HEIGHT - 100 - i * 70, width=plat_width))
-                        self.spikes.append(Spike(current_x + i * 150 + 5, SCREEN_HEIGHT - 100 - i * 70 - SPIKE_HEIGHT)) # Pinchos en la plataforma
-                        self.items.append(Item(current_x + i * 150 + 20, SCREEN_HEIGHT - 100 - i * 70 - ITEM_SIZE - 10))
-                    current_x += 550 + random.randint(0, 50)
-                # Bloque 2: Tres plataformas móviles en línea (con buen espaciado)
-                elif current_x < max_content_x * 0.6:
-                    self.platforms.append(MovingPlatform(current_x + 50, SCREEN_HEIGHT - 150, PLATFORM_WIDTH, PLATFORM_HEIGHT, 80, 2.5))
-                    self.platforms.append(MovingPlatform(current_x + 250, SCREEN_HEIGHT - 200, PLATFORM_WIDTH, PLATFORM_HEIGHT, 100, 2))
-                    self.platforms.append(MovingPlatform(current_x + 450, SCREEN_HEIGHT - 250, PLATFORM_WIDTH, PLATFORM_HEIGHT, 120, 1.5))
-                    self.items.append(Item(current_x + 100, SCREEN_HEIGHT - 150 - ITEM_SIZE))
-                    self.items.append(Item(current_x + 300, SCREEN_HEIGHT - 200 - ITEM_SIZE))
-                    self.items.append(Item(current_x + 500, SCREEN_HEIGHT - 250 - ITEM_SIZE))
-                    current_x += 550 + random.randint(0, 50)
-                # Bloque 3: Zona con pinchos por todos lados y saltos de fe (asegurando el camino)
-                else:
-                    self.spikes.append(Spike(current_x + 50, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    self.spikes.append(Spike(current_x + 100, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    self.platforms.append(Platform(current_x + 200, SCREEN_HEIGHT - 150, width=PLATFORM_WIDTH-30))
-                    self.spikes.append(Spike(current_x + 220, SCREEN_HEIGHT - 150 - SPIKE_HEIGHT)) # Pinchos en la plataforma
-                    self.items.append(Item(current_x + 250, SCREEN_HEIGHT - 150 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-
-        # Nivel 10 (Normal): El desafío final, una mezcla de todos los elementos
-        elif self.level_number == 10:
-            current_x = 100
-            while current_x < max_content_x:
-                # Bloque 1: Combinación de plataformas normales y móviles, con obstáculos
-                if current_x < max_content_x * 0.3:
-                    self.platforms.append(Platform(current_x + 50, SCREEN_HEIGHT - 100))
-                    self.obstacles.append(Obstacle(current_x + 180, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE)) # Más separado
-                    self.platforms.append(MovingPlatform(current_x + 300, SCREEN_HEIGHT - 180, PLATFORM_WIDTH, PLATFORM_HEIGHT, 100, 1.5))
-                    self.items.append(Item(current_x + 350, SCREEN_HEIGHT - 180 - ITEM_SIZE))
-                    current_x += 450 + random.randint(0, 50)
-                # Bloque 2: Zona de pinchos densa y plataformas elevadas (asegurando espacio de aterrizaje)
-                elif current_x < max_content_x * 0.6:
-                    for i in range(4):
-                        self.spikes.append(Spike(current_x + 50 + i * 50, SCREEN_HEIGHT - 50 - SPIKE_HEIGHT))
-                    plat_x = current_x + 350
-                    self.platforms.append(Platform(plat_x, SCREEN_HEIGHT - 200, width=PLATFORM_WIDTH + 50))
-                    self.items.append(Item(plat_x + 50, SCREEN_HEIGHT - 200 - ITEM_SIZE))
-                    self.spikes.append(Spike(plat_x + 100, SCREEN_HEIGHT - 200 - SPIKE_HEIGHT)) # Pinchos en la plataforma, pero con espacio
-                    current_x += 550 + random.randint(0, 50)
-                # Bloque 3: Desafío de saltos entre plataformas móviles y obstáculos (asegurando rutas)
-                else:
-                    plat1_x = current_x + 50
-                    self.platforms.append(MovingPlatform(plat1_x, SCREEN_HEIGHT - 150, PLATFORM_WIDTH - 20, PLATFORM_HEIGHT, 100, 2))
-                    self.obstacles.append(Obstacle(plat1_x + 180, SCREEN_HEIGHT - 50 - OBSTACLE_SIZE))
-                    plat2_x = current_x + 300
-                    self.platforms.append(MovingPlatform(plat2_x, SCREEN_HEIGHT - 250, PLATFORM_WIDTH - 20, PLATFORM_HEIGHT, 120, 1.8))
-                    self.items.append(Item(plat2_x + 50, SCREEN_HEIGHT - 250 - ITEM_SIZE))
-                    current_x += 500 + random.randint(0, 50)
-
-
-        self.finish_line = FinishLine(LEVEL_WIDTH - FINISH_LINE_WIDTH - 50, 0) 
-
-    def update(self):
-        # Actualizar plataformas móviles
+    def layout_records(self):
+        # Disposición del nivel como registros de level_cache (tipo, x, y, w, h, recorrido, velocidad),
+        # en el mismo orden que las listas para que la resolución de colisiones no cambie
+        records = []
         for platform in self.platforms:
             if isinstance(platform, MovingPlatform):
-                platform.update()
+                records.append((level_cache.MOVING_PLATFORM, platform.start_x, platform.rect.y,
+                                platform.rect.width, platform.rect.height,
+                                platform.end_x - platform.start_x, platform.speed))
+            else:
+                records.append((level_cache.PLATFORM, platform.rect.x, platform.rect.y,
+                                platform.rect.width, platform.rect.height, 0, 0.0))
+        for kind, entities in ((level_cache.ITEM, self.items), (level_cache.OBSTACLE, self.obstacles),
+                               (level_cache.SPIKE, self.spikes)):
+            for entity in entities:
+                records.append((kind, entity.rect.x, entity.rect.y, entity.rect.width, entity.rect.height, 0, 0.0))
+        if self.finish_line:
+            rect = self.finish_line.rect
+            records.append((level_cache.FINISH_LINE, rect.x, rect.y, rect.width, rect.height, 0, 0.0))
+        return records
 
-    def draw(self, screen, camera_offset_x):
-        if self.background_image:
-            screen.blit(self.background_image, (-camera_offset_x, 0))
+    def _build_from_records(self, records):
+        self.items.empty()
+        self.obstacles.empty()
+        self.platforms = []
+        self.spikes = []
+        self.finish_line = None
+        self.ground_rect = pygame.Rect(0, SCREEN_HEIGHT - 50, self.width, 50)
+        for record in records:
+            kind = record[0]
+            entity = build_entity(*record)
+            if kind == level_cache.PLATFORM or kind == level_cache.MOVING_PLATFORM:
+                self.platforms.append(entity)
+            elif kind == level_cache.ITEM:
+                self.items.add(entity)
+            elif kind == level_cache.OBSTACLE:
+                self.obstacles.add(entity)
+            elif kind == level_cache.SPIKE:
+                self.spikes.append(entity)
+            elif kind == level_cache.FINISH_LINE:
+                self.finish_line = entity
+
+    def _build_runtime_structures(self):
+        self.movers = MovingPlatformSet(p for p in self.platforms if isinstance(p, MovingPlatform))
+        self._build_draw_index()
+        self._build_collision_grid()
+        self.static_layer = StaticLayerCache(self._render_static_chunk)
+        self.drawn_count = 0
+        self.culled_count = 0
+
+    def _build_draw_index(self):
+        # Índices ordenados por x para dibujar solo lo que entra en la cámara.
+        # Las plataformas móviles se indexan por todo su recorrido, así el índice no cambia al moverse.
+        self.item_index = XSortedIndex(self.items)
+        self.obstacle_index = XSortedIndex(self.obstacles)
+        self.platform_index = XSortedIndex(p for p in self.platforms if not isinstance(p, MovingPlatform))
+        self.mover_index = XSortedIndex(self.movers.platforms, extent=MovingPlatform.travel_extent)
+        self.spike_index = XSortedIndex(self.spikes)
+
+    def _build_collision_grid(self):
+        # Rejillas por columnas para las consultas de colisión del jugador (broadphase)
+        self.platform_grid = SpatialHash(self.platforms)
+        self.item_grid = SpatialHash(self.items)
+        self.obstacle_grid = SpatialHash(self.obstacles)
+        self.spike_grid = SpatialHash(self.spikes)
+
+    def take_collision_tests(self):
+        # Tests de colisión hechos en las rejillas desde la última llamada
+        grids = (self.platform_grid, self.item_grid, self.obstacle_grid, self.spike_grid)
+        tests = 0
+        for grid in grids:
+            tests += grid.tests
+            grid.tests = 0
+        return tests
+
+    def remove_item(self, item):
+        item.kill() # Sale del grupo self.items en O(1)
+        self.item_index.remove(item)
+        self.item_grid.remove(item)
+
+    def remove_obstacle(self, obstacle):
+        obstacle.kill()
+        self.obstacle_index.remove(obstacle)
+        self.obstacle_grid.remove(obstacle)
+
+    def update(self, dt=1.0, camera_offset_x=None):
+        # Actualizar plataformas móviles (paso vectorizado). Con cámara, solo se sincronizan
+        # los rects de las que están en pantalla (más un margen); el resto solo vive en los arrays.
+        self.movers.update(dt)
+        if camera_offset_x is None:
+            moved = self.movers.sync()
         else:
-            if self.terrain_type == "normal":
-                screen.fill(LIGHT_BLUE) 
-            elif self.terrain_type == "sand":
-                screen.fill((210, 180, 140)) 
-            elif self.terrain_type == "ice":
-                screen.fill((200, 230, 255)) 
-            else:
-                screen.fill(LIGHT_BLUE) 
-            
+            moved = self.movers.sync(camera_offset_x - MOVER_SYNC_MARGIN,
+                                     camera_offset_x + SCREEN_WIDTH + MOVER_SYNC_MARGIN)
+        for platform in moved:
+            self.platform_grid.move(platform) # Solo recoloca si cambia de columna
+
+    def sky_color(self):
+        if self.terrain_type == "normal":
+            return LIGHT_BLUE
+        elif self.terrain_type == "sand":
+            return (210, 180, 140)
+        elif self.terrain_type == "ice":
+            return (200, 230, 255)
+        return LIGHT_BLUE
+
+    def ground_color(self):
         if self.terrain_type == "normal":
-            ground_color = GRAY
+            return GRAY
         elif self.terrain_type == "sand":
-            ground_color = YELLOW
+            return YELLOW
         elif self.terrain_type == "ice":
-            ground_color = LIGHT_BLUE
+            return LIGHT_BLUE
+        return GRAY
+
+    def _render_static_chunk(self, surface, chunk_left):
+        # Dibuja en surface todo lo estático entre chunk_left y chunk_left + ancho del trozo
+        chunk_right = chunk_left + surface.get_width()
+        surface.fill(WHITE) # Fuera del nivel se ve el fondo blanco de la pantalla
+        if self.background_image:
+            self._blit_background_slice(surface, chunk_left, chunk_right)
         else:
-            ground_color = GRAY 
-        pygame.draw.rect(screen, ground_color,
-                         (self.ground_rect.x - camera_offset_x, self.ground_rect.y,
+            level_left = max(chunk_left, 0)
+            level_right = min(chunk_right, self.width)
+            if level_right > level_left:
+                surface.fill(self.sky_color(), (level_left - chunk_left, 0, level_right - level_left, SCREEN_HEIGHT))
+
+        self._draw_ground(surface, chunk_left)
+        for platform in self.platform_index.query(chunk_left, chunk_right):
+            platform.draw(surface, chunk_left)
+        for spike in self.spike_index.query(chunk_left, chunk_right):
+            spike.draw(surface, chunk_left)
+        if self.finish_line and \
+           self.finish_line.rect.right > chunk_left and self.finish_line.rect.left < chunk_right:
+            self.finish_line.draw(surface, chunk_left)
+
+    def _draw_ground(self, surface, chunk_left):
+        pygame.draw.rect(surface, self.ground_color(),
+                         (self.ground_rect.x - chunk_left, self.ground_rect.y,
                           self.ground_rect.width, self.ground_rect.height))
 
-        for item in self.items:
+    def _blit_background_slice(self, surface, chunk_left, chunk_right):
+        # El fondo ocupa todo el nivel (LEVEL_WIDTH x SCREEN_HEIGHT); solo se escala la franja de la
+        # imagen original que cae en este trozo
+        source = self.background_image
+        scale_x = LEVEL_WIDTH / source.get_width()
+        source_left = max(math.floor(chunk_left / scale_x), 0)
+        source_right = min(math.ceil(chunk_right / scale_x), source.get_width())
+        if source_right <= source_left:
+            return
+        strip = source.subsurface((source_left, 0, source_right - source_left, source.get_height()))
+        strip = pygame.transform.scale(strip, (round((source_right - source_left) * scale_x), SCREEN_HEIGHT))
+        surface.blit(strip, (round(source_left * scale_x) - chunk_left, 0))
+
+    def draw(self, screen, camera_offset_x, alpha=1.0):
+        # alpha: como en Player.draw, para dibujar las plataformas móviles entre dos ticks
+        # Fondo, suelo, plataformas fijas, pinchos y meta: uno o dos trozos pre-renderizados
+        self.static_layer.draw(screen, camera_offset_x)
+
+        # Solo se dibujan las entidades dinámicas que se solapan con la ventana visible
+        view_left = camera_offset_x
+        view_right = camera_offset_x + SCREEN_WIDTH
+        movers = self.mover_index.query(view_left, view_right)
+        items = self.item_index.query(view_left, view_right)
+        obstacles = self.obstacle_index.query(view_left, view_right)
+        for platform in movers:
+            platform.draw(screen, camera_offset_x, alpha)
+        for item in items:
             item.draw(screen, camera_offset_x)
-        for obstacle in self.obstacles:
+        for obstacle in obstacles:
             obstacle.draw(screen, camera_offset_x)
-        for platform in self.platforms:
-            platform.draw(screen, camera_offset_x)
-        for spike in self.spikes:
-            spike.draw(screen, camera_offset_x)
-        if self.finish_line:
-            self.finish_line.draw(screen, camera_offset_x)
\ No newline at end of file
+        # Para el perfilador: entidades dinámicas dibujadas y descartadas por estar fuera de la vista
+        self.drawn_count = len(movers) + len(items) + len(obstacles)
+        self.culled_count = len(self.mover_index) + len(self.item_index) + len(self.obstacle_index) - self.drawn_count
+
+# --- Precarga de niveles en segundo plano ---
+# Construye el siguiente Level (generación, índices, rejillas) en un hilo mientras se
+# muestra la pantalla de nivel completado, para que no aparezca un tirón al empezar a jugar.
+# Las superficies de la capa estática se siguen creando al dibujar, en el hilo principal.
+
+class LevelLoader:
+    def __init__(self, level_number, seed=None, use_cache=True):
+        self.level_number = level_number
+        self.seed = seed
+        self.use_cache = use_cache
+        self.level = None
+        self.error = None
+        self.prepared = False
+        self.thread = threading.Thread(target=self._build, name=f"level-loader-{level_number}", daemon=True)
+        self.thread.start()
+
+    def _build(self):
+        try:
+            self.level = Level(self.level_number, self.seed, self.use_cache)
+        except Exception as e: # Se relanza en result(), en el hilo principal
+            self.error = e
+
+    def ready(self):
+        return not self.thread.is_alive()
+
+    def result(self):
+        # Espera a que termine si aún no está listo
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.level
+
+    def prepare(self):
+        # Hilo principal: termina el nivel ya construido (Level.prepare) una sola vez
+        if not self.prepared:
+            self.result().prepare()
+            self.prepared = True
@@ -0,0 +1,51 @@
+# level_cache.py
+
+import os
+import struct
+from constants import LEVEL_CACHE_DIR
+
+# --- Caché en disco de niveles ya generados ---
+# Un nivel generado con una semilla concreta se guarda como una lista de registros
+# (tipo, x, y, w, h, recorrido, velocidad) en binario. La clave es
+# (número de nivel, semilla, versión del generador), así que cambiar el generador
+# invalida la caché sin borrar nada.
+
+# Tipos de entidad en los registros
+PLATFORM = 0
+MOVING_PLATFORM = 1
+ITEM = 2
+OBSTACLE = 3
+SPIKE = 4
+FINISH_LINE = 5
+
+MAGIC = b"MGLV"
+HEADER = struct.Struct("<4sI") # magic, número de registros
+RECORD = struct.Struct("<Biiiiid") # tipo, x, y, w, h, recorrido, velocidad
+
+def layout_path(level_number, seed, generator_version):
+    return os.path.join(LEVEL_CACHE_DIR, f"level_{level_number}_seed_{seed}_v{generator_version}.bin")
+
+def save_layout(path, records):
+    data = bytearray(HEADER.pack(MAGIC, len(records)))
+    for record in records:
+        data += RECORD.pack(*record)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Escribir a un temporal y renombrar: otro proceso nunca lee un archivo a medias
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def load_layout(path):
+    # Devuelve la lista de registros, o None si no hay caché válida
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or len(data) != HEADER.size + count * RECORD.size:
+        return None
+    return list(RECORD.iter_unpack(memoryview(data)[HEADER.size:]))
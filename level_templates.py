@@ -0,0 +1,121 @@
+# level_templates.py
+
+import hashlib
+import json
+import math
+from constants import *
+import level_cache
+
+# --- Niveles definidos como datos ---
+# Cada nivel de LEVEL_TEMPLATES_FILE es una lista de bloques (ver "_format" en el propio
+# archivo). Al cargar, cada bloque se compila a una tupla de registros relativos a su x
+# de inicio, así que generar un nivel es un único bucle que copia registros de
+# level_cache desplazados; Level los convierte en entidades con _build_from_records().
+# Añadir o cambiar niveles no toca el código.
+
+ENTITY_TYPES = {
+    "platform": level_cache.PLATFORM,
+    "moving_platform": level_cache.MOVING_PLATFORM,
+    "item": level_cache.ITEM,
+    "obstacle": level_cache.OBSTACLE,
+    "spike": level_cache.SPIKE,
+}
+
+# Tamaño fijo de las entidades con sprite (las plataformas usan width/height del bloque)
+ENTITY_SIZES = {
+    level_cache.ITEM: (ITEM_SIZE, ITEM_SIZE),
+    level_cache.OBSTACLE: (OBSTACLE_SIZE, OBSTACLE_SIZE),
+    level_cache.SPIKE: (SPIKE_WIDTH, SPIKE_HEIGHT),
+}
+
+_templates = None
+_version = None
+
+def _compile_entity(spec):
+    # Un elemento del bloque (con sus repeticiones) -> lista de registros con x relativa
+    kind = ENTITY_TYPES[spec["type"]]
+    if kind in ENTITY_SIZES:
+        width, height = ENTITY_SIZES[kind]
+    else:
+        width = spec.get("width", PLATFORM_WIDTH)
+        height = spec.get("height", PLATFORM_HEIGHT)
+    move_range = spec.get("range", 0)
+    speed = float(spec.get("speed", 0))
+    cycle_up = spec.get("cycle_up", [0])
+    every = spec.get("every", 1)
+
+    records = []
+    for i in range(spec.get("repeat", 1)):
+        if i % every:
+            continue
+        up = spec.get("step_up", 0) * i + cycle_up[i % len(cycle_up)]
+        if "top" in spec:
+            y = SCREEN_HEIGHT - spec["top"] - up
+        else: # Apoyado: la base del sprite queda a "bottom" píxeles del borde inferior
+            y = SCREEN_HEIGHT - spec["bottom"] - up - height
+        x = spec["x"] + spec.get("step_x", 0) * i
+        records.append((kind, x, y, width, height, move_range, speed))
+    return records
+
+def _compile_level(template):
+    blocks = []
+    for block in template["blocks"]:
+        records = []
+        for spec in block["entities"]:
+            records.extend(_compile_entity(spec))
+        until = block["until"] if block["until"] is not None else math.inf
+        blocks.append((until, block["advance"], block.get("jitter", 0), tuple(records)))
+    return template["start_x"], tuple(blocks)
+
+def load_templates(path=LEVEL_TEMPLATES_FILE):
+    # Lee y compila todas las plantillas una vez por proceso
+    global _templates, _version
+    if _templates is None:
+        with open(path, "rb") as f:
+            data = f.read()
+        levels = json.loads(data)["levels"]
+        _templates = {int(number): _compile_level(template) for number, template in levels.items()}
+        # Forma parte de la clave de level_cache: editar el archivo invalida los niveles guardados
+        _version = hashlib.sha1(data).hexdigest()[:12]
+    return _templates
+
+def templates_version():
+    load_templates()
+    return _version
+
+def _place_block(records, block_records, block_x):
+    for kind, x, y, w, h, move_range, speed in block_records:
+        records.append((kind, block_x + x, y, w, h, move_range, speed))
+
+def generate_run(level_number, rng, start_x, end_x):
+    # Modo infinito: bloques al azar de la plantilla de level_number desde start_x hasta
+    # pasar end_x. Devuelve los registros y la x donde empieza el siguiente bloque.
+    blocks = load_templates()[level_number][1]
+    records = []
+    current_x = start_x
+    while current_x < end_x:
+        _, advance, jitter, block_records = rng.choice(blocks)
+        _place_block(records, block_records, current_x)
+        current_x += advance + rng.randint(0, jitter)
+    return records, current_x
+
+def generate_layout(level_number, rng):
+    # Registros de level_cache del nivel; rng solo se usa para el hueco entre bloques
+    records = []
+    max_content_x = LEVEL_WIDTH - FINISH_LINE_WIDTH - 250
+    template = load_templates().get(level_number)
+    if template is not None:
+        start_x, blocks = template
+        limits = [until * max_content_x for until, _, _, _ in blocks]
+        current_x = start_x
+        while current_x < max_content_x:
+            # Primer bloque cuyo límite no se ha alcanzado (el último no tiene límite)
+            for limit, (_, advance, jitter, block_records) in zip(limits, blocks):
+                if current_x < limit:
+                    break
+            _place_block(records, block_records, current_x)
+            current_x += advance + rng.randint(0, jitter)
+
+    records.append((level_cache.FINISH_LINE, LEVEL_WIDTH - FINISH_LINE_WIDTH - 50, 0,
+                    FINISH_LINE_WIDTH, SCREEN_HEIGHT, 0, 0.0))
+    return records
@@ -1,10 +1,16 @@
 # main.py
 import pygame
+import random
 import sys
+import time
 from constants import *
-from player import Player
-from level import Level
+from session import GameSession, FixedTimestep, STATE_NAMES
 from ui import UI
+from render import DirtyRenderer
+from profiler import FrameProfiler
+from telemetry import telemetry
+from replay import InputRecorder
+from autopilot import Autopilot
 
 pygame.init()
 
@@ -12,184 +18,195 @@ screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Moto Glóbulo Rojo")
 clock = pygame.time.Clock()
 
-# Game states
-MENU = 0
-GAME = 1
-GAME_OVER = 2
-CONTROLS = 3
-LEVEL_COMPLETE_SCREEN = 4
-GAME_WON = 5
-
-current_state = MENU
 selected_menu_option = "start"
-current_level_number = 1
-total_iron_collected = 0 # To keep track of total iron across levels
-
-camera_offset_x = 0 # Camera offset for scrolling
 
-player = Player(100, SCREEN_HEIGHT - 50 - PLAYER_HEIGHT)
-current_level = Level(current_level_number)
+# All game logic lives in GameSession; this file only reads input and draws
+session = GameSession()
+session.state = MENU
+session.use_level_cache = False # Every game gets a new seed, caching them would only fill the disk
+if RECORD_INPUTS:
+    session.recorder = InputRecorder() # Writes each game to RECORDINGS_DIR when it ends
 ui = UI()
+renderer = DirtyRenderer() # Only presents what changed since the last frame
+profiler = FrameProfiler() # Frame time overlay, toggled with PROFILER_KEY; does nothing while hidden
+session.profiler = profiler
+autopilot = None # Autopilot playing instead of the keyboard, toggled with AUTOPILOT_KEY
+
+# Fixed-timestep loop: the simulation runs at SIMULATION_RATE whatever the render rate
+timestep = FixedTimestep(SIMULATION_RATE)
+frame_ms = 0
+
+def start_game(endless):
+    session.endless = endless
+    # New levels every game, but seeded so the recording can rebuild them
+    session.seed = random.randrange(2 ** 32)
+    session.reset()
+actions = [] # Player actions for the next tick, in the order the keys arrived
+
+def draw_frame():
+    # Draws the whole frame for the current state and returns the HUD rects
+    screen.fill(WHITE) # Clear screen with white background
+    hud_rects = []
 
-def reset_game():
-    global player, current_level_number, current_level, total_iron_collected, camera_offset_x
-    player = Player(100, SCREEN_HEIGHT - 50 - PLAYER_HEIGHT)
-    current_level_number = 1
-    current_level = Level(current_level_number)
-    total_iron_collected = 0
-    player.reset_iron() # Ensure player's iron count is also reset
-    camera_offset_x = 0 # Reset camera on new game
+    if current_state == MENU:
+        ui.draw_menu(screen, selected_menu_option)
+    elif current_state == CONTROLS:
+        ui.draw_controls_screen(screen)
+    elif current_state == GAME:
+        profiler.mark("other")
+        session.level.draw(screen, camera_offset_x, alpha) # Pass camera offset to level drawing
+        profiler.mark("level_draw")
+        session.player.draw(screen, camera_offset_x, alpha) # Pass camera offset to player drawing
+        hud_rects.append(ui.draw_health_bar(screen, session.player.energy))
+        hud_rects.append(ui.draw_score(screen, session.player.collected_iron))
+        if profiler.enabled:
+            hud_rects.append(ui.draw_profiler(screen, profiler.summary))
+    elif current_state == GAME_OVER:
+        ui.draw_game_over(screen, session.total_iron_collected) # Show total iron collected
+    elif current_state == LEVEL_COMPLETE_SCREEN:
+        ui.draw_level_complete(screen, session.level_number - 1) # Display previous level as completed
+    elif current_state == GAME_WON:
+        ui.draw_game_won(screen, session.total_iron_collected) # Show total iron collected
+    return hud_rects
 
 running = True
 while running:
+    frame_start = time.perf_counter()
+    profiler.begin_frame()
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
-        
-        # Level transition timer event
-        if event.type == pygame.USEREVENT + 1: # After delay, move to next level
-            current_level = Level(current_level_number)
-            player.rect.x = 100 # Reset player position for new level
-            player.rect.y = SCREEN_HEIGHT - 50 - PLAYER_HEIGHT
-            player.vel_x = 0
-            player.vel_y = 0
-            camera_offset_x = 0 # Reset camera for new level
-            current_state = GAME
-            pygame.time.set_timer(pygame.USEREVENT + 1, 0) # Stop the timer
+        if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED):
+            renderer.invalidate()
+        if event.type == pygame.KEYDOWN and event.key == PROFILER_KEY:
+            profiler.toggle()
+        if event.type == pygame.KEYDOWN and event.key == TELEMETRY_DUMP_KEY:
+            print(f"Trace guardado en {telemetry.dump()}")
+        if event.type == pygame.KEYDOWN and event.key == AUTOPILOT_KEY:
+            if autopilot is None:
+                autopilot = Autopilot(session.seed or 0)
+            else:
+                autopilot = None
+                actions += ["stop_moving_left", "stop_moving_right"] # Suelta lo que tuviera pulsado el bot
 
+        current_state = session.state
         if current_state == MENU:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
                     if selected_menu_option == "exit":
                         selected_menu_option = "controls"
                     elif selected_menu_option == "controls":
+                        selected_menu_option = "endless"
+                    elif selected_menu_option == "endless":
                         selected_menu_option = "start"
                 elif event.key == pygame.K_DOWN:
                     if selected_menu_option == "start":
+                        selected_menu_option = "endless"
+                    elif selected_menu_option == "endless":
                         selected_menu_option = "controls"
                     elif selected_menu_option == "controls":
                         selected_menu_option = "exit"
                 elif event.key == pygame.K_RETURN:
                     if selected_menu_option == "start":
-                        current_state = GAME
-                        reset_game() # Ensure game starts fresh
+                        start_game(False) # Ensure game starts fresh
+                    elif selected_menu_option == "endless":
+                        start_game(True) # World generated on the fly, no finish line
                     elif selected_menu_option == "controls":
-                        current_state = CONTROLS
+                        session.state = CONTROLS
                     elif event.key == pygame.K_c: # Allow 'C' to go to controls from menu
-                        current_state = CONTROLS
+                        session.state = CONTROLS
                     elif selected_menu_option == "exit":
                         running = False
         elif current_state == CONTROLS:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    current_state = MENU
+                    session.state = MENU
         elif current_state == GAME:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_LEFT:
-                    player.move_left()
+                    actions.append("move_left")
                 elif event.key == pygame.K_RIGHT:
-                    player.move_right()
+                    actions.append("move_right")
                 elif event.key == pygame.K_UP:
-                    player.jump()
+                    actions.append("jump")
                 elif event.key == pygame.K_ESCAPE:
-                    current_state = MENU # Return to menu from game
+                    session.state = MENU # Return to menu from game
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_LEFT:
-                    player.stop_moving_left()
+                    actions.append("stop_moving_left")
                 if event.key == pygame.K_RIGHT:
-                    player.stop_moving_right()
+                    actions.append("stop_moving_right")
         elif current_state == GAME_OVER:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    reset_game()
-                    current_state = GAME
+                    start_game(session.endless)
                 elif event.key == pygame.K_ESCAPE:
-                    current_state = MENU
+                    session.state = MENU
                     selected_menu_option = "start"
         
         elif current_state == GAME_WON:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    reset_game()
-                    current_state = GAME
+                    start_game(session.endless)
                 elif event.key == pygame.K_ESCAPE:
-                    current_state = MENU
+                    session.state = MENU
                     selected_menu_option = "start"
 
+    profiler.mark("input")
+
     # --- Game Logic ---
-    if current_state == GAME:
-        # Pass current_level.ground_rect to player.update
-        player.update(current_level.terrain_type, current_level.platforms, current_level.ground_rect)
-
-        # Update camera offset based on player's position
-        # Keep player roughly in the center of the screen horizontally
-        camera_offset_x = player.rect.x - SCREEN_WIDTH // 2
-        # Clamp camera_offset_x to stay within level bounds (0 to LEVEL_WIDTH - SCREEN_WIDTH)
-        if camera_offset_x < 0:
-            camera_offset_x = 0
-        if camera_offset_x > LEVEL_WIDTH - SCREEN_WIDTH:
-            camera_offset_x = LEVEL_WIDTH - SCREEN_WIDTH
-        
-        # Check for item collection (iron)
-        for item in current_level.items[:]: # Iterate over a copy to allow removal
-            if player.rect.colliderect(item.rect):
-                player.collect_item()
-                player.heal(10) # Gain energy for collecting iron
-                current_level.items.remove(item)
-        
-        # Check for obstacle collision (parasites)
-        for obstacle in current_level.obstacles[:]:
-            if player.rect.colliderect(obstacle.rect):
-                player.take_damage(PARASITE_DAMAGE)
-                current_level.obstacles.remove(obstacle) # Parasite disappears after contact
-        
-        # Check for spike collision
-        for spike in current_level.spikes[:]:
-            if player.rect.colliderect(spike.rect):
-                player.take_damage(SPIKE_DAMAGE)
-                # Spikes can remain or disappear;
-                # decided to remain for persistent danger
-                # If you want them to disappear:
-                # current_level.spikes.remove(spike)
-
-        # Game Over condition
-        if player.energy <= 0:
-            current_state = GAME_OVER
-        
-        # Level completion condition: Reach the finish line
-        if current_level.finish_line and \
-           player.rect.colliderect(current_level.finish_line.rect):
-            total_iron_collected += player.collected_iron # Add current level's iron to total
-            current_level_number += 1
-            if current_level_number > MAX_LEVELS: # Max levels reached
-                current_state = GAME_WON # Game is won!
-            else:
-                current_state = LEVEL_COMPLETE_SCREEN
-                # Use the new constant for delay
-                pygame.time.set_timer(pygame.USEREVENT + 1, LEVEL_TRANSITION_DELAY_MS)
-            player.reset_iron() # Reset iron count for new level, but total is kept
+    # Inputs go to the first tick of the frame; if no tick is due they wait for the next frame
+    ticks = timestep.advance(frame_ms)
+    for _ in range(ticks):
+        if autopilot is not None and session.state == GAME:
+            actions += autopilot.actions(session) # Mismas acciones que el teclado
+        session.step(actions)
+        actions = []
+    current_state = session.state
+    alpha = timestep.alpha()
+    profiler.mark("other")
 
     # --- Drawing ---
-    screen.fill(WHITE) # Clear screen with white background
-
-    if current_state == MENU:
-        ui.draw_menu(screen, selected_menu_option)
-    elif current_state == CONTROLS:
-        ui.draw_controls_screen(screen)
-    elif current_state == GAME:
-        current_level.draw(screen, camera_offset_x) # Pass camera offset to level drawing
-        player.draw(screen, camera_offset_x) # Pass camera offset to player drawing
-        ui.draw_health_bar(screen, player.energy)
-        ui.draw_score(screen, player.collected_iron)
-    elif current_state == GAME_OVER:
-        ui.draw_game_over(screen, total_iron_collected) # Show total iron collected
-    elif current_state == LEVEL_COMPLETE_SCREEN:
-        ui.draw_level_complete(screen, current_level_number - 1) # Display previous level as completed
-    elif current_state == GAME_WON:
-        ui.draw_game_won(screen, total_iron_collected) # Show total iron collected
-
-    pygame.display.flip()
-    clock.tick(60)
-
+    # Keys describing what is on screen: if nothing changed the frame is neither drawn nor presented
+    hud_key = None
+    if current_state == GAME:
+        camera_offset_x = session.interpolated_camera_offset(alpha)
+        player = session.player
+        level = session.level
+        hud_key = (player.energy, player.collected_iron, profiler.version)
+        frame_key = (current_state, profiler.enabled, camera_offset_x, player.draw_position(alpha),
+                     len(level.items), len(level.obstacles),
+                     tuple(p.draw_position(alpha) for p in level.mover_index.query(camera_offset_x, camera_offset_x + SCREEN_WIDTH)))
+    elif current_state == MENU:
+        frame_key = (current_state, selected_menu_option)
+    else:
+        frame_key = (current_state, session.level_number, session.total_iron_collected)
+
+    presented = renderer.present(frame_key, hud_key, draw_frame)
+    profiler.mark("flip")
+    if current_state == GAME:
+        collision_tests = session.level.take_collision_tests()
+        telemetry.add("collision_tests", collision_tests)
+        profiler.count("drawn", session.level.drawn_count)
+        profiler.count("culled", session.level.culled_count)
+        profiler.count("collision_tests", collision_tests)
+    profiler.end_frame(frame_ms)
+
+    # Telemetry: frames slower than the budget get their own span, the rest only counts per second
+    telemetry.add("frames")
+    if (time.perf_counter() - frame_start) * 1000.0 > FRAME_BUDGET_MS:
+        telemetry.complete("frame_over_budget", frame_start, "frame", state=STATE_NAMES[current_state], ticks=ticks)
+        telemetry.add("frames_over_budget")
+    telemetry.flush_counters()
+
+    if presented or current_state == GAME:
+        # In game the loop keeps RENDER_RATE even with nothing new on screen: input and ticks can't wait
+        frame_ms = clock.tick(RENDER_RATE)
+    else:
+        frame_ms = clock.tick(IDLE_RENDER_RATE) # Static screen with nothing new: idle instead of spinning
+
+if session.recorder is not None and session.recorder.active:
+    print(f"Partida grabada en {session.recorder.finish(session)}")
+print(f"Trace guardado en {telemetry.dump()}")
 pygame.quit()
 sys.exit()
\ No newline at end of file
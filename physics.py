@@ -0,0 +1,219 @@
+# physics.py
+
+import math
+from constants import *
+from level import MovingPlatform
+
+# --- Backends de física ---
+# GameSession no consulta directamente las rejillas del nivel: pide al backend que mueva al jugador
+# y que le diga qué ítems, parásitos y pinchos toca. Las reglas de movimiento son siempre las de
+# Player.update, así que una partida (y su grabación) da lo mismo con un backend que con otro;
+# lo que cambia es quién hace el broadphase:
+#   "arcade": las rejillas por columnas de level.py, en Python
+#   "pymunk": un espacio de pymunk (broadphase en C) con las plataformas como segmentos estáticos,
+#             las móviles como cuerpos cinemáticos y los ítems, parásitos y pinchos como sensores
+#             que avisan con callbacks de colisión
+# Se elige con PHYSICS_BACKEND o asignando otro a session.physics.
+
+class ArcadeBackend:
+    name = "arcade"
+
+    def move_player(self, player, level, dt):
+        # Only the platforms near the player are tested (broadphase)
+        nearby_platforms = level.platform_grid.query(player.sweep_rect(dt))
+        player.update(level.terrain_type, nearby_platforms, level.ground_rect, dt)
+
+    def contacts(self, player, level):
+        # (ítems, parásitos, pinchos) que tocan al jugador, en orden de inserción
+        rect = player.rect
+        return level.item_grid.query(rect), level.obstacle_grid.query(rect), level.spike_grid.query(rect)
+
+    def remove(self, entity):
+        pass # Las rejillas son del nivel: level.remove_item/remove_obstacle ya lo quitan
+
+# Tipos de colisión de pymunk
+PLAYER_TYPE = 1
+ITEM_TYPE = 2
+OBSTACLE_TYPE = 3
+SPIKE_TYPE = 4
+
+# Categorías de los filtros: el jugador solo choca con los sensores y las plataformas solo
+# aparecen en las consultas del broadphase (pymunk nunca las empuja contra nada)
+PLAYER_CATEGORY = 0b0001
+PLATFORM_CATEGORY = 0b0010
+SENSOR_CATEGORY = 0b0100
+QUERY_CATEGORY = 0b1000
+
+# pymunk cuenta como contacto tocarse por el borde y pygame.Rect.colliderect no: el jugador y las
+# consultas se encogen esto por cada lado para que los contactos sean los mismos
+CONTACT_EPSILON = 0.01
+
+class PymunkBackend:
+    name = "pymunk"
+
+    def __init__(self):
+        import pymunk # Solo hace falta con este backend
+        self.pymunk = pymunk
+        self.player_filter = pymunk.ShapeFilter(categories=PLAYER_CATEGORY, mask=SENSOR_CATEGORY)
+        self.platform_filter = pymunk.ShapeFilter(categories=PLATFORM_CATEGORY, mask=QUERY_CATEGORY)
+        self.sensor_filter = pymunk.ShapeFilter(categories=SENSOR_CATEGORY, mask=PLAYER_CATEGORY)
+        self.query_filter = pymunk.ShapeFilter(categories=QUERY_CATEGORY, mask=PLATFORM_CATEGORY)
+        self.level = None
+
+    def _build(self, level):
+        # Un espacio nuevo por nivel (o por partida)
+        pymunk = self.pymunk
+        self.level = level
+        self.space = pymunk.Space() # Sin gravedad ni respuesta: pymunk solo detecta, no mueve
+        self.shapes = {} # entidad -> shape
+        self.movers = {} # MovingPlatform -> cuerpo cinemático
+        self.chunks = [] # Trozos del modo infinito ya añadidos
+        self.chunk_counts = None
+
+        self.player_body = pymunk.Body(1, math.inf)
+        e = CONTACT_EPSILON
+        self.player_shape = pymunk.Poly(self.player_body, [(e, e), (PLAYER_WIDTH - e, e),
+                                                           (PLAYER_WIDTH - e, PLAYER_HEIGHT - e),
+                                                           (e, PLAYER_HEIGHT - e)])
+        self.player_shape.collision_type = PLAYER_TYPE
+        self.player_shape.filter = self.player_filter
+        self.space.add(self.player_body, self.player_shape)
+
+        # Los sensores que toca el jugador en cada step() se apuntan en estas listas
+        self.touching = {ITEM_TYPE: [], OBSTACLE_TYPE: [], SPIKE_TYPE: []}
+        for collision_type, touching in self.touching.items():
+            handler = self.space.add_collision_handler(PLAYER_TYPE, collision_type)
+            handler.data["touching"] = touching
+            handler.pre_solve = self._touch
+
+        if getattr(level, "chunks", None) is None:
+            self._add(level.platforms, level.items, level.obstacles, level.spikes)
+        self._sync_chunks(level)
+
+    @staticmethod
+    def _touch(arbiter, space, data):
+        # Callback de pymunk: se llama en cada step() mientras el sensor se solapa con el jugador
+        data["touching"].append(arbiter.shapes[1].entity)
+        return True
+
+    def _add(self, platforms, items, obstacles, spikes):
+        pymunk = self.pymunk
+        space = self.space
+        shapes = []
+        for platform in platforms:
+            rect = platform.rect
+            if isinstance(platform, MovingPlatform):
+                body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+                body.position = rect.topleft
+                shape = self._segment(body, 0, 0, rect.width, rect.height)
+                self.movers[platform] = body
+                space.add(body)
+            else:
+                shape = self._segment(space.static_body, rect.x, rect.y, rect.width, rect.height)
+            shape.filter = self.platform_filter
+            shape.entity = platform
+            self.shapes[platform] = shape
+            shapes.append(shape)
+        for collision_type, entities in ((ITEM_TYPE, items), (OBSTACLE_TYPE, obstacles), (SPIKE_TYPE, spikes)):
+            for entity in entities:
+                rect = entity.rect
+                shape = pymunk.Poly(space.static_body, [rect.topleft, rect.topright, rect.bottomright, rect.bottomleft])
+                shape.sensor = True
+                shape.collision_type = collision_type
+                shape.filter = self.sensor_filter
+                shape.entity = entity
+                self.shapes[entity] = shape
+                shapes.append(shape)
+        space.add(*shapes) # De una vez: el índice de pymunk se reconstruye menos
+
+    def _segment(self, body, x, y, width, height):
+        # Segmento con radio por el eje largo del rect: su caja (lo que mira el broadphase) es el rect
+        if width >= height:
+            radius = height / 2
+            a = (x + radius, y + radius)
+            b = (x + width - radius, y + radius)
+        else:
+            radius = width / 2
+            a = (x + radius, y + radius)
+            b = (x + radius, y + height - radius)
+        return self.pymunk.Segment(body, a, b, radius)
+
+    def remove(self, entity):
+        # Entidad que sale del nivel (ítem recogido, parásito golpeado, trozo descartado)
+        shape = self.shapes.pop(entity, None)
+        if shape is None:
+            return
+        body = self.movers.pop(entity, None)
+        if body is not None:
+            self.space.remove(body, shape)
+        else:
+            self.space.remove(shape)
+
+    def _sync_chunks(self, level):
+        # Modo infinito: añade los trozos nuevos y quita los descartados
+        chunks = getattr(level, "chunks", None)
+        if chunks is None or self.chunk_counts == (level.chunks_generated, level.chunks_evicted):
+            return
+        live = set(chunks)
+        for chunk in self.chunks:
+            if chunk not in live:
+                for entity in chunk.platforms + chunk.movers + chunk.items + chunk.obstacles + chunk.spikes:
+                    self.remove(entity)
+        known = set(self.chunks)
+        for chunk in chunks:
+            if chunk not in known:
+                # Mismo orden que en el nivel: plataformas y móviles mezcladas como se generaron
+                platforms = sorted(chunk.platforms + chunk.movers, key=level.platform_grid.order.__getitem__)
+                self._add(platforms, [i for i in chunk.items if i.alive()],
+                          [o for o in chunk.obstacles if o.alive()], chunk.spikes)
+        self.chunks = list(chunks)
+        self.chunk_counts = (level.chunks_generated, level.chunks_evicted)
+
+    def _sync(self, level):
+        if level is not self.level:
+            self._build(level)
+        else:
+            self._sync_chunks(level)
+
+    def move_player(self, player, level, dt):
+        self._sync(level)
+        sweep = player.sweep_rect(dt)
+        # Las móviles que pueden estar en la zona se colocan donde el nivel las ha dejado este tick
+        for platform in level.mover_index.query(sweep.left, sweep.right):
+            body = self.movers[platform]
+            position = platform.rect.topleft
+            if body.position != position:
+                body.position = position
+                self.space.reindex_shapes_for_body(body)
+        e = CONTACT_EPSILON
+        hits = self.space.bb_query(self.pymunk.BB(sweep.left + e, sweep.top + e, sweep.right - e, sweep.bottom - e),
+                                   self.query_filter)
+        nearby_platforms = [shape.entity for shape in hits]
+        if len(nearby_platforms) > 1: # Mismo orden de resolución que las rejillas
+            nearby_platforms.sort(key=level.platform_grid.order.__getitem__)
+        player.update(level.terrain_type, nearby_platforms, level.ground_rect, dt)
+
+    def contacts(self, player, level):
+        self._sync(level)
+        self.player_body.position = player.rect.topleft
+        self.space.reindex_shapes_for_body(self.player_body)
+        for touching in self.touching.values():
+            touching.clear()
+        self.space.step(1 / PHYSICS_REFERENCE_RATE) # Nada se mueve: solo se lanzan los callbacks
+        items = self.touching[ITEM_TYPE]
+        obstacles = self.touching[OBSTACLE_TYPE]
+        spikes = self.touching[SPIKE_TYPE]
+        if len(items) > 1:
+            items.sort(key=level.item_grid.order.__getitem__)
+        if len(obstacles) > 1:
+            obstacles.sort(key=level.obstacle_grid.order.__getitem__)
+        if len(spikes) > 1:
+            spikes.sort(key=level.spike_grid.order.__getitem__)
+        return list(items), list(obstacles), list(spikes)
+
+BACKENDS = {ArcadeBackend.name: ArcadeBackend, PymunkBackend.name: PymunkBackend}
+
+def make_backend(name=PHYSICS_BACKEND):
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de física desconocido: {name} (hay {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
@@ -0,0 +1,96 @@
+# physics_check.py
+
+import argparse
+import os
+import sys
+import pygame
+from constants import *
+from player import Player
+
+# --- Comprobación sin ventana de la física de apoyo ---
+# Un jugador quieto en el suelo o en una plataforma tiene que estar en on_ground en todos los
+# ticks (si no, Player.jump() ignora la mitad de los saltos), a cualquier frecuencia de simulación;
+# y al soltar las teclas tiene que pararse en el mismo momento que a PHYSICS_REFERENCE_RATE.
+#   python physics_check.py --rates 60,144,30
+
+class _Block:
+    # Plataforma fija mínima: Player.update solo mira su rect
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, PLATFORM_WIDTH, PLATFORM_HEIGHT)
+
+def check_resting(rate, jumps=20):
+    # Devuelve la lista de fallos a esta frecuencia (vacía si todo va bien)
+    dt = PHYSICS_REFERENCE_RATE / rate
+    ground = pygame.Rect(0, SCREEN_HEIGHT - 50, LEVEL_WIDTH, 50)
+    platform = _Block(400, 300)
+    failures = []
+    for name, x, y in (("suelo", 100, ground.top - PLAYER_HEIGHT),
+                       ("plataforma", 420, platform.rect.top - PLAYER_HEIGHT)):
+        player = Player(x, y)
+        player.update("normal", [platform], ground, dt) # Primer tick: se asienta
+        missed = 0
+        for _ in range(rate * 2):
+            player.update("normal", [platform], ground, dt)
+            missed += not player.on_ground
+        if missed:
+            failures.append(f"{rate} Hz, {name}: sin on_ground en {missed} de {rate * 2} ticks")
+        # Saltos pulsados de 1 a 5 ticks después de aterrizar: tienen que contar todos
+        honoured = 0
+        for press in range(jumps):
+            while not player.on_ground:
+                player.update("normal", [platform], ground, dt)
+            for _ in range(press % 5 + 1):
+                player.update("normal", [platform], ground, dt)
+            player.jump()
+            honoured += player.vel_y == JUMP_STRENGTH
+            player.update("normal", [platform], ground, dt)
+        if honoured < jumps:
+            failures.append(f"{rate} Hz, {name}: solo {honoured} de {jumps} saltos")
+    return failures
+
+def stop_time(rate, terrain_type):
+    # Tiempo (en ticks de PHYSICS_REFERENCE_RATE) que tarda en pararse un jugador que suelta la tecla
+    # a la velocidad máxima
+    dt = PHYSICS_REFERENCE_RATE / rate
+    ground = pygame.Rect(0, SCREEN_HEIGHT - 50, LEVEL_WIDTH * 10, 50)
+    player = Player(100, ground.top - PLAYER_HEIGHT)
+    player.update(terrain_type, [], ground, dt) # Se asienta
+    player.vel_x = PLAYER_MAX_SPEED
+    ticks = 0
+    while player.vel_x != 0:
+        player.update(terrain_type, [], ground, dt)
+        ticks += 1
+    return ticks * dt
+
+def check_coasting(rate):
+    # Sin teclas, el umbral que para al jugador tiene que actuar en el mismo momento que a
+    # PHYSICS_REFERENCE_RATE: la referencia cruza el umbral dentro de su último tick y a esta
+    # frecuencia se nota en el primer tick que acaba después
+    dt = PHYSICS_REFERENCE_RATE / rate
+    failures = []
+    for terrain_type in ("normal", "ice"):
+        reference = stop_time(PHYSICS_REFERENCE_RATE, terrain_type)
+        stopped = stop_time(rate, terrain_type)
+        if not reference - 1 < stopped < reference + dt:
+            failures.append(f"{rate} Hz, {terrain_type}: se para a los {stopped:.1f} ticks de referencia, "
+                            f"no a los {reference:.0f}")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comprueba la física de apoyo del jugador de Moto Glóbulo Rojo")
+    parser.add_argument("--rates", default=f"{SIMULATION_RATE},144,30", help="frecuencias de simulación, p. ej. 60,144,30")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    failures = []
+    for rate in (int(n) for n in args.rates.split(",")):
+        failures += check_resting(rate)
+        failures += check_coasting(rate)
+    for failure in failures:
+        print(failure)
+    print("OK" if not failures else f"{len(failures)} fallos")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
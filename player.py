@@ -1,15 +1,29 @@
 # player.py
+import math
 import pygame
 from constants import * # Asegúrate de importar tus nuevas constantes
+from assets import asset_manager
+from telemetry import telemetry
 
 class Player:
+    # Atributos fijos: sin __dict__ por instancia, más compacto y acceso más rápido
+    __slots__ = ("rect", "color", "x", "y", "vel_x", "vel_y", "prev_x", "prev_y", "on_ground",
+                 "energy", "collected_iron", "current_terrain_speed_multiplier",
+                 "moving_left", "moving_right", "image")
+
     def __init__(self, x, y):
         # El rect ahora representará el área del glóbulo rojo, no una moto separada
         self.rect = pygame.Rect(x, y, PLAYER_WIDTH, PLAYER_HEIGHT)
         self.color = RED # El color de fallback si la imagen no carga
 
+        # Posición real en float (sub-píxel); el rect entero se deriva de ella para colisiones y dibujo
+        self.x = float(x)
+        self.y = float(y)
         self.vel_x = 0
         self.vel_y = 0
+        # Posición al inicio del último update, para interpolar el dibujo entre ticks
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.on_ground = False
         self.energy = INITIAL_ENERGY
         self.collected_iron = 0
@@ -20,30 +34,54 @@ class Player:
         # --- Cargar la imagen del personaje (glóbulo rojo) ---
         try:
             # Cargamos el sprite principal para el personaje
-            self.image = pygame.image.load(PLAYER_SPRITE_IDLE).convert_alpha()
-            # Escalamos la imagen para que se ajuste al tamaño de nuestro rect de jugador
-            self.image = pygame.transform.scale(self.image, (PLAYER_WIDTH, PLAYER_HEIGHT))
+            # Escalada al tamaño de nuestro rect de jugador y compartida vía asset_manager
+            self.image = asset_manager.load_frame(PLAYER_SPRITE_IDLE, (PLAYER_WIDTH, PLAYER_HEIGHT))
             # Podrías cargar otros sprites para animaciones aquí:
             # self.walk_frames = [
-            #     pygame.transform.scale(pygame.image.load(PLAYER_SPRITE_WALK_A).convert_alpha(), (PLAYER_WIDTH, PLAYER_HEIGHT)),
-            #     pygame.transform.scale(pygame.image.load(PLAYER_SPRITE_WALK_B).convert_alpha(), (PLAYER_WIDTH, PLAYER_HEIGHT))
+            #     asset_manager.load_frame(PLAYER_SPRITE_WALK_A, (PLAYER_WIDTH, PLAYER_HEIGHT)),
+            #     asset_manager.load_frame(PLAYER_SPRITE_WALK_B, (PLAYER_WIDTH, PLAYER_HEIGHT))
             # ]
             # self.current_frame = self.image # Para animaciones: self.walk_frames[0]
             # self.animation_timer = 0 # Para controlar el cambio de frames
         except pygame.error as e:
             print(f"Error al cargar la imagen del jugador: {e}. Usando color de fallback.")
+            telemetry.instant("asset_error", "assets", sprite=PLAYER_SPRITE_IDLE, error=str(e))
             self.image = None # Si la imagen no carga, usaremos el color.
 
-    def draw(self, screen, camera_offset_x):
+    def draw_position(self, alpha=1.0):
+        # alpha: fracción del tick actual ya transcurrida (0 = estado anterior, 1 = estado actual)
+        return (round(self.prev_x + (self.x - self.prev_x) * alpha),
+                round(self.prev_y + (self.y - self.prev_y) * alpha))
+
+    def draw(self, screen, camera_offset_x, alpha=1.0):
+        draw_x, draw_y = self.draw_position(alpha)
+        draw_x -= camera_offset_x
         # Dibujar el sprite del personaje
         if self.image:
             # Dibuja la imagen en la posición del rect del jugador, aplicando el offset de la cámara
-            screen.blit(self.image, (self.rect.x - camera_offset_x, self.rect.y))
+            screen.blit(self.image, (draw_x, draw_y))
         else:
             # Si la imagen no cargó, dibuja un rectángulo simple con el color de fallback
-            pygame.draw.rect(screen, self.color, (self.rect.x - camera_offset_x, self.rect.y, self.rect.width, self.rect.height))
+            pygame.draw.rect(screen, self.color, (draw_x, draw_y, self.rect.width, self.rect.height))
 
-    def update(self, terrain_type, platforms, ground_rect):
+    def reset_position(self, x, y):
+        # Teletransporte (nuevo nivel): sin velocidad y sin interpolar desde la posición anterior
+        self.rect.topleft = (x, y)
+        self.x = self.prev_x = float(x)
+        self.y = self.prev_y = float(y)
+        self.vel_x = 0
+        self.vel_y = 0
+
+    def sweep_rect(self, dt=1.0):
+        # Zona que el jugador puede ocupar en el próximo update (más 1px para detectar el contacto
+        # con la parte superior de una plataforma). Se usa para pedir al nivel solo las plataformas cercanas.
+        reach_x = int((abs(self.vel_x) + PLAYER_ACCELERATION * dt) * dt) + 2
+        reach_y = int((abs(self.vel_y) + GRAVITY * dt) * dt) + 2
+        return self.rect.inflate(reach_x * 2, reach_y * 2)
+
+    def update(self, terrain_type, platforms, ground_rect, dt=1.0):
+        # platforms puede ser la lista completa o solo los candidatos de level.platform_grid.query(self.sweep_rect())
+        # dt: duración del tick en ticks de PHYSICS_REFERENCE_RATE (1.0 a 60 Hz)
         # Apply terrain effects
         if terrain_type == "sand":
             self.current_terrain_speed_multiplier = SAND_FRICTION_MULTIPLIER
@@ -55,28 +93,35 @@ class Player:
         # Store previous position for collision detection
         prev_x = self.rect.x
         prev_y = self.rect.y
+        self.prev_x = self.x
+        self.prev_y = self.y
 
         # Apply gravity
-        self.vel_y += GRAVITY
+        self.vel_y += GRAVITY * dt
 
         # Horizontal movement with acceleration
         if self.moving_left:
-            self.vel_x = max(self.vel_x - PLAYER_ACCELERATION, -PLAYER_MAX_SPEED * self.current_terrain_speed_multiplier)
+            self.vel_x = max(self.vel_x - PLAYER_ACCELERATION * dt, -PLAYER_MAX_SPEED * self.current_terrain_speed_multiplier)
         elif self.moving_right:
-            self.vel_x = min(self.vel_x + PLAYER_ACCELERATION, PLAYER_MAX_SPEED * self.current_terrain_speed_multiplier)
+            self.vel_x = min(self.vel_x + PLAYER_ACCELERATION * dt, PLAYER_MAX_SPEED * self.current_terrain_speed_multiplier)
         else:
             # Apply friction only when no directional key is pressed
             if self.on_ground:
                 if terrain_type == "ice":
-                    self.vel_x *= 0.98 # Less friction on ice, so it slides more
+                    self.vel_x *= 0.98 ** dt # Less friction on ice, so it slides more
                 else:
-                    self.vel_x *= FRICTION
-            if abs(self.vel_x) < 0.1: # Stop small movements
+                    self.vel_x *= FRICTION ** dt
+            # Stop small movements. Not scaled by dt on purpose: vel_x is per reference tick at any rate and
+            # has already decayed for the whole tick, so it stops within one tick of when it would at
+            # PHYSICS_REFERENCE_RATE (checked in physics_check.py); a dt-scaled threshold would stop it earlier
+            if abs(self.vel_x) < 0.1:
                 self.vel_x = 0
 
-        # Update position
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
+        # Update position: the fraction is kept in self.x/self.y instead of being truncated by the rect
+        self.x += self.vel_x * dt
+        self.y += self.vel_y * dt
+        moved_x = self.rect.x = math.floor(self.x)
+        moved_y = self.rect.y = math.floor(self.y)
 
         self.on_ground = False # Reset for collision detection each frame
 
@@ -85,6 +130,13 @@ class Player:
             self.rect.left = 0
             self.vel_x = 0 # Stop horizontal movement if hitting wall
 
+        # Con pasos grandes (dt alto, mucha velocidad) el rect puede atravesar entera una plataforma
+        # y no tocarla al final del tick: solo entonces hace falta el barrido (a 60 Hz nunca pasa)
+        dx = self.rect.x - prev_x
+        dy = self.rect.y - prev_y
+        if abs(dx) > PLAYER_WIDTH or abs(dy) > PLAYER_HEIGHT:
+            self.sweep_collisions(platforms, ground_rect, prev_x, prev_y, dx, dy)
+
         # Check collision with ground
         if self.rect.colliderect(ground_rect):
             # If falling and land on top of ground
@@ -95,6 +147,13 @@ class Player:
             # If already on ground, confirm on ground
             elif self.rect.bottom == ground_rect.top:
                 self.on_ground = True
+        # Cayendo y justo apoyado: la gravedad de un tick (0.5 px) no baja floor(y) hasta solaparse,
+        # y colliderect no cuenta el contacto por el borde. Sin esto on_ground alternaría cada tick.
+        elif self.vel_y > 0 and self.rect.bottom == ground_rect.top and prev_y + PLAYER_HEIGHT <= ground_rect.top and \
+             self.rect.right > ground_rect.left and self.rect.left < ground_rect.right:
+            self.vel_y = 0
+            self.y = float(self.rect.y)
+            self.on_ground = True
 
         # Collision with platforms
         for platform in platforms:
@@ -116,6 +175,13 @@ class Player:
                 elif self.vel_x < 0 and prev_x >= platform.rect.right:
                     self.rect.left = platform.rect.right
                     self.vel_x = 0
+            # Cayendo y justo apoyado encima (como con el suelo)
+            elif self.vel_y > 0 and self.rect.bottom == platform.rect.top and \
+                 prev_y + PLAYER_HEIGHT <= platform.rect.top and \
+                 self.rect.right > platform.rect.left and self.rect.left < platform.rect.right:
+                self.vel_y = 0
+                self.y = float(self.rect.y)
+                self.on_ground = True
 
         # After all vertical movements and collisions, re-check on ground for platforms
         if self.vel_y == 0: # Only if not actively jumping/falling
@@ -133,6 +199,61 @@ class Player:
             elif platform_collision_detected:
                 self.on_ground = True
 
+        # If a collision pushed the rect, the float position snaps to it
+        if self.rect.x != moved_x:
+            self.x = float(self.rect.x)
+        if self.rect.y != moved_y:
+            self.y = float(self.rect.y)
+
+
+    def sweep_collisions(self, platforms, ground_rect, prev_x, prev_y, dx, dy):
+        # Swept AABB: en cada eje, de los rects que el movimiento del tick atraviesa de lado a lado,
+        # el de menor tiempo de impacto (fracción del movimiento, 0..1) para al jugador en su borde.
+        # Lo que no se atraviesa entero lo resuelve después el test normal de update()
+        rect = self.rect
+        end_x = rect.x
+        end_y = rect.y
+        hit_y = hit_x = None
+        toi_y = toi_x = 2.0
+        for other in [ground_rect] + [platform.rect for platform in platforms]:
+            # Eje vertical: cayendo desde encima hasta debajo, o saltando desde debajo hasta encima
+            if dy > 0 and prev_y + PLAYER_HEIGHT <= other.top and end_y >= other.bottom:
+                t = (other.top - prev_y - PLAYER_HEIGHT) / dy
+            elif dy < 0 and prev_y >= other.bottom and end_y + PLAYER_HEIGHT <= other.top:
+                t = (prev_y - other.bottom) / -dy
+            else:
+                t = 2.0
+            if t < toi_y:
+                x = prev_x + dx * t # Solo cuenta si en ese instante se solapan en horizontal
+                if x < other.right and x + PLAYER_WIDTH > other.left:
+                    toi_y = t
+                    hit_y = other
+            # Eje horizontal
+            if dx > 0 and prev_x + PLAYER_WIDTH <= other.left and end_x >= other.right:
+                t = (other.left - prev_x - PLAYER_WIDTH) / dx
+            elif dx < 0 and prev_x >= other.right and end_x + PLAYER_WIDTH <= other.left:
+                t = (prev_x - other.right) / -dx
+            else:
+                t = 2.0
+            if t < toi_x:
+                y = prev_y + dy * t
+                if y < other.bottom and y + PLAYER_HEIGHT > other.top:
+                    toi_x = t
+                    hit_x = other
+
+        if hit_y is not None:
+            if dy > 0: # Aterriza encima
+                rect.bottom = hit_y.top
+                self.on_ground = True
+            else: # Se da con la parte de abajo
+                rect.top = hit_y.bottom
+            self.vel_y = 0
+        if hit_x is not None:
+            if dx > 0:
+                rect.right = hit_x.left
+            else:
+                rect.left = hit_x.right
+            self.vel_x = 0
 
     def move_left(self):
         self.moving_left = True
@@ -0,0 +1,97 @@
+# profiler.py
+
+import time
+from collections import deque
+from constants import *
+
+# --- Perfilador de frames (overlay con F3) ---
+# El bucle llama a mark(sección) al terminar cada parte del frame: el tiempo desde la
+# marca anterior se suma a esa sección. Desactivado, cada llamada solo comprueba
+# self.enabled y vuelve, así que puede quedarse en el juego. Activado, guarda los
+# últimos PROFILER_WINDOW frames y recalcula el resumen que dibuja UI.draw_profiler
+# cada PROFILER_REFRESH_MS (el texto solo cambia entonces y se reutiliza de la caché de UI).
+
+SECTIONS = ("input", "level_update", "player_update", "collisions", "level_draw", "other", "flip")
+
+class FrameProfiler:
+    def __init__(self, window=PROFILER_WINDOW, refresh_ms=PROFILER_REFRESH_MS):
+        self.enabled = False
+        self.window = window
+        self.refresh_ms = refresh_ms
+        self.summary = None # Lo que se dibuja; None hasta el primer refresco
+        self.version = 0 # Cambia con cada resumen nuevo (para el renderizado por regiones)
+        self.reset()
+
+    def reset(self):
+        self.frame_times = deque(maxlen=self.window) # Intervalo entre frames (ms)
+        self.work_times = deque(maxlen=self.window) # Suma de las secciones (ms)
+        self.history = {name: deque(maxlen=self.window) for name in SECTIONS}
+        self.counts = {}
+        self.current = dict.fromkeys(SECTIONS, 0.0)
+        self.last = time.perf_counter()
+        self.last_refresh = self.last
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+        self.summary = None
+        self.version += 1
+        return self.enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.last = time.perf_counter()
+
+    def mark(self, section):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[section] += now - self.last
+        self.last = now
+
+    def count(self, name, value):
+        # Contadores del frame (entidades dibujadas, tests de colisión...); se muestra el último valor
+        if not self.enabled:
+            return
+        self.counts[name] = value
+
+    def end_frame(self, frame_ms):
+        if not self.enabled:
+            return
+        current = self.current
+        work = 0.0
+        for name in SECTIONS:
+            ms = current[name] * 1000.0
+            self.history[name].append(ms)
+            work += ms
+            current[name] = 0.0
+        self.work_times.append(work)
+        self.frame_times.append(frame_ms)
+        if (self.last - self.last_refresh) * 1000.0 >= self.refresh_ms:
+            self.last_refresh = self.last
+            self._refresh()
+
+    def _refresh(self):
+        frames = sorted(self.frame_times)
+        work = sorted(self.work_times)
+        histogram = [0] * PROFILER_HISTOGRAM_BINS
+        for ms in self.frame_times:
+            histogram[min(int(ms // PROFILER_HISTOGRAM_BIN_MS), PROFILER_HISTOGRAM_BINS - 1)] += 1
+        self.summary = {
+            "frame_p50": percentile(frames, 50),
+            "frame_p99": percentile(frames, 99),
+            "work_p50": percentile(work, 50),
+            "work_p99": percentile(work, 99),
+            "sections": [(name, sum(self.history[name]) / max(len(self.history[name]), 1)) for name in SECTIONS],
+            "counts": dict(self.counts),
+            "histogram": histogram,
+        }
+        self.version += 1
+
+def percentile(sorted_values, p):
+    # Percentil por rango más cercano de una lista ya ordenada
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
@@ -0,0 +1,40 @@
+# render.py
+
+import pygame
+
+# --- Presentación de la pantalla por regiones sucias ---
+# Cada frame se describe con dos claves: frame_key (todo lo que afecta a la imagen) y
+# hud_key (solo lo que cambia el HUD). Si ninguna cambia no se dibuja ni se presenta nada;
+# si solo cambia el HUD se presentan únicamente sus rects con pygame.display.update(rects),
+# junto con los del HUD anterior: un texto más corto que el de antes deja píxeles fuera de su rect.
+
+class DirtyRenderer:
+    def __init__(self):
+        self.frame_key = None
+        self.hud_key = None
+        self.hud_rects = [] # Rects del HUD presentados la última vez
+        self.full_presents = 0
+        self.partial_presents = 0
+        self.skipped_frames = 0
+
+    def invalidate(self):
+        # La ventana se ha tapado/redimensionado: el próximo frame se presenta entero
+        self.frame_key = None
+
+    def present(self, frame_key, hud_key, draw_frame):
+        # draw_frame() dibuja el frame completo en la pantalla y devuelve los rects del HUD
+        if self.frame_key is None or frame_key != self.frame_key:
+            self.hud_rects = draw_frame()
+            pygame.display.flip()
+            self.full_presents += 1
+        elif hud_key != self.hud_key:
+            hud_rects = draw_frame()
+            pygame.display.update(hud_rects + self.hud_rects)
+            self.hud_rects = hud_rects
+            self.partial_presents += 1
+        else:
+            self.skipped_frames += 1
+            return False
+        self.frame_key = frame_key
+        self.hud_key = hud_key
+        return True
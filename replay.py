@@ -0,0 +1,194 @@
+# replay.py
+
+import os
+import struct
+import time
+from constants import *
+from session import ACTIONS, GameSession
+
+# --- Grabación de entradas y repetición determinista ---
+# Una partida (de GameSession.reset() a GAME_OVER/GAME_WON/vuelta al menú) se graba como
+# la semilla de la sesión más la lista de acciones que recibió step() en cada tick.
+# Con la misma semilla los niveles son idénticos y la simulación es de paso fijo, así que
+# repetir las acciones en los mismos ticks reproduce la partida exacta.
+#
+# Formato (little endian):
+#   cabecera  HEADER: magic, versión, semilla, ticks por segundo, modo infinito
+#   eventos   varint(ticks desde el evento anterior) + byte (índice en ACTIONS)
+#   fin       varint(ticks hasta el final) + END_MARKER + FOOTER con el estado final esperado
+# Los ticks sin entradas no ocupan nada; una partida típica son unos pocos KB.
+
+MAGIC = b"MGRP"
+VERSION = 2 # 2: el jugador apoyado ya no alterna on_ground (cambia la física)
+HEADER = struct.Struct("<4sBQIB") # magic, versión, semilla, ticks/s, modo infinito
+FOOTER = struct.Struct("<IiiiiiiddI") # ticks, energía, hierro del nivel, hierro total, x, y, nivel, x/y sub-píxel, eventos
+END_MARKER = 0xFF
+
+ACTION_CODES = {action: i for i, action in enumerate(ACTIONS)}
+
+def write_varint(data, value):
+    while value >= 0x80:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def final_state(session):
+    # Lo que se compara al terminar una repetición
+    player = session.player
+    return {
+        "energy": player.energy,
+        "collected_iron": player.collected_iron,
+        "total_iron": session.total_iron_collected,
+        "x": player.rect.x,
+        "y": player.rect.y,
+        "level": session.level_number,
+        "float_x": player.x,
+        "float_y": player.y,
+    }
+
+class InputRecorder:
+    def __init__(self, directory=RECORDINGS_DIR):
+        self.directory = directory
+        self.active = False
+        self.last_path = None
+
+    def start(self, session):
+        # Llamado por GameSession.reset(): empieza una grabación nueva
+        if self.active:
+            self.finish(session)
+        if session.seed is None:
+            # Sin semilla los niveles no se pueden regenerar: no se graba
+            return
+        self.active = True
+        self.seed = session.seed
+        self.simulation_rate = session.simulation_rate
+        self.endless = session.endless
+        self.start_tick = session.tick
+        self.last_tick = session.tick
+        self.events = bytearray()
+        self.event_count = 0
+
+    def record(self, tick, inputs):
+        # Llamado por GameSession.step() con las acciones de ese tick, en orden
+        if not self.active:
+            return
+        for action in inputs:
+            write_varint(self.events, tick - self.last_tick)
+            self.events.append(ACTION_CODES[action])
+            self.last_tick = tick
+            self.event_count += 1
+
+    def finish(self, session, path=None):
+        # Cierra la grabación con el estado final y la escribe; devuelve la ruta
+        if not self.active:
+            return None
+        self.active = False
+        state = final_state(session)
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.simulation_rate, self.endless))
+        data += self.events
+        write_varint(data, session.tick - self.last_tick)
+        data.append(END_MARKER)
+        data += FOOTER.pack(session.tick - self.start_tick, state["energy"], state["collected_iron"],
+                            state["total_iron"], state["x"], state["y"], state["level"],
+                            state["float_x"], state["float_y"], self.event_count)
+        prune = path is None
+        if prune:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, time.strftime(f"recording-%Y%m%d-%H%M%S-{self.seed}.bin"))
+        with open(path, "wb") as f:
+            f.write(data)
+        if prune:
+            self.prune()
+        self.last_path = path
+        return path
+
+    def prune(self):
+        # Solo se guardan las RECORDINGS_KEEP grabaciones más recientes del directorio
+        # (el nombre empieza por la fecha, así que el orden alfabético es el cronológico)
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.startswith("recording-") and name.endswith(".bin"))
+        for name in names[:-RECORDINGS_KEEP]:
+            os.remove(os.path.join(self.directory, name))
+
+class Recording:
+    def __init__(self, seed, simulation_rate, endless, events, ticks, expected):
+        self.seed = seed
+        self.simulation_rate = simulation_rate
+        self.endless = endless
+        self.events = events # {tick relativo: [acciones]}
+        self.ticks = ticks
+        self.expected = expected
+
+def load_recording(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, simulation_rate, endless = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} no es una grabación válida (versión {version})")
+    pos = HEADER.size
+    events = {}
+    tick = 0
+    while True:
+        delta, pos = read_varint(data, pos)
+        tick += delta
+        code = data[pos]
+        pos += 1
+        if code == END_MARKER:
+            break
+        events.setdefault(tick, []).append(ACTIONS[code])
+    (ticks, energy, collected_iron, total_iron, x, y, level,
+     float_x, float_y, event_count) = FOOTER.unpack_from(data, pos)
+    expected = {"energy": energy, "collected_iron": collected_iron, "total_iron": total_iron,
+                "x": x, "y": y, "level": level, "float_x": float_x, "float_y": float_y}
+    return Recording(seed, simulation_rate, bool(endless), events, ticks, expected)
+
+def replay(recording):
+    # Vuelve a simular la partida sin ventana y lo más rápido posible; devuelve la sesión al final
+    # Sin caché de niveles: repetir grabaciones de semillas al azar no debe llenar LEVEL_CACHE_DIR
+    session = GameSession(recording.simulation_rate, recording.seed, recording.endless, use_level_cache=False)
+    events = recording.events
+    step = session.step
+    for tick in range(1, recording.ticks + 1):
+        step(events.get(tick, ()))
+    return session
+
+def verify(recording, session):
+    # Campos que no coinciden: {nombre: (esperado, obtenido)}
+    actual = final_state(session)
+    return {name: (value, actual[name]) for name, value in recording.expected.items() if actual[name] != value}
+
+# Repetir una grabación: python replay.py recordings/recording-....bin
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import pygame
+
+    parser = argparse.ArgumentParser(description="Repite y verifica una partida grabada de Moto Glóbulo Rojo")
+    parser.add_argument("recordings", nargs="+")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    failed = 0
+    for path in args.recordings:
+        recording = load_recording(path)
+        start = time.perf_counter()
+        session = replay(recording)
+        elapsed = time.perf_counter() - start
+        mismatches = verify(recording, session)
+        result = "OK" if not mismatches else f"DISTINTO {mismatches}"
+        print(f"{path}: {recording.ticks} ticks en {elapsed:.3f}s "
+              f"({recording.ticks / max(elapsed, 1e-9):.0f} ticks/s), nivel {session.level_number}: {result}")
+        failed += bool(mismatches)
+    sys.exit(1 if failed else 0)
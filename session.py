@@ -0,0 +1,235 @@
+# session.py
+
+import pygame
+from constants import *
+from player import Player
+from level import Level, LevelLoader
+from endless import EndlessLevel
+from physics import make_backend
+from telemetry import telemetry
+
+# Acciones que acepta GameSession.step(); son los mismos métodos de Player que usa el teclado
+ACTIONS = ("move_left", "move_right", "jump", "stop_moving_left", "stop_moving_right")
+
+# Nombres de los estados para la telemetría
+STATE_NAMES = {MENU: "menu", GAME: "game", GAME_OVER: "game_over", CONTROLS: "controls",
+               LEVEL_COMPLETE_SCREEN: "level_complete", GAME_WON: "game_won"}
+
+# --- Simulación del juego sin ventana ---
+# Guarda el jugador, el nivel, el estado y la puntuación, y avanza un tick por cada step().
+# No toca pygame.display, así que puede correr sin ventana (SDL_VIDEODRIVER=dummy)
+# y tan rápido como dé la CPU. main.py solo dibuja y traduce el teclado a acciones.
+
+class GameSession:
+    def __init__(self, simulation_rate=SIMULATION_RATE, seed=None, endless=False, use_level_cache=True):
+        self.simulation_rate = simulation_rate
+        # Con semilla, cada nivel se genera siempre igual (partidas reproducibles); sin ella, al azar
+        self.seed = seed
+        self.endless = endless # Modo infinito: un único mundo sin meta (ver endless.py)
+        # Guardar/leer los niveles con semilla en LEVEL_CACHE_DIR; es argumento porque reset() ya construye el nivel 1
+        self.use_level_cache = use_level_cache
+        self.profiler = None # FrameProfiler opcional (main.py); marca las partes de cada tick
+        self.recorder = None # InputRecorder opcional (replay.py); graba las entradas de cada partida
+        self.physics = make_backend() # Broadphase y contactos del jugador (ver physics.py)
+        self._state = None
+        # Las constantes de física están pensadas por tick a PHYSICS_REFERENCE_RATE
+        self.dt = PHYSICS_REFERENCE_RATE / simulation_rate
+        self.tick = 0
+        self.reset()
+
+    def reset(self):
+        self.player = Player(100, SCREEN_HEIGHT - 50 - PLAYER_HEIGHT)
+        self.level_number = 1
+        if self.endless:
+            self.level = EndlessLevel(self.level_seed(self.level_number))
+        else:
+            self.level = Level(self.level_number, self.level_seed(self.level_number), self.use_level_cache)
+        self.total_iron_collected = 0 # To keep track of total iron across levels
+        self.player.reset_iron() # Ensure player's iron count is also reset
+        self.camera_offset_x = 0 # Reset camera on new game
+        self.prev_camera_offset_x = 0
+        self.transition_ticks_left = 0
+        self.level_loader = None # Siguiente nivel construyéndose en segundo plano
+        self.state = GAME
+        if self.recorder is not None:
+            self.recorder.start(self)
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        # Todos los cambios de estado (también los de main.py) quedan en la telemetría
+        if state != self._state:
+            telemetry.instant("state_change", "session", previous=STATE_NAMES.get(self._state),
+                              current=STATE_NAMES.get(state), level=self.level_number, tick=self.tick)
+        self._state = state
+        if self.recorder is not None and state in (GAME_OVER, GAME_WON, MENU):
+            self.recorder.finish(self) # Fin de la partida grabada
+
+    def level_seed(self, level_number):
+        if self.seed is None:
+            return None
+        return (self.seed * 1000003 + level_number) % 2 ** 32
+
+    def step(self, inputs=()):
+        # inputs: secuencia de nombres de ACTIONS, aplicados en orden antes de la física
+        self.tick += 1
+        if inputs and self.recorder is not None:
+            self.recorder.record(self.tick, inputs)
+        state = self._state # Lectura directa: step() se llama en cada tick
+        if state == GAME:
+            for action in inputs:
+                getattr(self.player, action)()
+            self._update_game()
+        elif state == LEVEL_COMPLETE_SCREEN:
+            self.transition_ticks_left -= 1
+            ready = self.level_loader.ready()
+            if ready:
+                # Convertir imágenes y construir la capa estática ahora, mientras se ve la transición,
+                # y no en el primer frame del nivel
+                self.level_loader.prepare()
+            if self.transition_ticks_left <= 0 or (LEVEL_TRANSITION_END_WHEN_READY and ready):
+                self._start_next_level()
+        return self._state
+
+    def _update_game(self):
+        player = self.player
+        level = self.level
+
+        profiler = self.profiler
+
+        level.update(self.dt, self.camera_offset_x) # Mover plataformas móviles
+        if profiler is not None:
+            profiler.mark("level_update")
+        self.physics.move_player(player, level, self.dt)
+        if profiler is not None:
+            profiler.mark("player_update")
+
+        self.prev_camera_offset_x = self.camera_offset_x
+        # Keep player roughly in the center of the screen horizontally,
+        # clamped to the level bounds (0 to level.width - SCREEN_WIDTH; no right bound in endless mode)
+        self.camera_offset_x = player.rect.x - SCREEN_WIDTH // 2
+        if self.camera_offset_x < 0:
+            self.camera_offset_x = 0
+        if self.camera_offset_x > level.width - SCREEN_WIDTH:
+            self.camera_offset_x = level.width - SCREEN_WIDTH
+
+        self.check_contacts()
+        if profiler is not None:
+            profiler.mark("collisions")
+
+        # Game Over condition
+        if player.energy <= 0:
+            if self.endless: # Sin niveles completados, la puntuación es lo recogido en el recorrido
+                self.total_iron_collected += player.collected_iron
+            self.state = GAME_OVER
+            return
+
+        # Level completion condition: Reach the finish line
+        if level.finish_line and player.rect.colliderect(level.finish_line.rect):
+            self.total_iron_collected += player.collected_iron # Add current level's iron to total
+            self.level_number += 1
+            if self.level_number > MAX_LEVELS: # Max levels reached
+                self.state = GAME_WON
+            else:
+                self.state = LEVEL_COMPLETE_SCREEN
+                self.transition_ticks_left = LEVEL_TRANSITION_DELAY_MS * self.simulation_rate // 1000
+                # Se construye durante la transición
+                self.level_loader = LevelLoader(self.level_number, self.level_seed(self.level_number),
+                                                self.use_level_cache)
+            player.reset_iron() # Reset iron count for new level, but total is kept
+
+    def check_contacts(self):
+        # Pickup/damage pass: items, parasites and spikes touching the player
+        player = self.player
+        level = self.level
+        physics = self.physics
+        items, obstacles, spikes = physics.contacts(player, level)
+
+        # Check for item collection (iron)
+        for item in items:
+            player.collect_item()
+            player.heal(10) # Gain energy for collecting iron
+            level.remove_item(item)
+            physics.remove(item)
+
+        # Check for obstacle collision (parasites)
+        for obstacle in obstacles:
+            player.take_damage(PARASITE_DAMAGE)
+            level.remove_obstacle(obstacle) # Parasite disappears after contact
+            physics.remove(obstacle)
+
+        # Check for spike collision (spikes remain for persistent danger)
+        for spike in spikes:
+            player.take_damage(SPIKE_DAMAGE)
+
+    def _start_next_level(self):
+        if self.level_loader is not None and self.level_loader.level_number == self.level_number:
+            self.level_loader.prepare() # Normalmente ya está listo y preparado
+            self.level = self.level_loader.result()
+        else:
+            self.level = Level(self.level_number, self.level_seed(self.level_number), self.use_level_cache)
+        self.level_loader = None
+        self.player.reset_position(100, SCREEN_HEIGHT - 50 - PLAYER_HEIGHT) # Reset player position for new level
+        self.camera_offset_x = 0 # Reset camera for new level
+        self.prev_camera_offset_x = 0
+        self.state = GAME
+
+    def interpolated_camera_offset(self, alpha):
+        # Cámara entre el tick anterior y el actual, para dibujar a más fps que la simulación
+        return round(self.prev_camera_offset_x + (self.camera_offset_x - self.prev_camera_offset_x) * alpha)
+
+# --- Paso fijo de simulación ---
+# Acumula el tiempo real de cada frame y dice cuántos ticks de simulación tocan.
+# Un frame lento solo cuesta frames dibujados (se recuperan ticks), no cámara lenta.
+
+class FixedTimestep:
+    def __init__(self, simulation_rate=SIMULATION_RATE, max_frame_time_ms=MAX_FRAME_TIME_MS):
+        self.step_ms = 1000.0 / simulation_rate
+        self.max_frame_time_ms = max_frame_time_ms
+        self.accumulator = 0.0
+
+    def advance(self, frame_ms):
+        # Devuelve el número de ticks a simular para este frame
+        self.accumulator += min(frame_ms, self.max_frame_time_ms)
+        steps = int(self.accumulator // self.step_ms)
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    def alpha(self):
+        # Fracción del siguiente tick ya transcurrida, para interpolar el dibujo
+        return self.accumulator / self.step_ms
+
+# Ejecución sin ventana para pruebas de rendimiento: python session.py --ticks 10000
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    parser = argparse.ArgumentParser(description="Simulación sin ventana de Moto Glóbulo Rojo")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--rate", type=int, default=SIMULATION_RATE, help="ticks de simulación por segundo de juego")
+    parser.add_argument("--seed", type=int, default=None, help="semilla de generación de niveles")
+    parser.add_argument("--endless", action="store_true", help="modo infinito")
+    parser.add_argument("--trace", default=None, help="guardar la telemetría como Chrome trace en este archivo")
+    parser.add_argument("--physics", default=PHYSICS_BACKEND, help="backend de física (ver physics.py)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    session = GameSession(args.rate, args.seed, args.endless)
+    session.physics = make_backend(args.physics)
+    start = time.perf_counter()
+    session.step(["move_right"])
+    for _ in range(args.ticks - 1):
+        session.step()
+        if session.state in (GAME_OVER, GAME_WON):
+            session.reset()
+            session.step(["move_right"])
+    elapsed = time.perf_counter() - start
+    print(f"{args.ticks} ticks en {elapsed:.3f}s ({args.ticks / elapsed:.0f} ticks/s), "
+          f"nivel {session.level_number}, x {session.player.rect.x}, energía {session.player.energy}")
+    if args.trace:
+        print(f"Trace guardado en {telemetry.dump(args.trace)}")
@@ -0,0 +1,148 @@
+# spatial.py
+
+import bisect
+from constants import SPATIAL_CELL_SIZE
+
+# --- Índice ordenado por x para consultas de ventana (cámara) ---
+# Guarda cada entidad con su extensión horizontal [left, right) ordenada por left.
+# Una consulta solo recorre las entidades cuyo left cae dentro de la ventana
+# (ampliada por el ancho máximo), así que el coste depende de lo visible y no
+# del ancho total del nivel.
+# remove() solo marca la entidad como eliminada (O(1)); las listas se compactan
+# cuando las marcadas superan la mitad del índice.
+
+class XSortedIndex:
+    def __init__(self, entities=(), extent=None):
+        # extent(entity) -> (left, right); por defecto el rect de la entidad
+        self.extent = extent or (lambda entity: (entity.rect.left, entity.rect.right))
+        self.lefts = []
+        self.rights = []
+        self.entities = []
+        self.removed = set()
+        self.max_width = 0
+        for entity in entities:
+            self.insert(entity)
+
+    def __len__(self):
+        return len(self.entities) - len(self.removed)
+
+    def insert(self, entity):
+        if entity in self.removed:
+            # Sigue en las listas; basta con desmarcarla
+            self.removed.discard(entity)
+            return
+        left, right = self.extent(entity)
+        i = bisect.bisect_right(self.lefts, left)
+        self.lefts.insert(i, left)
+        self.rights.insert(i, right)
+        self.entities.insert(i, entity)
+        if right - left > self.max_width:
+            self.max_width = right - left
+
+    def remove(self, entity):
+        if entity in self.removed:
+            return False
+        self.removed.add(entity)
+        if len(self.removed) * 2 > len(self.entities):
+            self.compact()
+        return True
+
+    def compact(self):
+        removed = self.removed
+        keep = [i for i, entity in enumerate(self.entities) if entity not in removed]
+        self.lefts = [self.lefts[i] for i in keep]
+        self.rights = [self.rights[i] for i in keep]
+        self.entities = [self.entities[i] for i in keep]
+        self.removed = set()
+
+    def query(self, left, right):
+        # Entidades cuya extensión se solapa con [left, right)
+        lefts = self.lefts
+        rights = self.rights
+        i = bisect.bisect_right(lefts, left - self.max_width)
+        end = bisect.bisect_left(lefts, right, i)
+        entities = self.entities
+        removed = self.removed
+        if removed:
+            return [entities[j] for j in range(i, end) if rights[j] > left and entities[j] not in removed]
+        return [entities[j] for j in range(i, end) if rights[j] > left]
+
+# --- Rejilla por columnas (broadphase) para consultas de colisión ---
+# Cada entidad se guarda en todas las columnas de ancho cell_size que toca su rect.
+# query(rect) solo mira las columnas que cubre el rect consultado, así que el coste
+# no depende del tamaño del nivel. Las entidades que se mueven llaman a move().
+
+class SpatialHash:
+    def __init__(self, entities=(), cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {} # columna -> {entidad: None}
+        self.spans = {} # entidad -> (primera columna, última columna)
+        self.order = {} # entidad -> orden de inserción, para devolver resultados estables
+        self.next_order = 0
+        self.tests = 0 # Rects comparados en query() (candidatos del broadphase), para el perfilador
+        for entity in entities:
+            self.insert(entity)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, entity):
+        return entity in self.spans
+
+    def _span(self, rect):
+        return (rect.left // self.cell_size, (rect.right - 1) // self.cell_size)
+
+    def insert(self, entity):
+        span = self._span(entity.rect)
+        self.spans[entity] = span
+        self.order[entity] = self.next_order
+        self.next_order += 1
+        for col in range(span[0], span[1] + 1):
+            self.cells.setdefault(col, {})[entity] = None
+
+    def remove(self, entity):
+        span = self.spans.pop(entity, None)
+        if span is None:
+            return False
+        del self.order[entity]
+        for col in range(span[0], span[1] + 1):
+            cell = self.cells[col]
+            del cell[entity]
+            if not cell:
+                del self.cells[col]
+        return True
+
+    def move(self, entity):
+        # Solo se tocan los cubos si la entidad ha cambiado de columnas
+        old_span = self.spans[entity]
+        new_span = self._span(entity.rect)
+        if new_span == old_span:
+            return
+        for col in range(old_span[0], old_span[1] + 1):
+            if col < new_span[0] or col > new_span[1]:
+                cell = self.cells[col]
+                del cell[entity]
+                if not cell:
+                    del self.cells[col]
+        for col in range(new_span[0], new_span[1] + 1):
+            if col < old_span[0] or col > old_span[1]:
+                self.cells.setdefault(col, {})[entity] = None
+        self.spans[entity] = new_span
+
+    def query(self, rect):
+        # Entidades cuyo rect se solapa con rect, en orden de inserción
+        first, last = self._span(rect)
+        cells = self.cells
+        if first == last:
+            candidates = cells.get(first, ())
+        else:
+            candidates = {}
+            for col in range(first, last + 1):
+                cell = cells.get(col)
+                if cell:
+                    candidates.update(cell)
+        self.tests += len(candidates)
+        hits = [entity for entity in candidates if entity.rect.colliderect(rect)]
+        if len(hits) > 1:
+            hits.sort(key=self.order.__getitem__)
+        return hits
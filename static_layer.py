@@ -0,0 +1,61 @@
+# static_layer.py
+
+from collections import OrderedDict
+import pygame
+from constants import *
+
+# --- Capa estática pre-renderizada por trozos ---
+# El fondo, el suelo y la geometría que no se mueve se dibujan una sola vez en
+# superficies del ancho de la pantalla. Cada frame solo hace falta blitear uno o dos
+# trozos. Los trozos se crean al primer uso y se descartan los menos usados (LRU),
+# así un nivel muy ancho no guarda una superficie gigante en memoria.
+
+class StaticLayerCache:
+    def __init__(self, render_chunk, chunk_width=STATIC_CHUNK_WIDTH, height=SCREEN_HEIGHT,
+                 max_chunks=STATIC_CHUNK_CACHE_SIZE):
+        # render_chunk(surface, chunk_left) dibuja en surface lo que hay en [chunk_left, chunk_left + chunk_width)
+        self.render_chunk = render_chunk
+        self.chunk_width = chunk_width
+        self.height = height
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict() # índice de trozo -> Surface, del menos al más reciente
+        self.builds = 0
+        self.evictions = 0
+
+    def get_chunk(self, index):
+        chunk = self.chunks.get(index)
+        if chunk is not None:
+            self.chunks.move_to_end(index)
+            return chunk
+
+        chunk = pygame.Surface((self.chunk_width, self.height))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert() # Mismo formato que la pantalla: blits más rápidos
+        self.render_chunk(chunk, index * self.chunk_width)
+        self.builds += 1
+        self.chunks[index] = chunk
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+            self.evictions += 1
+        return chunk
+
+    def visible(self, camera_offset_x, view_width=SCREEN_WIDTH):
+        # Índices de los trozos que se ven con esta cámara
+        return range(camera_offset_x // self.chunk_width, (camera_offset_x + view_width - 1) // self.chunk_width + 1)
+
+    def draw(self, screen, camera_offset_x, view_width=SCREEN_WIDTH):
+        for index in self.visible(camera_offset_x, view_width):
+            screen.blit(self.get_chunk(index), (index * self.chunk_width - camera_offset_x, 0))
+
+    def warm(self, camera_offset_x, view_width=SCREEN_WIDTH):
+        # Construye ya los trozos visibles con esta cámara, para que no cuesten en el primer frame
+        for index in self.visible(camera_offset_x, view_width):
+            self.get_chunk(index)
+
+    def invalidate(self, left=None, right=None):
+        # Descarta los trozos que se solapan con [left, right) (todos si no se indica rango)
+        for index in list(self.chunks):
+            chunk_left = index * self.chunk_width
+            if (left is None or chunk_left + self.chunk_width > left) and \
+               (right is None or chunk_left < right):
+                del self.chunks[index]
@@ -0,0 +1,94 @@
+# telemetry.py
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from constants import *
+
+# --- Telemetría: spans, contadores y eventos en un buffer circular ---
+# El juego registra aquí lo que pasa (construcción de niveles, carga de imágenes, frames
+# que se pasan del presupuesto, tests de colisión, cambios de estado...). El buffer guarda
+# los últimos TELEMETRY_BUFFER_SIZE eventos y dump() los escribe en formato Chrome trace,
+# que se abre en chrome://tracing o https://ui.perfetto.dev.
+# Los eventos ya están en el formato del trace (ts y dur en microsegundos).
+
+class Telemetry:
+    def __init__(self, capacity=TELEMETRY_BUFFER_SIZE, enabled=TELEMETRY_ENABLED):
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity) # append() es seguro entre hilos (LevelLoader)
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.thread_names = {} # tid -> nombre del hilo, para las filas del trace
+        self.pending = {} # Sumas acumuladas hasta el próximo flush_counters()
+        self.last_flush = self.origin
+
+    def _us(self, t):
+        return (t - self.origin) * 1e6
+
+    def _tid(self):
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        return tid
+
+    def complete(self, name, start, category="game", end=None, **args):
+        # Span ya medido: start (y end) son valores de time.perf_counter()
+        if not self.enabled:
+            return
+        if end is None:
+            end = time.perf_counter()
+        self.events.append({"name": name, "cat": category, "ph": "X", "ts": self._us(start),
+                            "dur": (end - start) * 1e6, "pid": self.pid, "tid": self._tid(), "args": args})
+
+    def instant(self, name, category="game", **args):
+        if not self.enabled:
+            return
+        self.events.append({"name": name, "cat": category, "ph": "i", "s": "p",
+                            "ts": self._us(time.perf_counter()), "pid": self.pid, "tid": self._tid(), "args": args})
+
+    def counter(self, name, category="game", **values):
+        # Cada clave de values es una serie del mismo gráfico
+        if not self.enabled:
+            return
+        self.events.append({"name": name, "cat": category, "ph": "C",
+                            "ts": self._us(time.perf_counter()), "pid": self.pid, "tid": self._tid(), "args": values})
+
+    def add(self, name, value=1):
+        # Acumula para el siguiente contador agregado (valores por frame que serían demasiados eventos)
+        if not self.enabled:
+            return
+        self.pending[name] = self.pending.get(name, 0) + value
+
+    def flush_counters(self, name="per_second", interval_ms=TELEMETRY_COUNTER_INTERVAL_MS):
+        # Emite lo acumulado con add() como un contador cada interval_ms
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if (now - self.last_flush) * 1000.0 < interval_ms:
+            return
+        self.last_flush = now
+        self.counter(name, "frame", **self.pending)
+        self.pending = {}
+
+    def dump(self, path=None):
+        # Escribe el buffer como Chrome trace JSON y devuelve la ruta
+        if path is None:
+            os.makedirs(TELEMETRY_TRACE_DIR, exist_ok=True)
+            path = os.path.join(TELEMETRY_TRACE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        events = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in list(self.thread_names.items())]
+        events.extend(list(self.events))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp_path, path)
+        return path
+
+    def clear(self):
+        self.events.clear()
+        self.pending = {}
+
+# Instancia única para todo el proceso
+telemetry = Telemetry()
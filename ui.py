@@ -1,4 +1,5 @@
 # ui.py
+from collections import OrderedDict
 import pygame
 from constants import * # Import constants for colors and screen dimensions
 
@@ -9,6 +10,28 @@ class UI:
         self.font_medium = pygame.font.Font(None, 50)
         self.font_large = pygame.font.Font(None, 70)
         self.font_xlarge = pygame.font.Font(None, 100) # For titles
+        self.font_tiny = pygame.font.Font(None, 20) # Profiler overlay
+        self.profiler_panel = None # Translucent background, created on first use
+
+        # Rendered text surfaces keyed by (font, text, color), least recently used dropped first.
+        # Text that doesn't change (menus, labels, unchanged HUD values) is rasterized only once.
+        self.text_cache = OrderedDict()
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+
+    def render_text(self, font, text, color):
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is not None:
+            self.text_cache.move_to_end(key)
+            self.text_cache_hits += 1
+            return surface
+        self.text_cache_misses += 1
+        surface = font.render(text, True, color)
+        self.text_cache[key] = surface
+        if len(self.text_cache) > TEXT_CACHE_SIZE:
+            self.text_cache.popitem(last=False)
+        return surface
 
     def draw_health_bar(self, screen, current_health):
         health_bar_width = 200
@@ -24,40 +47,48 @@ class UI:
         pygame.draw.rect(screen, RED, (health_bar_x, health_bar_y, fill_width, health_bar_height))
 
         # Health text
-        health_text = self.font_small.render(f"Salud: {current_health}/{MAX_ENERGY}", True, BLACK)
-        screen.blit(health_text, (health_bar_x + health_bar_width + 10, health_bar_y))
+        health_text = self.render_text(self.font_small, f"Salud: {current_health}/{MAX_ENERGY}", BLACK)
+        text_rect = screen.blit(health_text, (health_bar_x + health_bar_width + 10, health_bar_y))
+
+        # Area touched, for dirty-rect presentation
+        return text_rect.union((health_bar_x, health_bar_y, health_bar_width, health_bar_height))
 
     def draw_score(self, screen, score):
-        score_text = self.font_small.render(f"Hierro: {score}", True, BLACK)
-        screen.blit(score_text, (10, 40)) # Below health bar
+        score_text = self.render_text(self.font_small, f"Hierro: {score}", BLACK)
+        return screen.blit(score_text, (10, 40)) # Below health bar
 
     def draw_menu(self, screen, selected_option):
         screen.fill(LIGHT_BLUE) # A softer background for the menu
 
-        title_text = self.font_xlarge.render("Juego", True, BLACK)
+        title_text = self.render_text(self.font_xlarge, "Juego", BLACK)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
         screen.blit(title_text, title_rect)
 
         start_text_color = RED if selected_option == "start" else BLACK
+        endless_text_color = RED if selected_option == "endless" else BLACK
         controls_text_color = RED if selected_option == "controls" else BLACK
         exit_text_color = RED if selected_option == "exit" else BLACK
 
-        start_text = self.font_large.render("Iniciar Juego", True, start_text_color)
+        start_text = self.render_text(self.font_large, "Iniciar Juego", start_text_color)
         start_rect = start_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(start_text, start_rect)
 
-        controls_text = self.font_large.render("Controles", True, controls_text_color)
-        controls_rect = controls_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70))
+        endless_text = self.render_text(self.font_large, "Modo Infinito", endless_text_color)
+        endless_rect = endless_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70))
+        screen.blit(endless_text, endless_rect)
+
+        controls_text = self.render_text(self.font_large, "Controles", controls_text_color)
+        controls_rect = controls_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 140))
         screen.blit(controls_text, controls_rect)
 
-        exit_text = self.font_large.render("Salir", True, exit_text_color)
-        exit_rect = exit_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 140))
+        exit_text = self.render_text(self.font_large, "Salir", exit_text_color)
+        exit_rect = exit_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 210))
         screen.blit(exit_text, exit_rect)
 
     def draw_controls_screen(self, screen):
         screen.fill(LIGHT_BLUE)
 
-        title_text = self.font_xlarge.render("Controles", True, BLACK)
+        title_text = self.render_text(self.font_xlarge, "Controles", BLACK)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
         screen.blit(title_text, title_rect)
 
@@ -73,21 +104,21 @@ class UI:
 
         y_offset = SCREEN_HEIGHT // 2 - 80
         for line in controls_lines:
-            text_surface = self.font_medium.render(line, True, BLACK)
+            text_surface = self.render_text(self.font_medium, line, BLACK)
             text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
             screen.blit(text_surface, text_rect)
             y_offset += 40
 
-        back_text = self.font_small.render("Presiona ESC para volver", True, BLACK)
+        back_text = self.render_text(self.font_small, "Presiona ESC para volver", BLACK)
         screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, SCREEN_HEIGHT - 50))
 
 
     def draw_game_over(self, screen, final_score):
         screen.fill(RED) # Game Over screen is red
-        game_over_text = self.font_xlarge.render("GAME OVER", True, WHITE)
-        score_text = self.font_large.render(f"Hierro Total Recolectado: {final_score}", True, WHITE)
-        restart_text = self.font_medium.render("Presiona 'R' para Reiniciar", True, WHITE)
-        menu_text = self.font_medium.render("Presiona 'ESC' para ir al Menú", True, WHITE)
+        game_over_text = self.render_text(self.font_xlarge, "GAME OVER", WHITE)
+        score_text = self.render_text(self.font_large, f"Hierro Total Recolectado: {final_score}", WHITE)
+        restart_text = self.render_text(self.font_medium, "Presiona 'R' para Reiniciar", WHITE)
+        menu_text = self.render_text(self.font_medium, "Presiona 'ESC' para ir al Menú", WHITE)
 
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
@@ -101,28 +132,72 @@ class UI:
 
     def draw_level_complete(self, screen, completed_level_number):
         screen.fill(GREEN) # Green screen for level complete
-        level_complete_text = self.font_xlarge.render(f"Nivel {completed_level_number} Completado!", True, WHITE)
+        level_complete_text = self.render_text(self.font_xlarge, f"Nivel {completed_level_number} Completado!", WHITE)
         level_complete_rect = level_complete_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         screen.blit(level_complete_text, level_complete_rect)
 
-        next_level_text = self.font_medium.render("Cargando siguiente nivel...", True, WHITE)
+        next_level_text = self.render_text(self.font_medium, "Cargando siguiente nivel...", WHITE)
         next_level_rect = next_level_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         screen.blit(next_level_text, next_level_rect)
 
     def draw_game_won(self, screen, final_score):
         screen.fill(BLUE) # Blue screen for winning
-        game_won_text = self.font_xlarge.render("¡Has Ganado el Juego!", True, WHITE)
+        game_won_text = self.render_text(self.font_xlarge, "¡Has Ganado el Juego!", WHITE)
         game_won_rect = game_won_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         screen.blit(game_won_text, game_won_rect)
 
-        final_score_text = self.font_large.render(f"Hierro Total Recolectado: {final_score}", True, WHITE)
+        final_score_text = self.render_text(self.font_large, f"Hierro Total Recolectado: {final_score}", WHITE)
         final_score_rect = final_score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(final_score_text, final_score_rect)
 
-        restart_text = self.font_medium.render("Presiona 'R' para Jugar de Nuevo", True, WHITE)
+        restart_text = self.render_text(self.font_medium, "Presiona 'R' para Jugar de Nuevo", WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
         screen.blit(restart_text, restart_rect)
 
-        menu_text = self.font_medium.render("Presiona 'ESC' para ir al Menú", True, WHITE)
+        menu_text = self.render_text(self.font_medium, "Presiona 'ESC' para ir al Menú", WHITE)
         menu_rect = menu_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 130))
-        screen.blit(menu_text, menu_rect)
\ No newline at end of file
+        screen.blit(menu_text, menu_rect)
+
+    def draw_profiler(self, screen, summary):
+        # Frame profiler overlay (see profiler.py); returns the area it covers
+        panel_rect = pygame.Rect(SCREEN_WIDTH - 250, 10, 240, 240)
+        if self.profiler_panel is None:
+            self.profiler_panel = pygame.Surface(panel_rect.size, pygame.SRCALPHA)
+            self.profiler_panel.fill((0, 0, 0, 170))
+        screen.blit(self.profiler_panel, panel_rect)
+
+        x = panel_rect.x + 8
+        y = panel_rect.y + 6
+        if summary is None:
+            screen.blit(self.render_text(self.font_tiny, "Perfilando...", WHITE), (x, y))
+            return panel_rect
+
+        lines = [
+            f"frame  p50 {summary['frame_p50']:.1f}  p99 {summary['frame_p99']:.1f} ms",
+            f"trabajo  p50 {summary['work_p50']:.2f}  p99 {summary['work_p99']:.2f} ms",
+        ]
+        for line in lines:
+            screen.blit(self.render_text(self.font_tiny, line, WHITE), (x, y))
+            y += 16
+        # Average time per section over the window, in two columns
+        for name, ms in summary["sections"]:
+            screen.blit(self.render_text(self.font_tiny, name, WHITE), (x + 8, y))
+            screen.blit(self.render_text(self.font_tiny, f"{ms:.3f} ms", WHITE), (x + 130, y))
+            y += 16
+        counts = summary["counts"]
+        for line in (f"dibujadas {counts.get('drawn', 0)}  descartadas {counts.get('culled', 0)}",
+                     f"tests de colisión {counts.get('collision_tests', 0)}"):
+            screen.blit(self.render_text(self.font_tiny, line, WHITE), (x, y))
+            y += 16
+
+        # Histogram of frame times: one bar per PROFILER_HISTOGRAM_BIN_MS, the last one is "or slower"
+        histogram = summary["histogram"]
+        tallest = max(max(histogram), 1)
+        bar_width = (panel_rect.width - 16) // len(histogram)
+        bottom = panel_rect.bottom - 6
+        for i, frames in enumerate(histogram):
+            if frames:
+                height = max(1, frames * 40 // tallest)
+                color = GREEN if (i + 1) * PROFILER_HISTOGRAM_BIN_MS <= FRAME_BUDGET_MS else RED
+                pygame.draw.rect(screen, color, (x + i * bar_width, bottom - height, bar_width - 1, height))
+        return panel_rect
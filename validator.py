@@ -0,0 +1,296 @@
+# validator.py
+
+import argparse
+import heapq
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pygame
+from constants import *
+from level import Level
+from player import Player
+from spatial import SpatialHash
+from telemetry import telemetry
+
+# --- Validador de niveles: ¿se puede llegar a la meta? ---
+# Para cada (nivel, semilla) construye el nivel igual que Level(level_number, seed) y busca
+# en los estados alcanzables del jugador con la física real: Player.update con el terreno del
+# nivel, el broadphase de la sesión, las plataformas móviles en su posición de cada tick y la
+# misma pasada de recogida/daño que GameSession.check_contacts (el hierro cura, los parásitos
+# desaparecen tras el golpe, los pinchos dañan en cada tick).
+#
+# Búsqueda best-first: prioridad = daño recibido * VALIDATOR_DAMAGE_WEIGHT - x, es decir,
+# avanzar hacia la meta, y aceptar daño solo cuando no hay otro camino a menos de
+# VALIDATOR_DAMAGE_WEIGHT píxeles por punto de daño. Cada expansión mantiene una macro-acción
+# (izquierda / nada / derecha, con o sin salto al empezar) durante VALIDATOR_MACRO_TICKS ticks.
+# Los estados visitados se memorizan por posición y velocidad cuantizadas (más la fase de la
+# plataforma móvil cercana, porque ahí esperar cambia lo alcanzable); un estado ya visto con
+# igual o más energía no se vuelve a expandir.
+#
+# Tras llegar a la meta solo se siguen los estados con menos daño que esa llegada.
+# Por nivel se informa si se llega a la meta, el menor daño con el que se ha llegado, cuánto
+# hierro han tocado los estados explorados y si la búsqueda agotó el espacio (exhausted) o el
+# presupuesto de VALIDATOR_MAX_EXPANSIONS. Ni siquiera con exhausted es una prueba: solo se
+# prueban las macro-acciones de MACROS y la memoización descarta estados parecidos, así que
+# "sin meta" quiere decir que no se ha encontrado solución en ese espacio de acciones, y el
+# daño mínimo es el menor encontrado.
+#   python validator.py --levels 1-10 --seeds 1000 --output validator.json
+
+# Macro-acciones: (dirección, saltar al empezar, ticks). Las de un tick se prueban desde todos los
+# estados: ajustan el momento del salto (hay huecos que solo se saltan desde unos pocos píxeles) y
+# permiten salir de un pincho antes de que VALIDATOR_MACRO_TICKS ticks encima maten al jugador.
+MACROS = tuple((direction, jump, ticks) for ticks in (VALIDATOR_MACRO_TICKS, 1)
+               for direction in (1, 0, -1) for jump in (True, False))
+
+class LevelSearch:
+    def __init__(self, level, dt=PHYSICS_REFERENCE_RATE / SIMULATION_RATE,
+                 max_expansions=VALIDATOR_MAX_EXPANSIONS, damage_weight=VALIDATOR_DAMAGE_WEIGHT):
+        self.level = level
+        self.dt = dt
+        self.max_expansions = max_expansions
+        self.damage_weight = damage_weight
+        self.player = Player(100, SCREEN_HEIGHT - 50 - PLAYER_HEIGHT)
+
+        # Índices fijos de las entidades: los estados guardan conjuntos de índices, no objetos
+        self.items = list(level.items)
+        self.item_number = {item: i for i, item in enumerate(self.items)}
+        self.obstacle_number = {obstacle: i for i, obstacle in enumerate(level.obstacles)}
+        # Hierro, parásitos y pinchos en una sola rejilla: una consulta por tick en vez de tres
+        self.contact_grid = SpatialHash(self.items + list(level.obstacles) + level.spikes)
+        # Mismo orden de resolución de colisiones que platform_grid (orden de level.platforms)
+        self.platform_order = {platform: i for i, platform in enumerate(level.platforms)}
+        movers = level.movers
+        self.mover_number = {platform: i for i, platform in enumerate(movers.platforms)}
+        self.static_grid = SpatialHash(p for p in level.platforms if p not in self.mover_number)
+
+        # Las plataformas móviles no dependen del jugador: la x de cada una en cada tick se
+        # calcula una sola vez (fila t = después de t updates, como en la sesión)
+        self.mover_x = [np.floor(movers.x).astype(int).tolist()]
+        # Ticks de ida y vuelta de cada una: la clave de memoización solo guarda la fase
+        self.mover_period = [max(1, round(2 * (end_x - width - start_x) / (speed * dt)))
+                             for start_x, end_x, width, speed in
+                             zip(movers.start_x, movers.end_x, movers.width, movers.speed)]
+
+    def _mover_row(self, tick):
+        movers = self.level.movers
+        while len(self.mover_x) <= tick:
+            movers.update(self.dt)
+            self.mover_x.append(np.floor(movers.x).astype(int).tolist())
+        return self.mover_x[tick]
+
+    def _nearby_platforms(self, tick):
+        sweep = self.player.sweep_rect(self.dt)
+        platforms = self.static_grid.query(sweep)
+        movers = self.level.mover_index.query(sweep.left, sweep.right)
+        if movers:
+            row = self._mover_row(tick)
+            for platform in movers:
+                platform.rect.x = row[self.mover_number[platform]]
+                if platform.rect.colliderect(sweep):
+                    platforms.append(platform)
+            platforms.sort(key=self.platform_order.__getitem__)
+        return platforms
+
+    def _key(self, state):
+        x, y, vel_x, vel_y, on_ground, tick = state[:6]
+        left = math.floor(x)
+        key = (left // VALIDATOR_POSITION_STEP, math.floor(y) // VALIDATOR_HEIGHT_STEP,
+               round(vel_x / VALIDATOR_VELOCITY_STEP), round(vel_y / VALIDATOR_VELOCITY_STEP), on_ground)
+        movers = self.level.mover_index.query(left - VALIDATOR_MOVER_REACH, left + PLAYER_WIDTH + VALIDATOR_MOVER_REACH)
+        if movers:
+            # Cerca de una plataforma móvil importa cuándo se llega: se guarda la fase de su ciclo
+            number = self.mover_number[movers[-1]]
+            key += (number, tick % self.mover_period[number] // VALIDATOR_TIME_STEP)
+        return key
+
+    def _simulate(self, state, direction, jump, ticks, reached_items):
+        # Aplica una macro-acción desde state. Devuelve (estado nuevo, ha llegado a la meta);
+        # el estado es None si el jugador muere por el camino
+        x, y, vel_x, vel_y, on_ground, tick, energy, damage, hit_obstacles, collected = state
+        level = self.level
+        player = self.player
+        player.x = x
+        player.y = y
+        player.rect.topleft = (math.floor(x), math.floor(y))
+        player.vel_x = vel_x
+        player.vel_y = vel_y
+        player.on_ground = on_ground
+        player.moving_left = direction < 0
+        player.moving_right = direction > 0
+        if jump:
+            player.jump()
+        terrain_type = level.terrain_type
+        ground_rect = level.ground_rect
+        finish_rect = level.finish_line.rect
+        finished = False
+        for _ in range(ticks):
+            tick += 1
+            player.update(terrain_type, self._nearby_platforms(tick), ground_rect, self.dt)
+            rect = player.rect
+            for entity in self.contact_grid.query(rect):
+                if entity in self.item_number:
+                    number = self.item_number[entity]
+                    reached_items.add(number)
+                    if number not in collected:
+                        collected = collected | {number}
+                        energy = min(energy + 10, MAX_ENERGY)
+                elif entity in self.obstacle_number:
+                    number = self.obstacle_number[entity]
+                    if number not in hit_obstacles:
+                        hit_obstacles = hit_obstacles | {number}
+                        energy -= PARASITE_DAMAGE
+                        damage += PARASITE_DAMAGE
+                else:
+                    energy -= SPIKE_DAMAGE
+                    damage += SPIKE_DAMAGE
+            if energy <= 0:
+                return None, False
+            if rect.colliderect(finish_rect):
+                finished = True
+                break
+        return (player.x, player.y, player.vel_x, player.vel_y, player.on_ground,
+                tick, energy, damage, hit_obstacles, collected), finished
+
+    def run(self):
+        rect = self.player.rect
+        start = (float(rect.x), float(rect.y), 0, 0, False, 0, INITIAL_ENERGY, 0, frozenset(), frozenset())
+        best = {self._key(start): INITIAL_ENERGY} # clave -> mayor energía con la que se ha llegado
+        heap = [(-start[0], 0, start)]
+        counter = 1 # Desempate estable en el heap
+        reached_items = set()
+        finish = None
+        max_x = start[0]
+        expansions = 0
+        while heap and expansions < self.max_expansions:
+            _, _, state = heapq.heappop(heap)
+            if best.get(self._key(state), 0) > state[6] or (finish is not None and state[7] >= finish[7]):
+                continue # Ya se llegó aquí con más energía, o ya no puede mejorar la llegada
+            expansions += 1
+            for direction, jump, ticks in MACROS:
+                if jump and not state[4]:
+                    continue # Solo se puede saltar desde el suelo
+                child, finished = self._simulate(state, direction, jump, ticks, reached_items)
+                if child is None:
+                    continue
+                if finished:
+                    # El nivel termina al tocar la meta: se guarda la llegada con menos daño
+                    if finish is None or (child[7], child[5]) < (finish[7], finish[5]):
+                        finish = child
+                    continue
+                if child[5] >= VALIDATOR_MAX_TICKS or (finish is not None and child[7] >= finish[7]):
+                    continue # Demasiado tarde, o ya no puede llegar con menos daño
+                key = self._key(child)
+                if best.get(key, 0) >= child[6]:
+                    continue
+                best[key] = child[6]
+                if child[0] > max_x:
+                    max_x = child[0]
+                heapq.heappush(heap, (child[7] * self.damage_weight - child[0], counter, child))
+                counter += 1
+        return {
+            "solvable": finish is not None,
+            "min_damage": finish[7] if finish else None,
+            "finish_ticks": finish[5] if finish else None,
+            "finish_iron": len(finish[9]) if finish else None,
+            "max_x": math.floor(max_x),
+            "reachable_iron": len(reached_items),
+            "total_iron": len(self.items),
+            "expansions": expansions,
+            "states": len(best),
+            "exhausted": not heap,
+        }
+
+def validate(level_number, seed):
+    start = time.perf_counter()
+    level = Level(level_number, seed, use_cache=False)
+    result = LevelSearch(level).run()
+    result.update(level=level_number, seed=seed, terrain=level.terrain_type,
+                  seconds=time.perf_counter() - start)
+    return result
+
+def _validate_task(task):
+    return validate(*task)
+
+def _init_worker():
+    # Cada proceso necesita pygame para construir los niveles; sin ventana y sin telemetría
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    telemetry.enabled = False
+
+def run_validation(levels, seeds, workers=None):
+    tasks = [(level_number, seed) for level_number in levels for seed in seeds]
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        # Trozos de varias tareas: cada una dura poco y así no se paga la comunicación por nivel
+        chunksize = max(1, len(tasks) // (workers * 8))
+        for i, result in enumerate(pool.map(_validate_task, tasks, chunksize=chunksize), 1):
+            results.append(result)
+            if i % 10 == 0 or i == len(tasks):
+                print(f"\r{i}/{len(tasks)} niveles validados", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    return results
+
+def summarize(results):
+    # Resumen por nivel: semillas resueltas, daño mínimo y hierro alcanzable
+    summary = []
+    for level_number in sorted({r["level"] for r in results}):
+        rows = [r for r in results if r["level"] == level_number]
+        solved = [r for r in rows if r["solvable"]]
+        damages = np.array([r["min_damage"] for r in solved] or [0])
+        iron = np.array([r["reachable_iron"] / max(r["total_iron"], 1) for r in rows])
+        summary.append({
+            "level": level_number,
+            "seeds": len(rows),
+            "solvable": len(solved),
+            "damage_free": sum(1 for r in solved if r["min_damage"] == 0),
+            "damage_mean": float(damages.mean()),
+            "damage_max": int(damages.max()),
+            "reachable_iron_mean": float(iron.mean()),
+            # Sin meta tras explorar todo el espacio de acciones / tras agotar el presupuesto
+            "unsolved_seeds": [r["seed"] for r in rows if not r["solvable"] and r["exhausted"]],
+            "unknown_seeds": [r["seed"] for r in rows if not r["solvable"] and not r["exhausted"]],
+            "seconds_mean": float(np.mean([r["seconds"] for r in rows])),
+        })
+    return summary
+
+def parse_levels(text):
+    if "-" in text:
+        first, last = text.split("-")
+        return range(int(first), int(last) + 1)
+    return [int(n) for n in text.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comprueba que los niveles generados de Moto Glóbulo Rojo se pueden terminar")
+    parser.add_argument("--levels", default=f"1-{MAX_LEVELS}", help="niveles, p. ej. 1-10 o 1,3,5")
+    parser.add_argument("--seeds", type=int, default=100, help="semillas por nivel")
+    parser.add_argument("--first-seed", type=int, default=0, help="primera semilla de Level(level_number, seed)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--output", default="validator.json")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    start = time.perf_counter()
+    results = run_validation(parse_levels(args.levels), seeds, args.workers)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results)
+    with open(args.output, "w") as f:
+        json.dump({"args": vars(args), "seconds": elapsed, "summary": summary, "results": results}, f, indent=2)
+
+    print(f"{'nivel':>5}{'resueltos':>12}{'sin daño':>10}{'daño medio':>12}{'daño max':>10}{'hierro':>8}{'s/nivel':>9}")
+    for s in summary:
+        print(f"{s['level']:>5}{s['solvable']:>7}/{s['seeds']:<4}{s['damage_free']:>10}{s['damage_mean']:>12.1f}"
+              f"{s['damage_max']:>10}{s['reachable_iron_mean']:>8.0%}{s['seconds_mean']:>9.2f}")
+        if s["unsolved_seeds"]:
+            print(f"      sin meta en el espacio de acciones explorado: {s['unsolved_seeds'][:20]}")
+        if s["unknown_seeds"]:
+            print(f"      sin meta dentro de VALIDATOR_MAX_EXPANSIONS: {s['unknown_seeds'][:20]}")
+    print(f"{len(results)} niveles en {elapsed:.1f}s; resultados en {args.output}")
+    return 1 if any(s["unsolved_seeds"] or s["unknown_seeds"] for s in summary) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())